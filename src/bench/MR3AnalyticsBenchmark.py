@@ -0,0 +1,128 @@
+import argparse
+import math
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from MR3AttackAnalytics import MR3AttackAnalytics  # noqa: E402
+from MR3AttackBuilder import MR3AttackParser  # noqa: E402
+from MR3DatabaseBuilder import MR3DatabaseBuilder  # noqa: E402
+from MR3LoadBenchmark import read_reference_objects  # noqa: E402
+from MR3SyntheticData import generate_attack_dump  # noqa: E402
+
+# Metric -> the same expression in SQL, the way it is written by hand today
+SqlMetrics = {
+    "damage_per_guts": "CASE WHEN GutsUsed > 0 THEN Damage * 1.0 / GutsUsed END",
+    "guts_down_per_guts": "CASE WHEN GutsUsed > 0 THEN GutsDown * 1.0 / GutsUsed END",
+    "expected_damage": f"Damage * Hit / 100.0 * (1 + Critical / 100.0 * "
+                       f"{MR3AttackAnalytics.CriticalMultiplier - 1})",
+    "expected_damage_per_guts": f"CASE WHEN GutsUsed > 0 THEN Damage * Hit / 100.0 * (1 + Critical / 100.0 * "
+                                f"{MR3AttackAnalytics.CriticalMultiplier - 1}) / GutsUsed END"
+}
+Percentiles = [10, 25, 50, 75, 90]
+Top = 3
+
+
+def report_with_sql(connection: sqlite3.Connection) -> dict:
+    """Computes every metric's per-derivation aggregates, percentiles and top attacks with SQL.
+
+    :param sqlite3.Connection connection: Connection to a lexicon database
+    :return: Results, keyed like report_with_numpy's
+    :rtype: dict
+    """
+    report = {}
+    for name, expression in SqlMetrics.items():
+        rows = connection.execute(
+            f"SELECT DerivationId, COUNT(m), AVG(m), MIN(m), MAX(m) "
+            f"FROM (SELECT DerivationId, {expression} AS m FROM Attack) GROUP BY DerivationId ORDER BY DerivationId"
+        ).fetchall()
+        report[(name, "groups")] = [tuple(row) for row in rows]
+        count = connection.execute(f"SELECT COUNT(*) FROM Attack WHERE {expression} IS NOT NULL").fetchone()[0]
+        report[(name, "percentiles")] = [connection.execute(
+            f"SELECT {expression} AS m FROM Attack WHERE m IS NOT NULL ORDER BY m LIMIT 1 OFFSET ?",
+            [(count - 1) * q // 100]
+        ).fetchone()[0] for q in Percentiles]
+        report[(name, "top")] = connection.execute(
+            f"SELECT DerivationId, Attack FROM (SELECT DerivationId, Attack, Id, ROW_NUMBER() OVER "
+            f"(PARTITION BY DerivationId ORDER BY {expression} IS NULL, {expression} DESC, Id) AS r FROM Attack) "
+            f"WHERE r <= ? ORDER BY DerivationId, r", [Top]
+        ).fetchall()
+    return report
+
+
+def report_with_numpy(analytics: MR3AttackAnalytics) -> dict:
+    """Computes the same results as report_with_sql with MR3AttackAnalytics."""
+    report = {}
+    for name in SqlMetrics:
+        groups = analytics.by_derivation(name)
+        report[(name, "groups")] = list(zip(groups["derivation_id"].tolist(), groups["count"].tolist(),
+                                            groups["mean"].tolist(), groups["min"].tolist(), groups["max"].tolist()))
+        report[(name, "percentiles")] = list(analytics.percentiles(name, Percentiles, method="lower").values())
+        report[(name, "top")] = [(derivation_id, attack)
+                                 for derivation_id, attacks in analytics.top_by_derivation(name, Top).items()
+                                 for attack, _ in attacks]
+    return report
+
+
+def same(a, b) -> bool:
+    """Compares two reports, allowing for floating point sums adding up in a different order."""
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9)
+    return a == b
+
+
+def best_of(runs: int, run: Callable[[], object]) -> float:
+    """Times run several times, keeping the fastest run."""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare NumPy attack analytics with the equivalent SQL aggregates.")
+    parser.add_argument("-a", "--attacks", type=int, default=200_000, help="synthetic attacks to add to the lexicon")
+    parser.add_argument("-r", "--runs", type=int, default=3, help="runs of each kind; the fastest is reported")
+    args = parser.parse_args()
+
+    attacks, characteristics, monsters = read_reference_objects(MR3DatabaseBuilder.BuildScript)
+    attacks = attacks + list(MR3AttackParser.parse_lines(generate_attack_dump(args.attacks)))
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "lexicon.sqlite3"
+        MR3DatabaseBuilder.build(database, attacks, characteristics, monsters)
+        connection = sqlite3.connect(database)
+
+        load_seconds = best_of(args.runs, lambda: MR3AttackAnalytics.from_database(connection))
+        analytics = MR3AttackAnalytics.from_database(connection)
+        # A fresh instance per run, so computed metrics aren't reused.
+        numpy_seconds = best_of(args.runs, lambda: report_with_numpy(MR3AttackAnalytics(analytics.columns,
+                                                                                         analytics.names)))
+        sql_seconds = best_of(args.runs, lambda: report_with_sql(connection))
+        sql_report = report_with_sql(connection)
+        connection.close()
+
+    numpy_report = report_with_numpy(analytics)
+    print(f"{len(analytics)} attacks; {len(SqlMetrics)} metrics: per-derivation count/mean/min/max, "
+          f"{len(Percentiles)} percentiles, top {Top} per derivation")
+    print(f"{'Run':12} {'Seconds':>8}")
+    print(f"{'SQL':12} {sql_seconds:8.4f}")
+    print(f"{'NumPy':12} {numpy_seconds:8.4f}")
+    print(f"{'NumPy load':12} {load_seconds:8.4f}")
+    mismatches = [key for key in sql_report if not same(sql_report[key], numpy_report[key])]
+    for name, part in mismatches:
+        print(f"Mismatch: {name} {part}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
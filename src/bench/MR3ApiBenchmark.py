@@ -0,0 +1,51 @@
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from MR3FandomScraper import MR3FandomScraper, TokenBucket  # noqa: E402
+from MR3ScraperBenchmark import point_scraper_at  # noqa: E402
+from MR3WikiStandIn import SyntheticWiki, WikiStandIn  # noqa: E402
+
+
+def scrape_with(server: WikiStandIn, backend: str, count: int) -> tuple[float, int, int, list[str]]:
+    """Scrapes from the stand-in with the given backend, measuring the run.
+
+    :param WikiStandIn server: Running stand-in server
+    :param str backend: "html" or "api"
+    :param int count: How many monsters to scrape
+    :return: (Wall-clock seconds, requests, bytes transferred, scraped monsters as text)
+    :rtype: tuple[float, int, int, list[str]]
+    """
+    point_scraper_at(server)
+    MR3FandomScraper.Backend = backend
+    server.reset_counters()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        monsters = MR3FandomScraper.get_all_monsters(count)
+    return time.perf_counter() - start, server.requests, server.bytes_sent, [str(m) for m in monsters]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML scraping with batched MediaWiki API retrieval.")
+    parser.add_argument("-c", "--count", type=int, default=0, help="monsters to scrape; 0 scrapes all")
+    parser.add_argument("-l", "--latency", type=float, default=0.0, help="simulated seconds per response")
+    args = parser.parse_args()
+
+    MR3FandomScraper.Delay = 0  # Compare the backends' own costs, not the politeness delay.
+    MR3FandomScraper.RateLimiter = TokenBucket(rate=1000, capacity=1000)
+    with WikiStandIn(SyntheticWiki(), latency=args.latency) as server:
+        results = {backend: scrape_with(server, backend, args.count) for backend in ["html", "api"]}
+
+    print(f"{'Backend':8} {'Seconds':>8} {'Requests':>9} {'KiB':>9}")
+    for backend, (seconds, requests, transferred, _) in results.items():
+        print(f"{backend:8} {seconds:8.2f} {requests:9} {transferred / 1024:9.0f}")
+    print(f"Same results: {results['html'][3] == results['api'][3]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from MR3AttackBuilder import Attack  # noqa: E402
+from MR3AttackIndex import MR3AttackIndex  # noqa: E402
+from MR3QueryPlanCheck import build_scaled_copy  # noqa: E402
+
+# Attack attribute -> Attack table column
+SqlColumns = {attribute: column for attribute, column in zip(Attack.__slots__, Attack.Columns)}
+
+Filters = [
+    {"monster_derivation_id": 13},
+    {"monster_derivation_id": 13, "stat_used": "Power", "damage": (20, None)},
+    {"attack_type": ["Flame", "Wind"], "attack_range": "Long", "guts_used": (None, 25)},
+    {"stat_used": "Intelligence", "effect": "None", "hit_chance": (10, None), "critical_chance": (5, None)},
+    {"item_required": "Aqua Stone", "damage": (30, 60)},
+    {"attack_type": "Beat", "attack_range": "Close", "damage": (30, None), "guts_used": (None, 40)}
+]
+
+
+def to_sql(criteria: dict) -> tuple[str, list]:
+    """Writes a filter as the equivalent COUNT query over the Attack table.
+
+    :param dict criteria: Criteria, as taken by MR3AttackIndex.filter
+    :return: (Query, parameters)
+    :rtype: tuple[str, list]
+    """
+    conditions = []
+    parameters = []
+    for attribute, value in criteria.items():
+        column = SqlColumns[attribute]
+        if isinstance(value, list):
+            conditions.append(f"{column} IN ({', '.join('?' * len(value))})")
+            parameters.extend(value)
+        elif isinstance(value, tuple):
+            low, high = value
+            if low is not None:
+                conditions.append(f"{column} >= ?")
+                parameters.append(low)
+            if high is not None:
+                conditions.append(f"{column} <= ?")
+                parameters.append(high)
+        else:
+            conditions.append(f"{column} = ?")
+            parameters.append(value)
+    return f"SELECT COUNT(*) FROM Attack WHERE {' AND '.join(conditions)}", parameters
+
+
+def best_of(runs: int, repeat: int, run: Callable[[], object]) -> float:
+    """Times run, repeated to get past the timer's resolution, keeping the fastest average."""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            run()
+        seconds.append((time.perf_counter() - start) / repeat)
+    return min(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare combined attack filters in MR3AttackIndex with SQLite.")
+    parser.add_argument("-s", "--scale", type=int, default=200, help="times to repeat the data in the scaled copy")
+    parser.add_argument("-r", "--runs", type=int, default=5, help="runs of each filter; the fastest is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "scaled.sqlite3"
+        build_scaled_copy(database, args.scale)
+        connection = sqlite3.connect(database)
+        start = time.perf_counter()
+        index = MR3AttackIndex.from_database(connection)
+        print(f"Indexed {len(index.attacks_list)} attacks in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        failures = 0
+        print(f"{'SQLite us':>10} {'Index us':>10} {'Attacks':>8}  Filter")
+        for criteria in Filters:
+            sql, parameters = to_sql(criteria)
+            expected = connection.execute(sql, parameters).fetchone()[0]
+            matched = MR3AttackIndex.count(index.filter(**criteria))
+            sqlite_seconds = best_of(args.runs, 10, lambda: connection.execute(sql, parameters).fetchone())
+            index_seconds = best_of(args.runs, 1000, lambda: MR3AttackIndex.count(index.filter(**criteria)))
+            print(f"{sqlite_seconds * 1e6:10.1f} {index_seconds * 1e6:10.1f} {matched:8}  {criteria}")
+            if matched != expected:
+                failures = failures + 1
+                print(f"           SQLite counted {expected} attacks")
+        connection.close()
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from MR3AttackBuilder import Attack, MR3AttackParser  # noqa: E402
+from MR3SyntheticData import write_attack_dump  # noqa: E402
+
+DictAttack = type("DictAttack", (), {  # An Attack without __slots__
+    "__init__": Attack.__init__, "values": Attack.values, "__str__": Attack.__str__
+})
+
+
+def parse_like_before(file: str) -> list:
+    """Parses the way MR3AttackParser used to: the whole document in memory, an if/elif chain per key,
+    and every attack kept in a list of dict-backed objects."""
+    with open(file) as f:
+        attack_document = '\n'.join([line.strip() for line in f.readlines()])
+
+    attacks = []
+    derivation_id = 0
+    iterator = iter(attack_document.splitlines())
+    for line in iterator:
+        if not line.strip():
+            continue
+        if "Derivation:" in line:
+            derivation_id = derivation_id + 1
+        elif 'Attack:' in line:
+            fields = [""] * 13
+            while line.strip():
+                key, value = line.split(": ")
+                if value == "-":
+                    value = ""
+                if key == "Attack":
+                    fields[0] = value
+                elif key == "Stat Used":
+                    fields[1] = value
+                elif key == "Type":
+                    fields[2] = value
+                elif key == "Item":
+                    fields[3] = value
+                elif key == "Guts Used":
+                    fields[4] = value
+                elif key == "Damage":
+                    fields[5] = value
+                elif key == "Guts Down":
+                    fields[6] = value
+                elif key == "Critical":
+                    fields[7] = value
+                elif key == "Hit":
+                    fields[8] = value
+                elif key == "Max Level":
+                    fields[9] = value
+                elif key == "Range":
+                    fields[10] = value
+                elif key == "Growth":
+                    fields[11] = value
+                elif key == "Effect":
+                    fields[12] = value
+                line = next(iterator, "")
+            attacks.append(DictAttack(derivation_id, *fields))
+    return [f"({str(attack)})" for attack in attacks]
+
+
+def parse_streaming(file: str) -> int:
+    """Parses through MR3AttackParser, formatting and dropping each row as it would be written."""
+    rows = 0
+    for attack in MR3AttackParser.parse_text(file):
+        f"({str(attack)})"
+        rows = rows + 1
+    return rows
+
+
+Parsers = {"before": parse_like_before, "streaming": parse_streaming}
+
+
+def measure_in_child(parser: str, file: Path) -> dict:
+    """Runs one parser in a fresh interpreter, so its peak RSS is not inflated by the other's.
+
+    :param str parser: Key of Parsers
+    :param Path file: Attack document to parse
+    :return: {"seconds", "peak_rss_kib"}
+    :rtype: dict
+    """
+    output = subprocess.run([sys.executable, __file__, "--child", parser, str(file)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the streaming attack parser with the old eager one.")
+    parser.add_argument("-c", "--count", type=int, default=100_000, help="synthetic attacks to parse")
+    parser.add_argument("--child", nargs=2, metavar=("PARSER", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        name, file = args.child
+        start = time.perf_counter()
+        Parsers[name](file)
+        seconds = time.perf_counter() - start
+        peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+        print(json.dumps({"seconds": seconds, "peak_rss_kib": peak_rss_kib}))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = write_attack_dump(Path(directory) / "attacks.txt", args.count)
+        print(f"{args.count} attacks, {file.stat().st_size / 1024 / 1024:.1f} MiB")
+        print(f"{'Parser':10} {'Seconds':>8} {'Attacks/s':>10} {'Peak RSS MiB':>13}")
+        for name in Parsers:
+            result = measure_in_child(name, file)
+            print(f"{name:10} {result['seconds']:8.2f} {args.count / result['seconds']:10.0f} "
+                  f"{result['peak_rss_kib'] / 1024:13.1f}")
+
+
+if __name__ == '__main__':
+    main()
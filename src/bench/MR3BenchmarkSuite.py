@@ -0,0 +1,372 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Union
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+import MR3AttackBuilder  # noqa: E402
+import MR3CharacteristicBuilder  # noqa: E402
+from MR3AttackBuilder import MR3AttackParser  # noqa: E402
+from MR3DatabaseBuilder import MR3DatabaseBuilder  # noqa: E402
+from MR3FandomScraper import MR3FandomScraper, TokenBucket  # noqa: E402
+from MR3LexiconQueries import QueryFiles, read_query_file  # noqa: E402
+from MR3LoadBenchmark import read_reference_objects  # noqa: E402
+from MR3QueryPlanCheck import Parameters, build_scaled_copy  # noqa: E402
+from MR3SyntheticData import write_attack_dump, write_characteristic_file  # noqa: E402
+from MR3WikiStandIn import SyntheticWiki, WikiStandIn  # noqa: E402
+
+Version = 1
+# Which way each kind of metric improves; any other metric is informational and never compared.
+Better = {"throughput": "higher", "latency": "lower", "peak_memory": "lower"}
+
+
+def metric(kind: str, value: float, unit: str) -> dict:
+    return {"value": value, "unit": unit, "better": Better.get(kind)}
+
+
+def timed(run) -> tuple[float, object]:
+    """Runs run once, returning (seconds, its result)."""
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def attack_parser(case: dict) -> dict:
+    """Streams a synthetic attack dump through MR3AttackParser without keeping the attacks."""
+    seconds, count = timed(lambda: sum(1 for _ in MR3AttackParser.parse_text(case["file"])))
+    return {"throughput": metric("throughput", count / seconds, "attacks/s"),
+            "latency": metric("latency", seconds, "s")}
+
+
+def attack_builder(case: dict) -> dict:
+    """Parses a synthetic attack dump and writes its INSERT queries."""
+    with open(os.devnull, "w") as out:
+        seconds, count = timed(lambda: MR3AttackBuilder.write_query(case["file"], out))
+    return {"throughput": metric("throughput", count / seconds, "attacks/s"),
+            "latency": metric("latency", seconds, "s")}
+
+
+def characteristic_builder(case: dict) -> dict:
+    """Parses a synthetic characteristic document and writes its INSERT queries."""
+    with open(os.devnull, "w") as out:
+        seconds, count = timed(lambda: MR3CharacteristicBuilder.write_query(case["file"], out))
+    return {"throughput": metric("throughput", count / seconds, "characteristics/s"),
+            "latency": metric("latency", seconds, "s")}
+
+
+def database_builder(case: dict) -> dict:
+    """Bulk loads the lexicon, repeated case["scale"] times, into a new database."""
+    attacks, characteristics, monsters = read_reference_objects(MR3DatabaseBuilder.BuildScript)
+    scale = case["scale"]
+    seconds, counts = timed(lambda: MR3DatabaseBuilder.build(case["database"], attacks * scale,
+                                                             characteristics * scale, monsters * scale))
+    rows = sum(counts.values())
+    return {"throughput": metric("throughput", rows / seconds, "rows/s"), "latency": metric("latency", seconds, "s")}
+
+
+def scraper(case: dict) -> dict:
+    """Scrapes every monster from the stand-in wiki, sequentially and without pacing, so parsing dominates.
+
+    The stand-in's pages are generated from the lexicon in the format the scraper reads, so this measures
+    speed only; it doesn't check the scraper against the live wiki's markup.
+    """
+    MR3FandomScraper.WikiURL = case["wiki_url"]
+    MR3FandomScraper.EncyclopediaURL = case["wiki_url"] + "Monster_Rancher_3_Encyclopedia"
+    MR3FandomScraper.ApiURL = case["api_url"]
+    MR3FandomScraper.Backend = case["backend"]
+    MR3FandomScraper.Delay = 0
+    MR3FandomScraper.RateLimiter = TokenBucket(rate=1_000_000, capacity=1_000)
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds, monsters = timed(lambda: MR3FandomScraper.get_all_monsters(case["count"]))
+    return {"throughput": metric("throughput", len(monsters) / seconds, "monsters/s"),
+            "latency": metric("latency", seconds / len(monsters), "s/monster"),
+            "requests": metric("requests", MR3FandomScraper.NetworkRequests, "requests")}
+
+
+def queries(case: dict) -> dict:
+    """Runs each sample, search and summary query against a scaled database, keeping each query's fastest run."""
+    connection = sqlite3.connect(case["database"])
+    metrics = {}
+    total = 0
+    for file in QueryFiles:
+        for name, query in read_query_file(file):
+            seconds = min(timed(lambda: connection.execute(query, Parameters).fetchall())[0]
+                          for _ in range(case["runs"]))
+            metrics[f"latency: {name}"] = metric("latency", seconds, "s")
+            total = total + seconds
+    connection.close()
+    count = len(metrics)
+    return {"throughput": metric("throughput", count / total, "queries/s"), "latency": metric("latency", total, "s"),
+            **metrics}
+
+
+Runners = {"attack_parser": attack_parser, "attack_builder": attack_builder,
+           "characteristic_builder": characteristic_builder, "database_builder": database_builder,
+           "scraper": scraper, "queries": queries}
+
+
+def peak_memory_kib() -> Union[int, None]:
+    """Reads this process's peak RSS in KiB, if the platform reports it.
+
+    ru_maxrss can carry over the parent's peak across exec, so Linux's own VmHWM is preferred.
+    """
+    try:
+        with open("/proc/self/status") as status:
+            peak = [int(line.split()[1]) for line in status if line.startswith("VmHWM:")]
+        if peak:
+            return peak[0]
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # Bytes on macOS, KiB elsewhere
+
+
+def run_child(runner: str, case: dict) -> dict:
+    """Runs one case in a fresh interpreter, so its peak memory is its own.
+
+    :param str runner: Key of Runners
+    :param dict case: The runner's parameters
+    :return: The case's metrics, with the interpreter's peak RSS as "peak_memory" where the platform reports it
+    :rtype: dict
+    """
+    output = subprocess.run([sys.executable, __file__, "--child", runner, json.dumps(case)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def summarize(runs: list[dict]) -> dict:
+    """Reduces several runs of a case to each metric's median, and its spread: the interquartile range over the
+    median. Neither moves much for one unlucky run.
+
+    Usage:
+
+    >>> summary = summarize([{"latency": metric("latency", s, "s")} for s in [1.0, 1.2, 0.9, 1.0, 3.0]])
+    >>> summary["latency"]["value"], round(summary["latency"]["spread"], 3)
+    (1.0, 0.2)
+    """
+    metrics = {}
+    for name, first in runs[0].items():
+        values = [run[name]["value"] for run in runs]
+        median = statistics.median(values)
+        spread = 0.0
+        if len(values) > 1 and median:
+            quartiles = statistics.quantiles(values, n=4, method="inclusive")
+            spread = (quartiles[2] - quartiles[0]) / median
+        metrics[name] = dict(first, value=median, spread=spread)
+    return metrics
+
+
+def run_suite(args: argparse.Namespace) -> dict:
+    """Generates the inputs, then runs every case args.runs times.
+
+    :return: The results, as written to the JSON file
+    :rtype: dict
+    """
+    results = {"version": Version, "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+               "python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count(),
+               "config": {"attacks": args.attacks, "characteristics": args.characteristics, "scales": args.scales,
+                          "monsters": args.monsters, "runs": args.runs},
+               "cases": {}}
+    with tempfile.TemporaryDirectory() as directory, WikiStandIn(SyntheticWiki()) as server:
+        directory = Path(directory)
+        attack_dump = {"file": str(write_attack_dump(directory / "attacks.txt", args.attacks))}
+        cases = {
+            "attack_parser": ("attack_parser", attack_dump),
+            "attack_builder": ("attack_builder", attack_dump),
+            "characteristic_builder": ("characteristic_builder", {"file": str(write_characteristic_file(
+                directory / "characteristics.txt", args.characteristics))}),
+            "database_builder": ("database_builder", {"database": str(directory / "built.sqlite3"),
+                                                      "scale": max(args.scales)})
+        }
+        for backend in ["html", "api"]:
+            cases[f"scraper_{backend}"] = ("scraper", {"wiki_url": server.wiki_url, "api_url": server.api_url,
+                                                       "backend": backend, "count": args.monsters})
+        for scale in args.scales:
+            cases[f"queries_{scale}x"] = ("queries", {"database": str(directory / f"lexicon{scale}x.sqlite3"),
+                                                      "scale": scale, "runs": args.query_runs})
+
+        for name, (runner, case) in cases.items():
+            if args.cases and name not in args.cases:
+                continue
+            if runner == "queries":
+                build_scaled_copy(Path(case["database"]), case["scale"])
+            results["cases"][name] = summarize([run_child(runner, case) for _ in range(args.runs)])
+            summary = results["cases"][name]
+            peak = summary.get("peak_memory")
+            print(f"{name:24} {summary['throughput']['value']:14,.1f} {summary['throughput']['unit']:18} "
+                  + (f"{peak['value'] / 1024:8.1f} MiB" if peak else "peak memory unavailable"), file=sys.stderr)
+    return results
+
+
+def compared(baseline: dict, current: dict) -> Iterator[tuple[str, str, dict, dict]]:
+    """Pairs up the metrics both runs of the suite measured and which have a better direction.
+
+    :return: (Case, metric, baseline's metric, current metric)
+    :rtype: Iterator[tuple[str, str, dict, dict]]
+    """
+    for case, metrics in current["cases"].items():
+        for name, now in metrics.items():
+            before = baseline["cases"].get(case, {}).get(name)
+            if before is not None and now["better"] is not None and before["value"]:
+                yield case, name, before, now
+
+
+def noisy(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Finds the metrics whose runs varied by more than threshold in either run of the suite.
+
+    Their change can't be told apart from noise, so they are left out of `compare`.
+
+    :return: Description of each noisy metric
+    :rtype: list[str]
+    """
+    return [f"{case} {name}: spread {before.get('spread', 0):.1%} -> {now.get('spread', 0):.1%}"
+            for case, name, before, now in compared(baseline, current)
+            if max(before.get("spread", 0), now.get("spread", 0)) > threshold]
+
+
+def seconds_changed(baseline: dict, current: dict, case: str, name: str) -> Union[float, None]:
+    """How many seconds the time behind a metric changed by: a latency's own, or a throughput's case latency.
+
+    :return: Absolute change, or None if the metric isn't a time or backed by one
+    :rtype: Union[float, None]
+    """
+    timed_by = "latency" if name == "throughput" else name
+    before = baseline["cases"][case].get(timed_by)
+    now = current["cases"][case].get(timed_by)
+    if before is None or now is None or not now["unit"].startswith("s") or now["better"] != "lower":
+        return None
+    return abs(now["value"] - before["value"])
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta: float = 0.0) -> list[str]:
+    """Finds the metrics whose median got worse by more than threshold between two runs of the suite.
+
+    Metrics which are `noisy` in either run aren't counted, and neither are times, or throughputs, whose time
+    moved by less than min_delta seconds: runs that short shift by more than threshold from run to run.
+
+    :param dict baseline: Earlier results
+    :param dict current: Later results
+    :param float threshold: Relative change tolerated, e.g. 0.1 for 10%
+    :param float min_delta: Change in seconds a time must also exceed
+    :return: Description of each regression
+    :rtype: list[str]
+
+    Usage:
+
+    >>> old = {"cases": {"c": {"throughput": dict(metric("throughput", 100, "rows/s"), spread=0.02),
+    ...                        "latency": dict(metric("latency", 2, "s"), spread=0.5)}}}
+    >>> new = {"cases": {"c": {"throughput": dict(metric("throughput", 80, "rows/s"), spread=0.03),
+    ...                        "latency": dict(metric("latency", 3, "s"), spread=0.04)}}}
+    >>> compare(old, new, 0.1)
+    ['c throughput: 100 -> 80 rows/s (-20.0%)']
+    >>> compare(old, new, 0.1, min_delta=1.5)
+    []
+    """
+    regressions = []
+    for case, name, before, now in compared(baseline, current):
+        if max(before.get("spread", 0), now.get("spread", 0)) > threshold:
+            continue
+        seconds = seconds_changed(baseline, current, case, name)
+        if seconds is not None and seconds < min_delta:
+            continue
+        change = now["value"] / before["value"] - 1
+        worse = -change if now["better"] == "higher" else change
+        if worse > threshold:
+            regressions.append(f"{case} {name}: {before['value']:.4g} -> {now['value']:.4g} {now['unit']} "
+                               f"({change:+.1%})")
+    return regressions
+
+
+def print_comparison(baseline: dict, current: dict, threshold: float, min_delta: float) -> int:
+    """Prints every shared metric's change, then the regressions.
+
+    :return: Exit status: 1 if anything regressed beyond its noise, else 0
+    :rtype: int
+    """
+    if baseline.get("config") != current.get("config"):
+        print("warning: the runs used different inputs, so their results may not be comparable", file=sys.stderr)
+    print(f"{'Case':24} {'Metric':10} {'Baseline':>12} {'Current':>12} {'Change':>8}")
+    for case, metrics in current["cases"].items():
+        for name in ["throughput", "latency", "peak_memory"]:
+            before = baseline["cases"].get(case, {}).get(name)
+            now = metrics.get(name)
+            if before and now and before["value"]:
+                print(f"{case:24} {name:10} {before['value']:12.4g} {now['value']:12.4g} "
+                      f"{now['value'] / before['value'] - 1:+8.1%}")
+    skipped = noisy(baseline, current, threshold)
+    if skipped:
+        print(f"\n{len(skipped)} metrics varied by more than {threshold:.0%} between runs and weren't compared:")
+        for metric_spread in skipped:
+            print(f"  {metric_spread}")
+    regressions = compare(baseline, current, threshold, min_delta)
+    if regressions:
+        print(f"\n{len(regressions)} regressions beyond {threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parsers, builders, scraper and queries, writing "
+                                                 "JSON results, or compare two results files.")
+    parser.add_argument("-o", "--output", type=Path, help="file to write results to, instead of standard output")
+    parser.add_argument("--cases", nargs="+", help="only run these cases, e.g. attack_parser queries_10x")
+    parser.add_argument("-a", "--attacks", type=int, default=100_000, help="synthetic attacks to parse")
+    parser.add_argument("-c", "--characteristics", type=int, default=100_000, help="synthetic characteristics")
+    parser.add_argument("-m", "--monsters", type=int, default=0, help="monsters to scrape; 0 scrapes all")
+    parser.add_argument("-s", "--scales", type=int, nargs="+", default=[1, 10, 100],
+                        help="times to repeat the data in each queried database")
+    parser.add_argument("-r", "--runs", type=int, default=5,
+                        help="runs of each case; each metric's median and spread are kept")
+    parser.add_argument("--query-runs", type=int, default=5, help="runs of each query within a run")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASELINE", "CURRENT"),
+                        help="compare two results files instead of running; exits 1 on a regression")
+    parser.add_argument("-t", "--threshold", type=float, default=0.10,
+                        help="relative change in a metric counted as a regression")
+    parser.add_argument("-d", "--min-delta", type=float, default=0.005,
+                        help="seconds a time, or a throughput's time, must also change by to count as a regression")
+    parser.add_argument("--child", nargs=2, metavar=("RUNNER", "CASE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        runner, case = args.child
+        metrics = Runners[runner](json.loads(case))
+        peak = peak_memory_kib()
+        if peak is not None:
+            metrics["peak_memory"] = metric("peak_memory", peak, "KiB")
+        print(json.dumps(metrics))
+        return
+
+    if args.compare:
+        baseline, current = (json.loads(path.read_text(encoding="utf-8")) for path in args.compare)
+        sys.exit(print_comparison(baseline, current, args.threshold, args.min_delta))
+
+    results = json.dumps(run_suite(args), indent=2)
+    if args.output:
+        args.output.write_text(results + "\n", encoding="utf-8")
+    else:
+        print(results)
+
+
+if __name__ == '__main__':
+    main()
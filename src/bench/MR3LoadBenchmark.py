@@ -0,0 +1,100 @@
+import argparse
+import io
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from MR3AttackBuilder import Attack, MR3AttackParser  # noqa: E402
+from MR3CharacteristicBuilder import Characteristic  # noqa: E402
+from MR3DatabaseBuilder import MR3DatabaseBuilder  # noqa: E402
+from MR3FandomScraper import MR3Monster  # noqa: E402
+from MR3SqlEmitter import MR3SqlEmitter  # noqa: E402
+from MR3SyntheticData import generate_attack_dump  # noqa: E402
+
+Tables = ["Attack", "Characteristic", "Derivation", "Monster", "Region"]
+
+
+def read_reference_objects(build_script: Path) -> tuple[list[Attack], list[Characteristic], list[MR3Monster]]:
+    """Turns the build script's rows back into the objects the builders parse.
+
+    :param Path build_script: Build script to read
+    :return: (Attacks, Characteristics, Monsters)
+    :rtype: tuple[list[Attack], list[Characteristic], list[MR3Monster]]
+    """
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(build_script.read_text(encoding="utf-8"))
+    attacks = [Attack(*row) for row in connection.execute(
+        f"SELECT {', '.join(Attack.Columns)} FROM Attack ORDER BY Id")]
+    characteristics = [Characteristic(*row) for row in connection.execute(
+        "SELECT Characteristic, Description FROM Characteristic ORDER BY Id")]
+    monsters = [MR3Monster(*row) for row in connection.execute(
+        "SELECT Monster, DerivationID, RegionID, Description FROM Monster ORDER BY Id")]
+    connection.close()
+    return attacks, characteristics, monsters
+
+
+def run_script(database: Path, script: str) -> None:
+    """Builds the database the way it is built today: SQLite parses and runs the whole script."""
+    database.unlink(missing_ok=True)
+    connection = sqlite3.connect(database)
+    connection.executescript(script)
+    connection.close()
+
+
+def best_of(runs: int, build: Callable[[], None]) -> float:
+    """Times build several times, keeping the fastest run."""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        build()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def dump(database: Path) -> dict[str, list[tuple]]:
+    """Reads every table's rows, for comparing two builds."""
+    connection = sqlite3.connect(database)
+    rows = {table: connection.execute(f"SELECT * FROM {table} ORDER BY Id").fetchall() for table in Tables}
+    connection.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the bulk loader with running the SQL build script.")
+    parser.add_argument("-a", "--attacks", type=int, default=0, help="synthetic attacks to add to both builds")
+    parser.add_argument("-r", "--runs", type=int, default=5, help="builds of each kind; the fastest is reported")
+    args = parser.parse_args()
+
+    build_script = MR3DatabaseBuilder.BuildScript
+    attacks, characteristics, monsters = read_reference_objects(build_script)
+    script = build_script.read_text(encoding="utf-8")
+    if args.attacks:
+        synthetic_attacks = list(MR3AttackParser.parse_lines(generate_attack_dump(args.attacks)))
+        attacks = attacks + synthetic_attacks
+        out = io.StringIO()
+        MR3SqlEmitter(out).write_inserts("Attack", Attack.Columns, (a.values() for a in synthetic_attacks))
+        script = script + "\n" + out.getvalue()
+
+    with tempfile.TemporaryDirectory() as directory:
+        script_database = Path(directory) / "script.sqlite3"
+        loader_database = Path(directory) / "loader.sqlite3"
+        script_seconds = best_of(args.runs, lambda: run_script(script_database, script))
+        loader_seconds = best_of(args.runs, lambda: MR3DatabaseBuilder.build(loader_database, attacks,
+                                                                             characteristics, monsters))
+        same = dump(script_database) == dump(loader_database)
+
+    print(f"{len(attacks)} attacks, {len(characteristics)} characteristics, {len(monsters)} monsters; "
+          f"script is {len(script.splitlines())} lines")
+    print(f"{'Build':8} {'Seconds':>8}")
+    print(f"{'script':8} {script_seconds:8.4f}")
+    print(f"{'loader':8} {loader_seconds:8.4f}")
+    print(f"Same rows: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ServerScript = Path(__file__).resolve().parent.parent / "util" / "MR3LexiconServer.py"
+
+Words = ["fire", "sleep", "water", "sponge", "lion", "beam", "gre", "soft", "happy", "tail"]
+Stats = ["Power", "Intelligence"]
+AttackTypes = ["Beat", "Cut", "Flame", "Wind", "Pound", "Heart", "Magic"]
+
+
+def build_targets(count: int, seed: int = 3) -> list[str]:
+    """Builds a mix of request targets, like a search page's traffic: mostly filters, some searches.
+
+    :param int count: How many targets to build
+    :param int seed: Seed, so every run requests the same mix
+    :return: Request targets
+    :rtype: list[str]
+    """
+    generator = random.Random(seed)
+    targets = []
+    for _ in range(count):
+        roll = generator.random()
+        if roll < 0.3:
+            targets.append(f"/monsters?derivation_id={generator.randint(1, 30)}")
+        elif roll < 0.6:
+            targets.append(f"/attacks?derivation_id={generator.randint(1, 30)}&stat_used={generator.choice(Stats)}"
+                           f"&min_damage={generator.randrange(0, 40, 5)}")
+        elif roll < 0.75:
+            targets.append(f"/attacks?attack_type={generator.choice(AttackTypes)}&limit=20")
+        elif roll < 0.95:
+            targets.append(f"/search?q={generator.choice(Words)}")
+        else:
+            targets.append("/queries/number-of-each-attack-type-per-monster")
+    return targets
+
+
+async def run_client(host: str, port: int, targets: list[str], deadline: float, latencies: list[float],
+                     errors: list[str]) -> None:
+    """Sends requests one after another over a kept-alive connection until the deadline.
+
+    :param str host: Server's host
+    :param int port: Server's port
+    :param list[str] targets: Targets to request, cycled through
+    :param float deadline: perf_counter time to stop at
+    :param list[float] latencies: Where each request's seconds are recorded
+    :param list[str] errors: Where failed requests are recorded
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    while time.perf_counter() < deadline:
+        target = targets[i % len(targets)]
+        i = i + 1
+        start = time.perf_counter()
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+        await writer.drain()
+        status = (await reader.readline()).split()[1]
+        length = 0
+        while True:
+            header = await reader.readline()
+            if header in (b"\r\n", b""):
+                break
+            name, _, value = header.partition(b':')
+            if name.lower() == b"content-length":
+                length = int(value)
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+        if status != b"200":
+            errors.append(f"{status.decode()} {target}")
+    writer.close()
+
+
+async def run_load(host: str, port: int, clients: int, seconds: float) -> tuple[list[float], list[str]]:
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*[
+        run_client(host, port, build_targets(500, seed=i), deadline, latencies, errors) for i in range(clients)
+    ])
+    return latencies, errors
+
+
+def wait_for_server(host: str, port: int, timeout: float = 10) -> None:
+    """Waits until the server accepts connections."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the lexicon query server.")
+    parser.add_argument("-d", "--database", type=Path, help="start a server for this database; otherwise test "
+                                                            "a server already running at --host and --port")
+    parser.add_argument("--host", default="127.0.0.1", help="server's address")
+    parser.add_argument("-p", "--port", type=int, default=8333, help="server's port")
+    parser.add_argument("-c", "--clients", type=int, default=16, help="concurrent kept-alive connections")
+    parser.add_argument("-s", "--seconds", type=float, default=10, help="how long to send requests for")
+    parser.add_argument("--cache-size", type=int, help="result cache size of the started server")
+    args = parser.parse_args()
+
+    server = None
+    if args.database:
+        command = [sys.executable, str(ServerScript), str(args.database), "--host", args.host, "-p", str(args.port)]
+        if args.cache_size is not None:
+            command = command + ["--cache-size", str(args.cache_size)]
+        server = subprocess.Popen(command)
+        wait_for_server(args.host, args.port)
+    try:
+        latencies, errors = asyncio.run(run_load(args.host, args.port, args.clients, args.seconds))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{len(latencies)} requests from {args.clients} clients in {args.seconds:.0f}s: "
+          f"{len(latencies) / args.seconds:.0f} requests/s")
+    print(f"p50 {quantiles[49] * 1000:.2f} ms, p99 {quantiles[98] * 1000:.2f} ms, "
+          f"max {max(latencies) * 1000:.2f} ms")
+    if errors:
+        print(f"{len(errors)} failed requests, e.g. {errors[0]}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from MR3AttackBuilder import Attack, MR3AttackParser  # noqa: E402
+from MR3ParallelBuilder import DerivationIds, MR3ParallelBuilder, find_inputs  # noqa: E402
+from MR3SqlEmitter import MR3SqlEmitter  # noqa: E402
+from MR3SyntheticData import generate_attack_dump  # noqa: E402
+
+
+def write_split_dump(directory: Path, count: int, files: int) -> Path:
+    """Writes one generated attack dump, and the same dump split at Derivation headers into files parts.
+
+    :return: The whole dump; the parts are written to directory / "parts"
+    :rtype: Path
+    """
+    whole = directory / "attacks.txt"
+    lines = list(generate_attack_dump(count))
+    whole.write_text("\n".join(lines) + "\n")
+    headers = [i for i, line in enumerate(lines) if line.startswith("Derivation:")] + [len(lines)]
+    parts = directory / "parts"
+    parts.mkdir()
+    per_file = -(-(len(headers) - 1) // files)
+    for n, i in enumerate(range(0, len(headers) - 1, per_file)):
+        part = lines[headers[i]:headers[min(i + per_file, len(headers) - 1)]]
+        (parts / f"attacks{n:04}.txt").write_text("\n".join(part) + "\n")
+    return whole
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time parsing a dump split into many files on 1 to N workers.")
+    parser.add_argument("-n", "--attacks", type=int, default=200_000, help="attacks to generate")
+    parser.add_argument("-f", "--files", type=int, default=64, help="files to split the dump into")
+    parser.add_argument("-w", "--max-workers", type=int, default=os.cpu_count(), help="most workers to time")
+    parser.add_argument("-r", "--runs", type=int, default=3, help="builds per worker count; the fastest is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        whole = write_split_dump(Path(directory), args.attacks, args.files)
+        files = find_inputs(Path(directory) / "parts")
+        # The whole dump, parsed serially and ordered the way the builder merges: by derivation, then position
+        rows = sorted((a.values() for a in MR3AttackParser.parse_text(str(whole), DerivationIds)),
+                      key=lambda row: row[0])
+        expected = io.StringIO()
+        MR3SqlEmitter(expected).write_inserts("Attack", Attack.Columns, rows)
+        print(f"{len(rows)} attacks in {len(files)} files; {os.cpu_count()} cores")
+
+        print(f"{'Workers':>7} {'Seconds':>8} {'Speedup':>8} {'Same':>5}")
+        baseline = None
+        for workers in range(1, args.max_workers + 1):
+            builder = MR3ParallelBuilder(workers)
+            timings = []
+            for _ in range(args.runs):
+                out = io.StringIO()
+                start = time.perf_counter()
+                builder.write_query(files, [], out)
+                timings.append(time.perf_counter() - start)
+            seconds = min(timings)
+            baseline = baseline or seconds
+            same = out.getvalue() == expected.getvalue()
+            print(f"{workers:7} {seconds:8.2f} {baseline / seconds:7.2f}x {str(same):>5}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from MR3FandomScraper import MR3FandomScraper  # noqa: E402
+from MR3WikiStandIn import SyntheticWiki  # noqa: E402
+
+
+def parse_fully(page: bytes) -> None:
+    """Parses a page the way the scraper used to: a full html.parser tree, then a search."""
+    soup = BeautifulSoup(page, features="html.parser")
+    content = soup.find(id="mw-content-text")
+    content.find("table", attrs={"class": "wikitable"})
+
+
+def parse_restricted(page: bytes) -> None:
+    """Parses a page through the scraper's parsing layer: only the article body, with the fastest parser."""
+    soup = MR3FandomScraper.parse(page, MR3FandomScraper.ContentStrainer)
+    content = soup.find(id="mw-content-text")
+    content.find("table", attrs={"class": "wikitable"})
+
+
+def measure(parse: Callable[[bytes], None], pages: list[bytes]) -> tuple[float, int]:
+    """Times parsing every page, then measures the largest peak memory of a single parse.
+
+    :param Callable[[bytes], None] parse: Parsing approach to measure
+    :param list[bytes] pages: Pages to parse
+    :return: (Total seconds, peak bytes)
+    :rtype: tuple[float, int]
+    """
+    start = time.perf_counter()
+    for page in pages:
+        parse(page)
+    seconds = time.perf_counter() - start
+
+    peak = 0
+    tracemalloc.start()
+    for page in pages:
+        tracemalloc.reset_peak()
+        parse(page)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and restricted parsing of saved wiki pages.")
+    parser.add_argument("-f", "--fixtures", type=Path, help="directory of saved .html pages; defaults to the "
+                                                            "stand-in's synthetic pages")
+    parser.add_argument("-s", "--save", type=Path, help="save the stand-in's synthetic pages to this directory")
+    parser.add_argument("-n", "--pages", type=int, default=40, help="how many pages to parse")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        pages = [path.read_bytes() for path in sorted(args.fixtures.glob("*.html"))]
+    else:
+        synthetic_pages = SyntheticWiki().pages
+        if args.save:
+            args.save.mkdir(parents=True, exist_ok=True)
+            for title, page in synthetic_pages.items():
+                (args.save / f"{title.replace('/', '_')}.html").write_text(page, encoding="utf-8")
+        pages = [page.encode("utf-8") for page in synthetic_pages.values()]
+    pages = pages[:args.pages]
+
+    before_seconds, before_peak = measure(parse_fully, pages)
+    after_seconds, after_peak = measure(parse_restricted, pages)
+    kib = sum(len(page) for page in pages) / 1024
+    print(f"{len(pages)} pages, {kib:.0f} KiB")
+    print(f"{'Approach':34} {'ms/page':>8} {'Peak KiB':>9}")
+    print(f"{'Full tree, html.parser':34} {before_seconds * 1000 / len(pages):8.1f} {before_peak / 1024:9.0f}")
+    print(f"{f'Strained, {MR3FandomScraper.HtmlParser}':34} {after_seconds * 1000 / len(pages):8.1f} "
+          f"{after_peak / 1024:9.0f}")
+
+
+if __name__ == '__main__':
+    main()
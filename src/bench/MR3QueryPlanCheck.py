@@ -0,0 +1,154 @@
+import argparse
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from MR3DatabaseBuilder import MR3DatabaseBuilder  # noqa: E402
+from MR3LexiconQueries import QueryFiles, read_query_file  # noqa: E402
+from MR3LoadBenchmark import read_reference_objects  # noqa: E402
+
+# Plan steps a query may take which read a whole table or sort in a temporary b-tree, by the query's comment.
+# Any other SCAN or TEMP B-TREE step fails the check.
+ExpectedScans = {
+    "All monsters with type, sub-type (region), and description.": ["SCAN m"],  # Returns every monster
+    "Number of each attack type per monster.": ["SCAN a USING COVERING INDEX IX_Attack_DerivationID_StatUsed_Damage"],
+    # A region holds about a sixth of all monsters; an index on RegionID measured no faster than this scan.
+    "Monsters of one region, across all derivations.": ["SCAN m"],
+    # Derivation has 30 rows, too few for an index on its name to pay off.
+    "Monsters of a derivation, by the derivation's name.": ["SCAN d"],
+    # Read the whole summary, which holds a row or two per derivation or region rather than per attack or monster
+    "Power and intelligence attacks per derivation, from the summary counts.": ["SCAN s"],
+    "Monsters per derivation.": ["SCAN c"],
+    "Monsters per region.": ["SCAN c"]
+}
+
+# An index no sample query runs this much faster with isn't worth its write and space cost.
+MinIndexSpeedup = 1.1
+
+Parameters = {
+    "derivation_id": 12, "region_id": 3, "monster": "Joker", "derivation": "Joker", "stat_used": "Power",
+    "attack_type": "Beat", "item_required": "Jade Bit", "characteristic": "Bold"
+}
+
+
+def check_plan(connection: sqlite3.Connection, name: str, query: str) -> list[str]:
+    """Finds the plan steps of query which scan or sort unexpectedly.
+
+    :param sqlite3.Connection connection: Database to plan against
+    :param str name: Query's name, for its expected scans
+    :param str query: Query to plan
+    :return: Unexpected plan steps
+    :rtype: list[str]
+    """
+    expected = ExpectedScans.get(name, [])
+    steps = [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}", Parameters)]
+    return [step for step in steps if (step.startswith("SCAN") or "TEMP B-TREE" in step) and step not in expected]
+
+
+def index_gains(connection: sqlite3.Connection, queries: list[tuple[str, str]], runs: int) -> dict[str, list]:
+    """Times the queries whose plans use each index, with the index and with only that index dropped.
+
+    Each index is dropped inside a savepoint and restored by rolling it back.
+
+    :param sqlite3.Connection connection: Database to time against
+    :param list[tuple[str, str]] queries: (Name, query) of each query
+    :param int runs: Runs of each query; the fastest is kept
+    :return: For each index, (query name, seconds with the index, seconds without it) of each query using it
+    :rtype: dict[str, list]
+    """
+    indexes = [row[0] for row in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+    plans = {name: " ".join(row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}", Parameters))
+             for name, query in queries}
+    gains = {}
+    for index in indexes:
+        using = [(name, query) for name, query in queries if re.search(rf"INDEX {index}\b", plans[name])]
+        with_index = [time_query(connection, query, runs) for _, query in using]
+        connection.execute("SAVEPOINT ablation")
+        connection.execute(f"DROP INDEX {index}")
+        without_index = [time_query(connection, query, runs) for _, query in using]
+        connection.execute("ROLLBACK TO ablation")
+        connection.execute("RELEASE ablation")
+        gains[index] = [(name, before, after) for (name, _), before, after in zip(using, with_index, without_index)]
+    return gains
+
+
+def time_query(connection: sqlite3.Connection, query: str, runs: int) -> float:
+    """Times fetching all of a query's rows, keeping the fastest run."""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        connection.execute(query, Parameters).fetchall()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def build_scaled_copy(database: Path, scale: int) -> None:
+    """Builds the lexicon with every attack, characteristic and monster repeated scale times."""
+    attacks, characteristics, monsters = read_reference_objects(MR3DatabaseBuilder.BuildScript)
+    MR3DatabaseBuilder.build(database, attacks * scale, characteristics * scale, monsters * scale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the sample and search filter queries use indexes, "
+                                                 "and time them with and without the indexes.")
+    parser.add_argument("-s", "--scale", type=int, default=200, help="times to repeat the data in the scaled copy")
+    parser.add_argument("-r", "--runs", type=int, default=5, help="runs of each query; the fastest is reported")
+    args = parser.parse_args()
+
+    queries = [query for file in QueryFiles for query in read_query_file(file)]
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "scaled.sqlite3"
+        build_scaled_copy(database, args.scale)
+        connection = sqlite3.connect(database)
+
+        failures = 0
+        for name, query in queries:
+            unexpected = check_plan(connection, name, query)
+            failures = failures + (1 if unexpected else 0)
+            print(f"{'FAIL' if unexpected else 'ok':4} {name}")
+            for step in unexpected:
+                print(f"       unexpected: {step}")
+
+        gains = index_gains(connection, queries, args.runs)
+        indexed = [time_query(connection, query, args.runs) for _, query in queries]
+        indexes = [row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name NOT LIKE 'sqlite_%'")]
+        for index in indexes:
+            connection.execute(f"DROP INDEX {index}")
+        unindexed = [time_query(connection, query, args.runs) for _, query in queries]
+        monsters, attacks = connection.execute("SELECT (SELECT COUNT(*) FROM Monster), (SELECT COUNT(*) FROM Attack)"
+                                               ).fetchone()
+        connection.close()
+
+    print(f"\nScaled copy: {monsters} monsters, {attacks} attacks")
+    print(f"{'Indexed ms':>10} {'Unindexed ms':>12}  Query")
+    for (name, _), with_indexes, without_indexes in zip(queries, indexed, unindexed):
+        print(f"{with_indexes * 1000:10.2f} {without_indexes * 1000:12.2f}  {name}")
+
+    print(f"\n{'With ms':>9} {'Without ms':>10} {'Speedup':>8}  Index: query using it")
+    useless = []
+    for index, timings in gains.items():
+        if not timings:
+            print(f"{'':>9} {'':>10} {'':>8}  {index}: not used by the sample queries")
+            continue
+        for name, with_index, without_index in timings:
+            print(f"{with_index * 1000:9.2f} {without_index * 1000:10.2f} {without_index / with_index:7.2f}x  "
+                  f"{index}: {name}")
+        if max(without / with_ for _, with_, without in timings) < MinIndexSpeedup:
+            useless.append(index)
+    if failures:
+        print(f"\n{failures} queries scan or sort unexpectedly", file=sys.stderr)
+    if useless:
+        print(f"\nNo query is at least {MinIndexSpeedup}x faster with: {', '.join(useless)}", file=sys.stderr)
+    if failures or useless:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import random
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from MR3DatabaseBuilder import MR3DatabaseBuilder  # noqa: E402
+from MR3SaucerStoneLog import MR3SaucerStoneLog  # noqa: E402
+from MR3SyntheticData import generate_saucer_stone_log, write_saucer_stone_log  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest a synthetic Saucer Stone log, then time lookups.")
+    parser.add_argument("-r", "--rows", type=int, default=1_000_000, help="logged trials to generate")
+    parser.add_argument("-f", "--format", choices=["csv", "jsonl"], default="csv", help="log file format")
+    parser.add_argument("-b", "--batch-size", type=int, default=100_000, help="rows to read between commits")
+    parser.add_argument("-l", "--lookups", type=int, default=10_000, help="disk lookups to time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "lexicon.sqlite3"
+        connection = sqlite3.connect(database)
+        connection.executescript(MR3DatabaseBuilder.BuildScript.read_text(encoding="utf-8"))
+        monsters = [row[0] for row in connection.execute("SELECT Monster FROM Monster ORDER BY Id")]
+        file = write_saucer_stone_log(Path(directory) / f"log.{args.format}", args.rows, monsters)
+        print(f"{args.rows} rows, {file.stat().st_size / 1024 / 1024:.1f} MiB of {args.format}")
+
+        log = MR3SaucerStoneLog(connection)
+        start = time.perf_counter()
+        counts = log.ingest(MR3SaucerStoneLog.read_rows(file), args.batch_size)
+        seconds = time.perf_counter() - start
+        pairs = connection.execute("SELECT COUNT(*) FROM SaucerStoneMonster").fetchone()[0]
+        print(f"Ingested in {seconds:.2f} s ({counts['rows'] / seconds:,.0f} rows/s): {counts['new_disks']} disks, "
+              f"{pairs} disk-monster pairs; peak RSS "
+              f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+        generator = random.Random(7)
+        trials = list(generate_saucer_stone_log(args.lookups, monsters, seed=11))
+        start = time.perf_counter()
+        answers = [log.monsters_for(title) for title, _ in trials]
+        disk_seconds = (time.perf_counter() - start) / len(trials)
+        # A disk's most logged monster should be the one it produces, whichever spelling is looked up; disks
+        # with a trial or two may not have been logged correctly often enough yet.
+        right = sum(1 for (title, _), answer in zip(trials, answers)
+                    if answer and answer[0][0] == monsters[int(title.strip(" !").split()[-1]) % len(monsters)])
+
+        chosen = [generator.choice(monsters) for _ in range(100)]
+        start = time.perf_counter()
+        disks = [len(log.disks_for(monster)) for monster in chosen]
+        monster_seconds = (time.perf_counter() - start) / len(chosen)
+        connection.close()
+
+    print(f"Which monster does this disk produce: {disk_seconds * 1e6:.1f} us per lookup; "
+          f"{right / len(trials):.2%} answered with the disk's monster")
+    print(f"Which disks produce this monster: {monster_seconds * 1000:.2f} ms per lookup, "
+          f"{sum(disks) / len(disks):.0f} disks each")
+
+
+if __name__ == '__main__':
+    main()
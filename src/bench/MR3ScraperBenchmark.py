@@ -0,0 +1,67 @@
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from MR3FandomScraper import MR3FandomScraper, TokenBucket  # noqa: E402
+from MR3WikiStandIn import SyntheticWiki, WikiStandIn  # noqa: E402
+
+
+def point_scraper_at(server: WikiStandIn) -> None:
+    """Points the scraper at the stand-in server instead of the live wiki.
+
+    :param WikiStandIn server: Running stand-in server
+    """
+    MR3FandomScraper.WikiURL = server.wiki_url
+    MR3FandomScraper.EncyclopediaURL = server.wiki_url + "Monster_Rancher_3_Encyclopedia"
+    MR3FandomScraper.ApiURL = server.api_url
+    MR3FandomScraper._session = None  # Start each run with a fresh connection pool.
+
+
+def time_scrape(server: WikiStandIn, count: int, workers: int) -> tuple[float, list[str]]:
+    """Scrapes from the stand-in, timing the run.
+
+    :param WikiStandIn server: Running stand-in server
+    :param int count: How many monsters to scrape
+    :param int workers: Concurrent fetches; 1 runs the sequential loop
+    :return: (Wall-clock seconds, scraped monsters as text)
+    :rtype: tuple[float, list[str]]
+    """
+    point_scraper_at(server)
+    server.reset_counters()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        monsters = MR3FandomScraper.get_all_monsters(count, workers=workers)
+    return time.perf_counter() - start, [str(m) for m in monsters]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and concurrent scraping against a local stand-in.")
+    parser.add_argument("-c", "--count", type=int, default=0, help="monsters to scrape; 0 scrapes all")
+    parser.add_argument("-w", "--workers", type=int, default=MR3FandomScraper.MaxWorkers)
+    parser.add_argument("-l", "--latency", type=float, default=0.250, help="simulated seconds per response")
+    parser.add_argument("-r", "--rate", type=float, default=10, help="rate limit, in requests per second")
+    args = parser.parse_args()
+
+    MR3FandomScraper.RateLimiter = TokenBucket(rate=args.rate, capacity=5)
+    with WikiStandIn(SyntheticWiki(), latency=args.latency) as server:
+        sequential_time, sequential_monsters = time_scrape(server, args.count, 1)
+        sequential_requests, sequential_connections = server.requests, server.connections
+        concurrent_time, concurrent_monsters = time_scrape(server, args.count, args.workers)
+        concurrent_requests, concurrent_connections = server.requests, server.connections
+
+    print(f"Monsters scraped: {len(sequential_monsters)}")
+    print(f"Sequential:       {sequential_time:8.2f} s  "
+          f"({sequential_requests} requests over {sequential_connections} connections)")
+    print(f"Concurrent (x{args.workers}): {concurrent_time:8.2f} s  "
+          f"({concurrent_requests} requests over {concurrent_connections} connections)")
+    print(f"Speed-up:         {sequential_time / concurrent_time:8.2f}x")
+    print(f"Same results, same order: {sequential_monsters == concurrent_monsters}")
+
+
+if __name__ == '__main__':
+    main()
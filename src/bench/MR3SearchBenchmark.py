@@ -0,0 +1,76 @@
+import argparse
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from MR3QueryPlanCheck import build_scaled_copy  # noqa: E402
+from MR3Search import MR3Search  # noqa: E402
+
+# Table -> columns searched with LIKE, matching each FTS5 table's columns
+LikeColumns = {
+    "Monster": ["Monster", "Description"],
+    "Characteristic": ["Characteristic", "Description"],
+    "Attack": ["Attack", "AttackType", "ItemRequired", "Effect"]
+}
+
+Searches = ["sponge", "fire", "sleeping lion", "water of happiness", "gre"]
+
+
+def search_with_like(connection: sqlite3.Connection, text: str) -> int:
+    """Finds rows holding every word of text anywhere in a searched column, the way LIKE allows.
+
+    :param sqlite3.Connection connection: Connection to a lexicon database
+    :param str text: Text to search for
+    :return: How many rows matched; LIKE cannot rank them
+    :rtype: int
+    """
+    words = re.findall(r"\w+", text)
+    matches = 0
+    for table, columns in LikeColumns.items():
+        row_text = " || ' ' || ".join(columns)
+        condition = " AND ".join([f"({row_text}) LIKE ?"] * len(words))
+        matches = matches + len(connection.execute(f"SELECT Id FROM {table} WHERE {condition}",
+                                                   [f"%{word}%" for word in words]).fetchall())
+    return matches
+
+
+def best_of(runs: int, search: Callable[[], object]) -> float:
+    """Times search several times, keeping the fastest run."""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        search()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare FTS5 search with LIKE on a scaled-up lexicon.")
+    parser.add_argument("-s", "--scale", type=int, default=200, help="times to repeat the data in the scaled copy")
+    parser.add_argument("-r", "--runs", type=int, default=5, help="runs of each search; the fastest is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "scaled.sqlite3"
+        build_scaled_copy(database, args.scale)
+        connection = sqlite3.connect(database)
+        rows = sum(connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in LikeColumns)
+        print(f"Scaled copy: {rows} searchable rows")
+        print(f"{'LIKE ms':>8} {'FTS5 ms':>8} {'LIKE rows':>10} {'FTS5 rows':>10}  Search")
+        for text in Searches:
+            like_seconds = best_of(args.runs, lambda: search_with_like(connection, text))
+            fts_seconds = best_of(args.runs, lambda: MR3Search.search(connection, text))
+            like_rows = search_with_like(connection, text)
+            fts_rows = len(MR3Search.search(connection, text, limit=rows))
+            print(f"{like_seconds * 1000:8.2f} {fts_seconds * 1000:8.2f} {like_rows:10} {fts_rows:10}  {text}")
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
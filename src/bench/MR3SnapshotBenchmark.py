@@ -0,0 +1,100 @@
+import argparse
+import json
+import py_compile
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+UtilDirectory = Path(__file__).resolve().parent.parent / "util"
+sys.path.insert(0, str(UtilDirectory))
+
+from MR3QueryPlanCheck import build_scaled_copy  # noqa: E402
+from MR3SnapshotExporter import MR3SnapshotExporter  # noqa: E402
+
+# Each lookup runs as its own program, the way a command-line tool would: time is counted from the program's
+# first line, so it includes importing what the lookup needs, and it ends by reporting its peak RSS.
+Prologue = """
+import time
+start = time.perf_counter()
+import json, resource, sys
+"""
+Epilogue = """
+seconds = time.perf_counter() - start
+# ru_maxrss can carry over the parent's peak across exec, so prefer the peak of this program's own memory.
+with open("/proc/self/status") as status:
+    peak = [int(line.split()[1]) for line in status if line.startswith("VmHWM:")]
+print(json.dumps({"seconds": seconds, "found": found,
+                  "peak_rss_kib": peak[0] if peak else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+Lookups = {
+    "sqlite": """
+import sqlite3
+connection = sqlite3.connect(sys.argv[1])
+monsters = connection.execute(
+    "SELECT m.Id, m.Monster, d.Derivation, r.Region, m.Description FROM Monster m "
+    "JOIN Derivation d ON m.DerivationID = d.Id JOIN Region r ON m.RegionID = r.Id "
+    "WHERE m.Monster = ? COLLATE NOCASE", [sys.argv[2]]).fetchall()
+attack = connection.execute(
+    "SELECT a.*, d.Derivation FROM Attack a JOIN Derivation d ON a.DerivationId = d.Id WHERE a.Id = ?",
+    [int(sys.argv[3])]).fetchone()
+found = len(monsters) + (attack is not None)
+""",
+    "snapshot": f"""
+sys.path.insert(0, {str(UtilDirectory)!r})
+from MR3Snapshot import MR3Snapshot
+snapshot = MR3Snapshot(sys.argv[1])
+found = len(snapshot.monsters_named(sys.argv[2])) + (snapshot.attack(int(sys.argv[3])) is not None)
+"""
+}
+
+
+def measure_in_child(kind: str, path: Path, monster: str, attack_id: int) -> dict:
+    """Runs one lookup in a fresh interpreter.
+
+    :param str kind: Key of Lookups
+    :param Path path: Database or snapshot to look in
+    :param str monster: Monster's name to look up
+    :param int attack_id: Attack's Id to look up
+    :return: {"seconds", "found", "peak_rss_kib", "process_seconds"}
+    :rtype: dict
+    """
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", Prologue + Lookups[kind] + Epilogue, str(path), monster,
+                             str(attack_id)], check=True, capture_output=True, text=True).stdout
+    result = json.loads(output)
+    result["process_seconds"] = time.perf_counter() - start
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cold-start lookups in a snapshot with the SQLite path.")
+    parser.add_argument("-s", "--scale", type=int, default=1, help="times to repeat the data, for a larger lexicon")
+    parser.add_argument("-r", "--runs", type=int, default=10, help="lookups of each kind; the fastest is reported")
+    parser.add_argument("-m", "--monster", default="Metal Head", help="monster's name to look up")
+    parser.add_argument("-a", "--attack-id", type=int, default=100, help="attack's Id to look up")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "lexicon.sqlite3"
+        snapshot = Path(directory) / "lexicon.mr3"
+        build_scaled_copy(database, args.scale)
+        connection = sqlite3.connect(database)
+        MR3SnapshotExporter.export(connection, snapshot)
+        connection.close()
+        # Compiled ahead, as an installed tool would be, so neither lookup pays for compiling its source.
+        py_compile.compile(str(UtilDirectory / "MR3Snapshot.py"))
+        print(f"Database {database.stat().st_size / 1024:.0f} KiB, snapshot {snapshot.stat().st_size / 1024:.0f} KiB")
+
+        print(f"{'Lookup':9} {'Lookup ms':>9} {'Process ms':>10} {'Peak RSS MiB':>13} {'Found':>6}")
+        for kind, path in [("sqlite", database), ("snapshot", snapshot)]:
+            results = [measure_in_child(kind, path, args.monster, args.attack_id) for _ in range(args.runs)]
+            print(f"{kind:9} {min(r['seconds'] for r in results) * 1000:9.2f} "
+                  f"{min(r['process_seconds'] for r in results) * 1000:10.2f} "
+                  f"{min(r['peak_rss_kib'] for r in results) / 1024:13.1f} {results[0]['found']:6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "util"))
+
+from MR3QueryPlanCheck import build_scaled_copy  # noqa: E402
+from MR3SummaryTables import MR3SummaryTables  # noqa: E402
+
+Stats = ["Power", "Intelligence"]
+AttackTypes = ["Beat", "Cut", "Fire", "Water", "Wind", "Earth"]
+Ranges = ["Close", "Mid", "Long"]
+
+
+def churn(connection: sqlite3.Connection, writes: int, seed: int = 3) -> None:
+    """Inserts, moves and deletes random attacks and monsters, as edits to the lexicon would, one commit each.
+
+    :param sqlite3.Connection connection: Connection to a lexicon database
+    :param int writes: How many writes to make
+    :param int seed: Seed, so every run makes the same writes
+    """
+    generator = random.Random(seed)
+    attack_ids = [row[0] for row in connection.execute("SELECT Id FROM Attack")]
+    monster_ids = [row[0] for row in connection.execute("SELECT Id FROM Monster")]
+    for _ in range(writes):
+        roll = generator.random()
+        with connection:
+            if roll < 0.3:
+                cursor = connection.execute(
+                    "INSERT INTO Attack (DerivationId, Attack, StatUsed, AttackType, ItemRequired, GutsUsed, Damage, "
+                    "GutsDown, Critical, Hit, MaxLevel, AttackRange, Growth, Effect) "
+                    "VALUES (?, 'Churn', ?, ?, '-', 10, 10, 0, 0, 0, 1, ?, 'None', 'None')",
+                    [generator.randint(1, 30), generator.choice(Stats), generator.choice(AttackTypes),
+                     generator.choice(Ranges)])
+                attack_ids.append(cursor.lastrowid)
+            elif roll < 0.6:
+                connection.execute("UPDATE Attack SET DerivationID = ?, AttackType = ? WHERE Id = ?",
+                                   [generator.randint(1, 30), generator.choice(AttackTypes),
+                                    generator.choice(attack_ids)])
+            elif roll < 0.75:
+                attack_id = attack_ids.pop(generator.randrange(len(attack_ids)))
+                connection.execute("DELETE FROM Attack WHERE Id = ?", [attack_id])
+            elif roll < 0.9:
+                connection.execute("UPDATE Monster SET RegionID = ? WHERE Id = ?",
+                                   [generator.randint(1, 6), generator.choice(monster_ids)])
+            else:
+                monster_id = monster_ids.pop(generator.randrange(len(monster_ids)))
+                connection.execute("DELETE FROM Monster WHERE Id = ?", [monster_id])
+
+
+def best_of(runs: int, run: Callable[[], object]) -> float:
+    """Times run several times, keeping the fastest run."""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the summary tables with the aggregates they replace, "
+                                                 "then check they stay consistent through random writes.")
+    parser.add_argument("-s", "--scale", type=int, default=200, help="times to repeat the data in the scaled copy")
+    parser.add_argument("-r", "--runs", type=int, default=5, help="runs of each query; the fastest is reported")
+    parser.add_argument("-w", "--writes", type=int, default=5000, help="random writes to check the triggers with")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "scaled.sqlite3"
+        build_scaled_copy(database, args.scale)
+        connection = sqlite3.connect(database)
+        print(f"{'Aggregate ms':>12} {'Summary ms':>10}  Summary")
+        for summary, (_, keys, count) in MR3SummaryTables.Summaries.items():
+            aggregate = MR3SummaryTables.aggregate_query(summary)
+            lookup = f"SELECT {', '.join(keys)}, {count} FROM {summary}"
+            aggregate_seconds = best_of(args.runs, lambda: connection.execute(aggregate).fetchall())
+            summary_seconds = best_of(args.runs, lambda: connection.execute(lookup).fetchall())
+            print(f"{aggregate_seconds * 1000:12.3f} {summary_seconds * 1000:10.3f}  {summary}")
+
+        start = time.perf_counter()
+        churn(connection, args.writes)
+        seconds = time.perf_counter() - start
+        print(f"{args.writes} random writes, with the summary triggers: {seconds / args.writes * 1e6:.0f} us each")
+        differences = MR3SummaryTables.check(connection)
+        connection.close()
+
+    for difference in differences:
+        print(difference)
+    print(f"Summaries consistent: {not differences}")
+    if differences:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+import csv
+import json
+import random
+from pathlib import Path
+from typing import Iterator, Union
+
+Derivations = [
+    "Baku", "Beaklon", "Colorpandora", "Dragon", "Dakkung", "Durahan", "Gitan", "Golem", "Hare", "Henger",
+    "Jell", "Joker", "Lesione", "Mew", "Mocchi", "Mogi", "Momo", "Naga", "Octopee", "Ogyo",
+    "Pancho", "Pixie", "Plant", "Psiroller", "Raiden", "Suezo", "Suzurin", "Tiger", "Zan", "Zoom"
+]
+Stats = ["Power", "Intelligence"]
+AttackTypes = ["Beat", "Cut", "Fire", "Water", "Wind", "Earth", "Thunder", "Ray"]
+Items = ["-", "Aqua Bit", "Jade Bit", "Aqua Stone", "Ruby Stone", "Gold Bit"]
+Ranges = ["Close", "Mid", "Far", "All"]
+Growths = ["None", "Hit +1", "Damage +1", "Hit +1, Critical +1", "Guts Down +1"]
+Effects = ["-", "Dizzy", "Poison", "Sleep", "Guts Down"]
+Words = ["Tail", "Core", "Upper", "Heavy", "Flame", "Ice", "Spin", "Rush", "Beam", "Kick", "Slap", "Bomb", "Roll"]
+
+
+def generate_attack_dump(count: int, seed: int = 3, attacks_per_derivation: int = 12) -> Iterator[str]:
+    """Generates the lines of an attack document shaped like the ones MR3AttackBuilder reads.
+
+    Derivations are cycled through as often as needed, like a dump of several games' attack lists.
+
+    :param int count: How many attacks to generate
+    :param int seed: Seed, so the same arguments always give the same document
+    :param int attacks_per_derivation: Attacks listed under each Derivation header
+    :return: Lines of the document, without line endings
+    :rtype: Iterator[str]
+    """
+    generator = random.Random(seed)
+    for i in range(count):
+        if i % attacks_per_derivation == 0:
+            yield f"Derivation: {Derivations[i // attacks_per_derivation % len(Derivations)]}"
+            yield ""
+        yield f"Attack: {generator.choice(Words)} {generator.choice(Words)}"
+        yield f"Stat Used: {generator.choice(Stats)}"
+        yield f"Type: {generator.choice(AttackTypes)}"
+        yield f"Item: {generator.choice(Items)}"
+        yield f"Guts Used: {generator.randint(8, 50)}"
+        yield f"Damage: {generator.randint(5, 40)}"
+        yield f"Guts Down: {generator.choice(['-', generator.randint(0, 20)])}"
+        yield f"Critical: {generator.randint(0, 30)}"
+        yield f"Hit: {generator.randint(20, 80)}"
+        yield f"Max Level: {generator.randint(1, 10)}"
+        yield f"Range: {generator.choice(Ranges)}"
+        yield f"Growth: {generator.choice(Growths)}"
+        yield f"Effect: {generator.choice(Effects)}"
+        yield ""
+
+
+def write_attack_dump(path: Union[str, Path], count: int, seed: int = 3) -> Path:
+    """Writes a generated attack document to path.
+
+    :param Union[str, Path] path: File to write
+    :param int count: How many attacks to generate
+    :param int seed: Seed for the generator
+    :return: The written file
+    :rtype: Path
+    """
+    path = Path(path)
+    with open(path, "w") as f:
+        for line in generate_attack_dump(count, seed):
+            f.write(line + "\n")
+    return path
+
+
+Moods = ["Active", "Aloof", "Bold", "Calm", "Cheerful", "Clever", "Gentle", "Lazy", "Proud", "Shy", "Timid", "Wild"]
+Sayings = ["Something you wanted to say?", "Oh, nothing...", "Let's go!", "I'm not hungry.", "Leave it to me!"]
+
+
+def generate_characteristic_file(count: int, seed: int = 3) -> Iterator[str]:
+    """Generates the lines of a characteristic document shaped like the one MR3CharacteristicBuilder reads.
+
+    :param int count: How many characteristics to generate
+    :param int seed: Seed, so the same arguments always give the same document
+    :return: Lines of the document, header first, without line endings
+    :rtype: Iterator[str]
+    """
+    generator = random.Random(seed)
+    yield "Name;Description"
+    for i in range(count):
+        yield f"{generator.choice(Moods)} {i};\"{generator.choice(Sayings)} {generator.choice(Sayings)}\""
+
+
+def write_characteristic_file(path: Union[str, Path], count: int, seed: int = 3) -> Path:
+    """Writes a generated characteristic document to path.
+
+    :param Union[str, Path] path: File to write
+    :param int count: How many characteristics to generate
+    :param int seed: Seed for the generator
+    :return: The written file
+    :rtype: Path
+    """
+    path = Path(path)
+    with open(path, "w") as f:
+        for line in generate_characteristic_file(count, seed):
+            f.write(line + "\n")
+    return path
+
+
+def generate_saucer_stone_log(count: int, monsters: list[str], disks: int = 200_000,
+                              seed: int = 3) -> Iterator[tuple[str, str]]:
+    """Generates (disk title, monster) trials, like a log of many players' shrine visits.
+
+    Each disk produces one monster, but titles are typed inconsistently (case, spacing, punctuation)
+    and about one trial in fifty is logged with a different monster.
+
+    :param int count: How many trials to generate
+    :param list[str] monsters: Monster names to draw from
+    :param int disks: How many distinct disks are tried
+    :param int seed: Seed, so the same arguments always give the same log
+    :return: (Disk title, monster name) of each trial
+    :rtype: Iterator[tuple[str, str]]
+    """
+    generator = random.Random(seed)
+    for _ in range(count):
+        disk = generator.randrange(disks)
+        words = [Words[(disk * 7 + i * 3) % len(Words)] for i in range(disk % 3 + 2)]
+        title = f"{' '.join(words)} {disk}"
+        roll = generator.random()
+        if roll < 0.2:
+            title = title.upper()
+        elif roll < 0.3:
+            title = f"  {title.replace(' ', '  ')}!"
+        monster = monsters[disk % len(monsters)] if generator.random() >= 0.02 else generator.choice(monsters)
+        yield title, monster
+
+
+def write_saucer_stone_log(path: Union[str, Path], count: int, monsters: list[str], seed: int = 3) -> Path:
+    """Writes a generated Saucer Stone log to path, as JSONL if its suffix is .jsonl, else as CSV.
+
+    :param Union[str, Path] path: File to write
+    :param int count: How many trials to generate
+    :param list[str] monsters: Monster names to draw from
+    :param int seed: Seed for the generator
+    :return: The written file
+    :rtype: Path
+    """
+    path = Path(path)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            for title, monster in generate_saucer_stone_log(count, monsters, seed=seed):
+                f.write(json.dumps({"title": title, "monster": monster}) + "\n")
+        else:
+            writer = csv.writer(f)
+            writer.writerow(["title", "monster"])
+            writer.writerows(generate_saucer_stone_log(count, monsters, seed=seed))
+    return path
@@ -0,0 +1,420 @@
+import html
+import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Union
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+BuildScript = Path(__file__).resolve().parent.parent / "sql" / "build_reference_tables.sql"
+
+RegionNames = ["Brillia", "Goat", "Takrama", "Kalaragi", "Morx", "Special"]
+
+
+def to_encyclopedia_name(name: str) -> str:
+    """Reverses the spelling corrections the scraper applies to Encyclopedia names.
+
+    :param str name: Corrected name, as stored in the lexicon
+    :return: Name as spelled in the Encyclopedia
+    :rtype: str
+    """
+    return (
+        name
+        .replace("Colorpandora", "Color Pandora")
+        .replace("Hengar", "Henger")
+        .replace("Beaklon", "Beaclon")
+    )
+
+
+def to_page_title(name: str) -> str:
+    """Formats an Encyclopedia name as the scraper formats it for URLs.
+
+    :param str name: Encyclopedia name
+    :return: Wiki page title
+    :rtype: str
+    """
+    return name.replace(' ', '_').replace("Cactun", "Cactan")
+
+
+class SyntheticMonster:
+    def __init__(self, name, derivation_id, derivation, region_id, description, page_title):
+        self.name = name
+        self.derivation_id = derivation_id
+        self.derivation = derivation
+        self.region_id = region_id
+        self.description = description
+        self.page_title = page_title
+
+
+class SyntheticWiki:
+    """Wiki pages rebuilt in the Fandom wiki's markup from the lexicon's own `Monster` data.
+
+    Pages are spread over the same URL variants the live wiki uses, so the scraper's probing is exercised:
+    monsters sharing their derivation's name live at `_(Monster)` behind a disambiguation page,
+    every seventh monster lives at `_(<Derivation>)` with a redirect from its plain name,
+    and every third special monster lives at `_(???_Sub)`.
+    Each page carries `chrome_bytes` of navigation filler so page weight resembles the live site,
+    and has matching wikitext for the MediaWiki API.
+
+    Nothing here is captured from the live wiki: the markup is generated in the shape the scraper expects,
+    so it exercises fetching, probing and parse cost, but can't catch the scraper misreading real pages.
+    """
+    def __init__(self, chrome_bytes: int = 150_000, build_script: Path = BuildScript):
+        self.chrome = self.build_chrome(chrome_bytes)
+        self.monsters = self.load_monsters(build_script)
+        self.pages = {"Monster_Rancher_3_Encyclopedia": self.build_encyclopedia()}
+        self.wikitext = {}
+        self.redirects = {}
+        for monster in self.monsters:
+            self.pages[monster.page_title] = self.build_monster_page(monster)
+            self.wikitext[monster.page_title] = self.build_monster_wikitext(monster)
+            direct_title = to_page_title(to_encyclopedia_name(monster.name))
+            if monster.page_title == direct_title:
+                continue
+            if monster.name == monster.derivation:
+                self.pages.setdefault(direct_title, self.build_disambiguation_page(monster))
+                self.wikitext.setdefault(direct_title, self.build_disambiguation_wikitext(monster))
+            elif monster.page_title.endswith(f"_({monster.derivation})"):
+                self.redirects[direct_title] = monster.page_title
+        self._page_ids = {title: 1000 + i for i, title in enumerate(sorted(self.wikitext))}
+        self._edits = {}  # Page title -> (revision ID, timestamp) of its latest edit
+
+    def page_id(self, title: str) -> int:
+        return self._page_ids[title]
+
+    def revision_id(self, title: str) -> int:
+        return self._edits[title][0] if title in self._edits else 50_000 + self.page_id(title)
+
+    def revision_timestamp(self, title: str) -> str:
+        return self._edits[title][1] if title in self._edits else "2021-06-01T00:00:00Z"
+
+    def edit(self, monster: SyntheticMonster, description: str) -> None:
+        """Changes a monster's description, giving its page a new revision.
+
+        :param SyntheticMonster monster: Monster to edit
+        :param str description: New description
+        """
+        monster.description = description
+        self.pages[monster.page_title] = self.build_monster_page(monster)
+        self.wikitext[monster.page_title] = self.build_monster_wikitext(monster)
+        revision_id = 100_000 + len(self._edits) + 1
+        self._edits[monster.page_title] = (revision_id, f"2021-07-{len(self._edits) % 28 + 1:02d}T00:00:00Z")
+
+    @staticmethod
+    def load_monsters(build_script: Path) -> list[SyntheticMonster]:
+        """Loads the lexicon's monsters by running the build script into an in-memory database.
+
+        :param Path build_script: Path to build_reference_tables.sql
+        :return: Monsters in Encyclopedia order
+        :rtype: list[SyntheticMonster]
+        """
+        connection = sqlite3.connect(":memory:")
+        connection.executescript(build_script.read_text(encoding="utf-8"))
+        rows = connection.execute(
+            "SELECT m.Monster, m.DerivationID, d.Derivation, m.RegionID, m.Description "
+            "FROM Monster m JOIN Derivation d ON m.DerivationID = d.Id ORDER BY m.DerivationID, m.RegionID, m.Id"
+        ).fetchall()
+        connection.close()
+
+        monsters = []
+        special_count = 0
+        for index, (name, derivation_id, derivation, region_id, description) in enumerate(rows):
+            title = to_page_title(to_encyclopedia_name(name))
+            if name == derivation:
+                title = f"{title}_(Monster)"
+            elif index % 7 == 6:
+                title = f"{title}_({derivation})"
+            elif region_id == 6:
+                special_count = special_count + 1
+                if special_count % 3 == 0:
+                    title = f"{title}_(???_Sub)"
+            monsters.append(SyntheticMonster(name, derivation_id, derivation, region_id, description, title))
+        return monsters
+
+    @staticmethod
+    def build_chrome(size: int) -> str:
+        """Builds navigation filler approximating the live site's page weight.
+
+        :param int size: Approximate size of the filler in characters
+        :return: Filler HTML
+        :rtype: str
+        """
+        item = '<li class="wds-dropdown__item"><a href="/wiki/Special:Random" data-tracking="explore">Random</a></li>\n'
+        return f'<nav class="fandom-community-header">\n<ul>\n{item * (size // len(item))}</ul>\n</nav>\n'
+
+    def wrap(self, title: str, content: str) -> str:
+        """Wraps page content in the wiki's skin.
+
+        :param str title: Page title
+        :param str content: Parsed page content
+        :return: Full page HTML
+        :rtype: str
+        """
+        return (
+            f"<!DOCTYPE html>\n<html><head><title>{html.escape(title)} | Monster Rancher Wiki | Fandom</title></head>\n"
+            f"<body>\n{self.chrome}<main>\n<h1>{html.escape(title.replace('_', ' '))}</h1>\n"
+            f'<div id="mw-content-text" class="mw-body-content"><div class="mw-parser-output">\n'
+            f"{content}</div></div>\n</main>\n{self.chrome}</body></html>"
+        )
+
+    def build_encyclopedia(self) -> str:
+        """Builds the Encyclopedia page: one section per derivation, each with a Location/Monster chart.
+
+        :return: Encyclopedia HTML
+        :rtype: str
+        """
+        sections = ['<h2 id="mw-toc-heading">Contents</h2>\n']
+        derivation_ids = sorted({m.derivation_id for m in self.monsters})
+        for derivation_id in derivation_ids:
+            members = [m for m in self.monsters if m.derivation_id == derivation_id]
+            header = f"{to_encyclopedia_name(members[0].derivation)}s"
+            rows = ["<tr>\n<th>Location\n</th>\n<th>Monster\n</th></tr>"]
+            for region_id, region in enumerate(RegionNames, start=1):
+                in_region = [m for m in members if m.region_id == region_id] or [None]
+                for monster in in_region:
+                    location = '?' if region_id == 6 else region
+                    name = '-' if monster is None else (
+                        f'<a href="/wiki/{html.escape(monster.page_title)}">'
+                        f"{html.escape(to_encyclopedia_name(monster.name))}</a>"
+                    )
+                    rows.append(f"<tr>\n<td>{location}\n</td>\n<td>{name}\n</td></tr>")
+            sections.append(
+                f'<h2><span class="mw-headline">{header}</span></h2>\n'
+                f'<table class="wikitable">\n<tbody>{"".join(rows)}\n</tbody></table>\n'
+            )
+        return self.wrap("Monster_Rancher_3_Encyclopedia", "".join(sections))
+
+    def build_monster_page(self, monster: SyntheticMonster) -> str:
+        """Builds a monster's page, with its Game/Name/Description summary table.
+
+        :param SyntheticMonster monster: Monster to build the page for
+        :return: Monster page HTML
+        :rtype: str
+        """
+        name = html.escape(to_encyclopedia_name(monster.name))
+        # The Name column matches the scraper's cleaned comparison form.
+        name_column = html.escape(monster.name.replace('-', ' ').replace("Cactun", "Cactan"))
+        rows = (
+            "<tr>\n<th>Game\n</th>\n<th>Name\n</th>\n<th>Description\n</th></tr>\n"
+            '<tr>\n<td><i><a href="/wiki/Monster_Rancher_2" title="Monster Rancher 2">Monster Rancher 2</a></i>\n</td>\n'
+            f"<td>{name_column}\n</td>\n<td>Not present in this game.\n</td></tr>\n"
+            '<tr>\n<td><i><a href="/wiki/Monster_Rancher_3" title="Monster Rancher 3">Monster Rancher 3</a></i>\n</td>\n'
+            f"<td>{name_column}\n</td>\n<td>\"{html.escape(monster.description, quote=False)}\"\n</td></tr>\n"
+        )
+        content = (
+            f"<p><b>{name}</b> is a {html.escape(monster.derivation)} sub-breed.</p>\n"
+            f'<table class="wikitable">\n<tbody>{rows}</tbody></table>\n'
+        )
+        return self.wrap(monster.page_title, content)
+
+    @staticmethod
+    def build_monster_wikitext(monster: SyntheticMonster) -> str:
+        """Builds the wikitext of a monster's page.
+
+        :param SyntheticMonster monster: Monster to build the wikitext for
+        :return: Monster page wikitext
+        :rtype: str
+        """
+        name = to_encyclopedia_name(monster.name)
+        name_column = monster.name.replace('-', ' ').replace("Cactun", "Cactan")
+        return (
+            f"'''{name}''' is a [[{monster.derivation}]] sub-breed.\n"
+            '{| class="wikitable"\n'
+            "!Game!!Name!!Description\n"
+            "|-\n"
+            f"|''[[Monster Rancher 2]]''||{name_column}||Not present in this game.\n"
+            "|-\n"
+            f"|''[[Monster Rancher 3]]''||{name_column}||\"{monster.description}\"\n"
+            "|}\n"
+            "[[Category:Monster Rancher 3 Monsters]]"
+        )
+
+    @staticmethod
+    def build_disambiguation_wikitext(monster: SyntheticMonster) -> str:
+        """Builds the wikitext of a derivation's overview page, which has no summary table.
+
+        :param SyntheticMonster monster: Monster whose name is shared with its derivation
+        :return: Disambiguation page wikitext
+        :rtype: str
+        """
+        name = to_encyclopedia_name(monster.name)
+        return f"'''{name}''' may refer to:\n* [[{monster.page_title.replace('_', ' ')}]]\n{{{{disambig}}}}"
+
+    def build_disambiguation_page(self, monster: SyntheticMonster) -> str:
+        """Builds a derivation's overview page, which has no summary table.
+
+        :param SyntheticMonster monster: Monster whose name is shared with its derivation
+        :return: Disambiguation page HTML
+        :rtype: str
+        """
+        name = html.escape(to_encyclopedia_name(monster.name))
+        content = f'<p><b>{name}</b> may refer to:</p>\n<ul><li><a href="/wiki/{monster.page_title}">{name}</a></li></ul>\n'
+        return self.wrap(name, content)
+
+
+class WikiStandIn:
+    """A local, threaded HTTP server which serves a SyntheticWiki with keep-alive and optional simulated latency.
+
+    Like the live API, it can return the wikitext of at most `contents_per_response` pages per API response,
+    leaving the rest to requests which carry on from its `continue` block.
+
+    Usage:
+
+    >>> with WikiStandIn(SyntheticWiki(chrome_bytes=0)) as server:
+    ...     server.wiki_url.startswith("http://127.0.0.1:")
+    True
+    """
+    def __init__(self, wiki: SyntheticWiki, latency: float = 0.0, contents_per_response: Union[int, None] = None):
+        self.wiki = wiki
+        self.latency = latency
+        self.contents_per_response = contents_per_response
+        self.requests = 0
+        self.bytes_sent = 0
+        self.connections = 0
+        self.paths = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self.build_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def wiki_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/wiki/"
+
+    @property
+    def api_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/api.php"
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests = self.bytes_sent = self.connections = 0
+            self.paths = {}
+
+    def record(self, path: str, size: int) -> None:
+        with self._lock:
+            self.requests = self.requests + 1
+            self.bytes_sent = self.bytes_sent + size
+            self.paths[path] = self.paths.get(path, 0) + 1
+
+    def build_handler(self) -> type:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep connections alive, like the live site.
+
+            def setup(self):
+                super().setup()
+                with stand_in._lock:
+                    stand_in.connections = stand_in.connections + 1
+
+            def do_GET(self):
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+                status, headers, body = stand_in.respond(self.path)
+                stand_in.record(self.path, len(body))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def respond(self, path: str) -> tuple[int, dict[str, str], bytes]:
+        """Finds the response for the requested path.
+
+        :param str path: Requested path
+        :return: (HTTP status, headers, body)
+        :rtype: tuple[int, dict[str, str], bytes]
+        """
+        html_headers = {"Content-Type": "text/html; charset=UTF-8"}
+        url = urlsplit(path)
+        if url.path == "/api.php":
+            body = json.dumps(self.query(parse_qs(url.query)), ensure_ascii=False)
+            return 200, {"Content-Type": "application/json; charset=utf-8"}, body.encode("utf-8")
+        if url.path.startswith("/wiki/"):
+            title = unquote(url.path[len("/wiki/"):])
+            if title in self.wiki.redirects:
+                return 301, {"Location": f"/wiki/{quote(self.wiki.redirects[title])}"}, b""
+            page = self.wiki.pages.get(title)
+            if page is not None:
+                return 200, html_headers, page.encode("utf-8")
+        page = self.wiki.wrap("Not_found", "<p>There is currently no text in this page.</p>\n")
+        return 404, html_headers, page.encode("utf-8")
+
+    def query(self, parameters: dict[str, list[str]]) -> dict:
+        """Answers a MediaWiki `action=query&prop=revisions` request, as formatversion 2.
+
+        :param dict[str, list[str]] parameters: Parsed query string
+        :return: API response
+        :rtype: dict
+        """
+        titles = parameters.get("titles", [""])[0].split('|')
+        properties = parameters.get("rvprop", ["ids|timestamp|flags|comment|user"])[0].split('|')
+        response = {"batchcomplete": True, "query": {}}
+        # Pages with content before `first_content` were returned by earlier responses of the same query.
+        first_content = int(parameters.get("rvcontinue", ["0"])[0])
+        contents = 0
+        if len(titles) > 50:
+            response["warnings"] = {"query": {"warnings": 'Too many values supplied for parameter "titles". '
+                                                          "The limit is 50."}}
+            titles = titles[:50]
+
+        normalized, redirects, pages, seen = [], [], [], set()
+        for title in titles:
+            normal = title.replace('_', ' ')
+            normal = normal[:1].upper() + normal[1:]
+            if normal != title:
+                normalized.append({"fromencoded": False, "from": title, "to": normal})
+            redirect_target = self.wiki.redirects.get(normal.replace(' ', '_'))
+            if redirect_target is not None and "redirects" in parameters:
+                redirects.append({"from": normal, "to": redirect_target.replace('_', ' ')})
+                normal = redirect_target.replace('_', ' ')
+            if normal in seen:
+                continue
+            seen.add(normal)
+
+            key = normal.replace(' ', '_')
+            wikitext = self.wiki.wikitext.get(key)
+            if wikitext is None:
+                pages.append({"ns": 0, "title": normal, "missing": True})
+                continue
+            if "content" in properties and self.contents_per_response is not None:
+                contents = contents + 1
+                if not first_content < contents <= first_content + self.contents_per_response:
+                    if contents > first_content + self.contents_per_response and "continue" not in response:
+                        del response["batchcomplete"]
+                        response["continue"] = {"rvcontinue": str(contents - 1), "continue": "||"}
+                    pages.append({"pageid": self.wiki.page_id(key), "ns": 0, "title": normal})
+                    continue
+            revision = {}
+            if "ids" in properties:
+                revision_id = self.wiki.revision_id(key)
+                revision.update({"revid": revision_id, "parentid": revision_id - 1})
+            if "timestamp" in properties:
+                revision["timestamp"] = self.wiki.revision_timestamp(key)
+            if "content" in properties:
+                revision["slots"] = {"main": {"contentmodel": "wikitext", "contentformat": "text/x-wiki",
+                                              "content": wikitext}}
+            pages.append({"pageid": self.wiki.page_id(key), "ns": 0, "title": normal, "revisions": [revision]})
+
+        if normalized:
+            response["query"]["normalized"] = normalized
+        if redirects:
+            response["query"]["redirects"] = redirects
+        response["query"]["pages"] = pages
+        return response
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
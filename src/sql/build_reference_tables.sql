@@ -44,6 +44,23 @@ CREATE TABLE Region (
 	Region TEXT NOT NULL
 );
 
+-- Disks tried in the game's shrine, deduplicated by TitleKey, a 64-bit hash of the normalized title
+CREATE TABLE SaucerStone (
+	Id INTEGER PRIMARY KEY,
+	Title    TEXT    NOT NULL,
+	TitleKey INTEGER NOT NULL
+);
+
+-- How many logged trials of each disk produced each monster
+CREATE TABLE SaucerStoneMonster (
+	SaucerStoneID INTEGER NOT NULL,
+	MonsterID     INTEGER NOT NULL,
+	Trials        INTEGER NOT NULL,
+	PRIMARY KEY (SaucerStoneID, MonsterID),
+	FOREIGN KEY(SaucerStoneID) REFERENCES SaucerStone(Id)
+	FOREIGN KEY(MonsterID)     REFERENCES Monster(Id)
+) WITHOUT ROWID;
+
 -- Populate reference tables with data
 INSERT INTO Attack (DerivationId, Attack, StatUsed, AttackType, ItemRequired, GutsUsed, Damage, GutsDown, Critical, Hit, MaxLevel, AttackRange, Growth, Effect) VALUES
 	(1, 'Ear Slap', 'Power', 'Beat', 'Jade Bit', 10, 10, 6, 1, 50, 10, 'Close', 'Hit +1', 'None'),
@@ -795,4 +812,151 @@ INSERT INTO Region (Region) VALUES
 	('Takrama'),
 	('Kalaragi'),
 	('Morx'),
-	('Special');
\ No newline at end of file
+	('Special');
+
+-- Index reference tables for joins and search filters
+CREATE INDEX IX_Monster_DerivationID_RegionID ON Monster (DerivationID, RegionID);
+CREATE INDEX IX_Monster_Monster ON Monster (Monster);
+-- Covers the per-derivation attack stat counts, and orders a derivation's attacks of one stat by damage
+CREATE INDEX IX_Attack_DerivationID_StatUsed_Damage ON Attack (DerivationId, StatUsed, Damage);
+-- Covers listing the attacks of one type, strongest first
+CREATE INDEX IX_Attack_AttackType_Damage ON Attack (AttackType, Damage, DerivationId, Attack, GutsUsed);
+CREATE INDEX IX_Attack_ItemRequired ON Attack (ItemRequired);
+CREATE INDEX IX_Characteristic_Characteristic ON Characteristic (Characteristic);
+CREATE UNIQUE INDEX IX_SaucerStone_TitleKey ON SaucerStone (TitleKey);
+-- Finds the disks which produce a monster
+CREATE INDEX IX_SaucerStoneMonster_MonsterID ON SaucerStoneMonster (MonsterID);
+
+-- Full-text search over names and descriptions, kept in sync with the reference tables by triggers
+CREATE VIRTUAL TABLE MonsterSearch USING fts5(
+	Monster, Description,
+	content='Monster', content_rowid='Id', prefix='2 3', tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE CharacteristicSearch USING fts5(
+	Characteristic, Description,
+	content='Characteristic', content_rowid='Id', prefix='2 3', tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE AttackSearch USING fts5(
+	Attack, AttackType, ItemRequired, Effect,
+	content='Attack', content_rowid='Id', prefix='2 3', tokenize='porter unicode61 remove_diacritics 2'
+);
+
+INSERT INTO MonsterSearch (rowid, Monster, Description) SELECT Id, Monster, Description FROM Monster;
+INSERT INTO CharacteristicSearch (rowid, Characteristic, Description) SELECT Id, Characteristic, Description FROM Characteristic;
+INSERT INTO AttackSearch (rowid, Attack, AttackType, ItemRequired, Effect) SELECT Id, Attack, AttackType, ItemRequired, Effect FROM Attack;
+
+CREATE TRIGGER MonsterSearchInsert AFTER INSERT ON Monster BEGIN
+	INSERT INTO MonsterSearch (rowid, Monster, Description) VALUES (new.Id, new.Monster, new.Description);
+END;
+CREATE TRIGGER MonsterSearchDelete AFTER DELETE ON Monster BEGIN
+	INSERT INTO MonsterSearch (MonsterSearch, rowid, Monster, Description) VALUES ('delete', old.Id, old.Monster, old.Description);
+END;
+CREATE TRIGGER MonsterSearchUpdate AFTER UPDATE ON Monster BEGIN
+	INSERT INTO MonsterSearch (MonsterSearch, rowid, Monster, Description) VALUES ('delete', old.Id, old.Monster, old.Description);
+	INSERT INTO MonsterSearch (rowid, Monster, Description) VALUES (new.Id, new.Monster, new.Description);
+END;
+
+CREATE TRIGGER CharacteristicSearchInsert AFTER INSERT ON Characteristic BEGIN
+	INSERT INTO CharacteristicSearch (rowid, Characteristic, Description) VALUES (new.Id, new.Characteristic, new.Description);
+END;
+CREATE TRIGGER CharacteristicSearchDelete AFTER DELETE ON Characteristic BEGIN
+	INSERT INTO CharacteristicSearch (CharacteristicSearch, rowid, Characteristic, Description) VALUES ('delete', old.Id, old.Characteristic, old.Description);
+END;
+CREATE TRIGGER CharacteristicSearchUpdate AFTER UPDATE ON Characteristic BEGIN
+	INSERT INTO CharacteristicSearch (CharacteristicSearch, rowid, Characteristic, Description) VALUES ('delete', old.Id, old.Characteristic, old.Description);
+	INSERT INTO CharacteristicSearch (rowid, Characteristic, Description) VALUES (new.Id, new.Characteristic, new.Description);
+END;
+
+CREATE TRIGGER AttackSearchInsert AFTER INSERT ON Attack BEGIN
+	INSERT INTO AttackSearch (rowid, Attack, AttackType, ItemRequired, Effect) VALUES (new.Id, new.Attack, new.AttackType, new.ItemRequired, new.Effect);
+END;
+CREATE TRIGGER AttackSearchDelete AFTER DELETE ON Attack BEGIN
+	INSERT INTO AttackSearch (AttackSearch, rowid, Attack, AttackType, ItemRequired, Effect) VALUES ('delete', old.Id, old.Attack, old.AttackType, old.ItemRequired, old.Effect);
+END;
+CREATE TRIGGER AttackSearchUpdate AFTER UPDATE ON Attack BEGIN
+	INSERT INTO AttackSearch (AttackSearch, rowid, Attack, AttackType, ItemRequired, Effect) VALUES ('delete', old.Id, old.Attack, old.AttackType, old.ItemRequired, old.Effect);
+	INSERT INTO AttackSearch (rowid, Attack, AttackType, ItemRequired, Effect) VALUES (new.Id, new.Attack, new.AttackType, new.ItemRequired, new.Effect);
+END;
+
+-- Summary counts for dashboards, kept up to date by triggers so they are read instead of aggregated
+CREATE TABLE AttackCountByStat (
+	DerivationID INTEGER NOT NULL,
+	StatUsed     TEXT    NOT NULL,
+	Attacks      INTEGER NOT NULL,
+	PRIMARY KEY (DerivationID, StatUsed)
+) WITHOUT ROWID;
+
+CREATE TABLE AttackCountByType (
+	DerivationID INTEGER NOT NULL,
+	AttackType   TEXT    NOT NULL,
+	Attacks      INTEGER NOT NULL,
+	PRIMARY KEY (DerivationID, AttackType)
+) WITHOUT ROWID;
+
+CREATE TABLE AttackCountByRange (
+	DerivationID INTEGER NOT NULL,
+	AttackRange  TEXT    NOT NULL,
+	Attacks      INTEGER NOT NULL,
+	PRIMARY KEY (DerivationID, AttackRange)
+) WITHOUT ROWID;
+
+CREATE TABLE MonsterCountByDerivation (
+	DerivationID INTEGER NOT NULL PRIMARY KEY,
+	Monsters     INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE MonsterCountByRegion (
+	RegionID INTEGER NOT NULL PRIMARY KEY,
+	Monsters INTEGER NOT NULL
+) WITHOUT ROWID;
+
+INSERT INTO AttackCountByStat (DerivationID, StatUsed, Attacks) SELECT DerivationID, StatUsed, COUNT(*) FROM Attack GROUP BY DerivationID, StatUsed;
+INSERT INTO AttackCountByType (DerivationID, AttackType, Attacks) SELECT DerivationID, AttackType, COUNT(*) FROM Attack GROUP BY DerivationID, AttackType;
+INSERT INTO AttackCountByRange (DerivationID, AttackRange, Attacks) SELECT DerivationID, AttackRange, COUNT(*) FROM Attack GROUP BY DerivationID, AttackRange;
+INSERT INTO MonsterCountByDerivation (DerivationID, Monsters) SELECT DerivationID, COUNT(*) FROM Monster GROUP BY DerivationID;
+INSERT INTO MonsterCountByRegion (RegionID, Monsters) SELECT RegionID, COUNT(*) FROM Monster GROUP BY RegionID;
+
+-- A count reaching zero is deleted, so each summary holds exactly the rows its GROUP BY would return.
+CREATE TRIGGER AttackCountsInsert AFTER INSERT ON Attack BEGIN
+	INSERT INTO AttackCountByStat (DerivationID, StatUsed, Attacks) VALUES (new.DerivationID, new.StatUsed, 1) ON CONFLICT DO UPDATE SET Attacks = Attacks + 1;
+	INSERT INTO AttackCountByType (DerivationID, AttackType, Attacks) VALUES (new.DerivationID, new.AttackType, 1) ON CONFLICT DO UPDATE SET Attacks = Attacks + 1;
+	INSERT INTO AttackCountByRange (DerivationID, AttackRange, Attacks) VALUES (new.DerivationID, new.AttackRange, 1) ON CONFLICT DO UPDATE SET Attacks = Attacks + 1;
+END;
+CREATE TRIGGER AttackCountsDelete AFTER DELETE ON Attack BEGIN
+	UPDATE AttackCountByStat SET Attacks = Attacks - 1 WHERE DerivationID = old.DerivationID AND StatUsed = old.StatUsed;
+	DELETE FROM AttackCountByStat WHERE DerivationID = old.DerivationID AND StatUsed = old.StatUsed AND Attacks = 0;
+	UPDATE AttackCountByType SET Attacks = Attacks - 1 WHERE DerivationID = old.DerivationID AND AttackType = old.AttackType;
+	DELETE FROM AttackCountByType WHERE DerivationID = old.DerivationID AND AttackType = old.AttackType AND Attacks = 0;
+	UPDATE AttackCountByRange SET Attacks = Attacks - 1 WHERE DerivationID = old.DerivationID AND AttackRange = old.AttackRange;
+	DELETE FROM AttackCountByRange WHERE DerivationID = old.DerivationID AND AttackRange = old.AttackRange AND Attacks = 0;
+END;
+CREATE TRIGGER AttackCountsUpdate AFTER UPDATE OF DerivationID, StatUsed, AttackType, AttackRange ON Attack BEGIN
+	UPDATE AttackCountByStat SET Attacks = Attacks - 1 WHERE DerivationID = old.DerivationID AND StatUsed = old.StatUsed;
+	DELETE FROM AttackCountByStat WHERE DerivationID = old.DerivationID AND StatUsed = old.StatUsed AND Attacks = 0;
+	INSERT INTO AttackCountByStat (DerivationID, StatUsed, Attacks) VALUES (new.DerivationID, new.StatUsed, 1) ON CONFLICT DO UPDATE SET Attacks = Attacks + 1;
+	UPDATE AttackCountByType SET Attacks = Attacks - 1 WHERE DerivationID = old.DerivationID AND AttackType = old.AttackType;
+	DELETE FROM AttackCountByType WHERE DerivationID = old.DerivationID AND AttackType = old.AttackType AND Attacks = 0;
+	INSERT INTO AttackCountByType (DerivationID, AttackType, Attacks) VALUES (new.DerivationID, new.AttackType, 1) ON CONFLICT DO UPDATE SET Attacks = Attacks + 1;
+	UPDATE AttackCountByRange SET Attacks = Attacks - 1 WHERE DerivationID = old.DerivationID AND AttackRange = old.AttackRange;
+	DELETE FROM AttackCountByRange WHERE DerivationID = old.DerivationID AND AttackRange = old.AttackRange AND Attacks = 0;
+	INSERT INTO AttackCountByRange (DerivationID, AttackRange, Attacks) VALUES (new.DerivationID, new.AttackRange, 1) ON CONFLICT DO UPDATE SET Attacks = Attacks + 1;
+END;
+
+CREATE TRIGGER MonsterCountsInsert AFTER INSERT ON Monster BEGIN
+	INSERT INTO MonsterCountByDerivation (DerivationID, Monsters) VALUES (new.DerivationID, 1) ON CONFLICT DO UPDATE SET Monsters = Monsters + 1;
+	INSERT INTO MonsterCountByRegion (RegionID, Monsters) VALUES (new.RegionID, 1) ON CONFLICT DO UPDATE SET Monsters = Monsters + 1;
+END;
+CREATE TRIGGER MonsterCountsDelete AFTER DELETE ON Monster BEGIN
+	UPDATE MonsterCountByDerivation SET Monsters = Monsters - 1 WHERE DerivationID = old.DerivationID;
+	DELETE FROM MonsterCountByDerivation WHERE DerivationID = old.DerivationID AND Monsters = 0;
+	UPDATE MonsterCountByRegion SET Monsters = Monsters - 1 WHERE RegionID = old.RegionID;
+	DELETE FROM MonsterCountByRegion WHERE RegionID = old.RegionID AND Monsters = 0;
+END;
+CREATE TRIGGER MonsterCountsUpdate AFTER UPDATE OF DerivationID, RegionID ON Monster BEGIN
+	UPDATE MonsterCountByDerivation SET Monsters = Monsters - 1 WHERE DerivationID = old.DerivationID;
+	DELETE FROM MonsterCountByDerivation WHERE DerivationID = old.DerivationID AND Monsters = 0;
+	INSERT INTO MonsterCountByDerivation (DerivationID, Monsters) VALUES (new.DerivationID, 1) ON CONFLICT DO UPDATE SET Monsters = Monsters + 1;
+	UPDATE MonsterCountByRegion SET Monsters = Monsters - 1 WHERE RegionID = old.RegionID;
+	DELETE FROM MonsterCountByRegion WHERE RegionID = old.RegionID AND Monsters = 0;
+	INSERT INTO MonsterCountByRegion (RegionID, Monsters) VALUES (new.RegionID, 1) ON CONFLICT DO UPDATE SET Monsters = Monsters + 1;
+END;
@@ -1,3 +1,13 @@
+DROP TABLE AttackCountByStat;
+DROP TABLE AttackCountByType;
+DROP TABLE AttackCountByRange;
+DROP TABLE MonsterCountByDerivation;
+DROP TABLE MonsterCountByRegion;
+DROP TABLE AttackSearch;
+DROP TABLE CharacteristicSearch;
+DROP TABLE MonsterSearch;
+DROP TABLE SaucerStoneMonster;
+DROP TABLE SaucerStone;
 DROP TABLE Attack;
 DROP TABLE Characteristic;
 DROP TABLE Derivation;
@@ -0,0 +1,49 @@
+-- Monsters of one derivation, in region order.
+SELECT m.Monster, r.Region, m.Description
+  FROM Monster m
+  JOIN Region r ON m.RegionID = r.Id
+  WHERE m.DerivationID = :derivation_id
+  ORDER BY m.RegionID;
+
+-- Monsters of one region, across all derivations.
+SELECT m.Monster, d.Derivation, m.Description
+  FROM Monster m
+  JOIN Derivation d ON m.DerivationID = d.Id
+  WHERE m.RegionID = :region_id;
+
+-- A monster by name.
+SELECT m.Monster, d.Derivation, r.Region, m.Description
+  FROM Monster m
+  JOIN Derivation d ON m.DerivationID = d.Id
+  JOIN Region r     ON m.RegionID = r.Id
+  WHERE m.Monster = :monster;
+
+-- Monsters of a derivation, by the derivation's name.
+SELECT m.Monster, m.RegionID, m.Description
+  FROM Derivation d
+  JOIN Monster m ON m.DerivationID = d.Id
+  WHERE d.Derivation = :derivation;
+
+-- A derivation's attacks using one stat, strongest first.
+SELECT a.Attack, a.AttackType, a.GutsUsed, a.Damage, a.Hit
+  FROM Attack a
+  WHERE a.DerivationId = :derivation_id AND a.StatUsed = :stat_used
+  ORDER BY a.Damage DESC;
+
+-- Attacks of one type across all derivations, strongest first.
+SELECT d.Derivation, a.Attack, a.Damage, a.GutsUsed
+  FROM Attack a
+  JOIN Derivation d ON a.DerivationId = d.Id
+  WHERE a.AttackType = :attack_type
+  ORDER BY a.Damage DESC;
+
+-- Attacks learned from an item.
+SELECT d.Derivation, a.Attack
+  FROM Attack a
+  JOIN Derivation d ON a.DerivationId = d.Id
+  WHERE a.ItemRequired = :item_required;
+
+-- A characteristic by name.
+SELECT c.Characteristic, c.Description
+  FROM Characteristic c
+  WHERE c.Characteristic = :characteristic;
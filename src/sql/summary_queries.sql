@@ -0,0 +1,30 @@
+-- Power and intelligence attacks per derivation, from the summary counts.
+SELECT d.Derivation, SUM(CASE WHEN s.StatUsed = 'Power' THEN s.Attacks ELSE 0 END) 'Power Attacks', SUM(CASE WHEN s.StatUsed = 'Intelligence' THEN s.Attacks ELSE 0 END) 'Int Attacks'
+  FROM AttackCountByStat s
+  JOIN Derivation d ON s.DerivationID = d.Id
+  GROUP BY s.DerivationID;
+
+-- A derivation's attacks per stat.
+SELECT s.StatUsed, s.Attacks
+  FROM AttackCountByStat s
+  WHERE s.DerivationID = :derivation_id;
+
+-- A derivation's attacks per type.
+SELECT t.AttackType, t.Attacks
+  FROM AttackCountByType t
+  WHERE t.DerivationID = :derivation_id;
+
+-- A derivation's attacks per range.
+SELECT r.AttackRange, r.Attacks
+  FROM AttackCountByRange r
+  WHERE r.DerivationID = :derivation_id;
+
+-- Monsters per derivation.
+SELECT d.Derivation, c.Monsters
+  FROM MonsterCountByDerivation c
+  JOIN Derivation d ON c.DerivationID = d.Id;
+
+-- Monsters per region.
+SELECT r.Region, c.Monsters
+  FROM MonsterCountByRegion c
+  JOIN Region r ON c.RegionID = r.Id;
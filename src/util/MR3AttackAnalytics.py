@@ -0,0 +1,230 @@
+import re
+import sqlite3
+from collections.abc import Iterable
+
+import numpy as np
+
+from MR3AttackBuilder import Attack
+
+
+class MR3AttackAnalytics:
+    """Attack metrics computed over whole columns at once with NumPy.
+
+    Attacks are loaded once into a structured array, with each `Growth` string parsed into per-level
+    increments of the stats it names. Metrics are then array expressions over every attack, and group-bys
+    run over attacks kept sorted by derivation, so every derivation's figures come from one pass.
+
+    Usage:
+
+    >>> analytics = MR3AttackAnalytics.from_attacks([
+    ...     Attack(1, "Tackle", "Power", "Beat", "-", 10, 12, 2, 0, 40, 5, "Close", "Damage +1, Guts Down +1", "-"),
+    ...     Attack(1, "Fireball", "Intelligence", "Fire", "-", 30, 24, 0, 10, 20, 3, "Far", "Hit +1", "-"),
+    ...     Attack(2, "Fire Kick", "Power", "Fire", "-", 25, 30, 5, 0, 50, 1, "Mid", "None", "-")
+    ... ])
+    >>> analytics.metric("damage_per_guts").tolist()
+    [1.2, 0.8, 1.2]
+    >>> analytics.metric("damage_at_max_level").tolist()
+    [16, 24, 30]
+    >>> [round(mean, 2) for mean in analytics.by_derivation("expected_damage")["mean"].tolist()]
+    [4.92, 15.0]
+    >>> analytics.top_by_derivation("damage_per_guts", 1)
+    {1: [('Tackle', 1.2)], 2: [('Fire Kick', 1.2)]}
+    """
+    GrowthStats = {"damage": "damage", "guts down": "guts_down", "critical": "critical", "hit": "hit",
+                   "guts used": "guts_used", "guts": "guts_used", "effect": "effect"}
+    GrowthClause = re.compile(r"^(?:(?P<stat>[a-z ]+?) (?P<amount>[+-]\d+)"
+                              r"|(?P<amount_first>[+-]\d+) (?P<stat_last>[a-z ]+))$")
+    Dtype = np.dtype([
+        ("derivation_id", np.int32), ("guts_used", np.int32), ("damage", np.int32), ("guts_down", np.int32),
+        ("critical", np.int32), ("hit", np.int32), ("max_level", np.int32),
+        ("growth_damage", np.int32), ("growth_guts_down", np.int32), ("growth_critical", np.int32),
+        ("growth_hit", np.int32), ("growth_guts_used", np.int32), ("growth_effect", np.int32)
+    ])
+    # Hit is the percent chance an attack lands, and Critical the percent chance a landed attack is a critical
+    # hit, which deals CriticalMultiplier times its damage. Expected damage is Damage weighted by both chances.
+    CriticalMultiplier = 1.5
+    Metrics = ["damage_per_guts", "guts_down_per_guts", "expected_damage", "expected_damage_per_guts",
+               "damage_at_max_level"]
+
+    def __init__(self, columns: np.ndarray, names: list[str]):
+        order = np.argsort(columns["derivation_id"], kind="stable")
+        self.columns = columns[order]
+        self.names = [names[i] for i in order]
+        self.derivation_ids, self.group_starts = np.unique(self.columns["derivation_id"], return_index=True)
+        self.group_sizes = np.diff(np.append(self.group_starts, len(self.columns)))
+        self.groups = np.repeat(np.arange(len(self.group_starts)), self.group_sizes)  # Each attack's group
+        self._metrics = {}
+
+    @staticmethod
+    def parse_growth(growth: str) -> dict[str, int]:
+        """Reads a Growth string into how much each stat changes per level.
+
+        Clauses which aren't a plain "<stat> <+/-amount>" (or "<+/-amount> <stat>"), such as
+        "Damage +1 at Level 5", describe irregular growth and are left out.
+
+        :param str growth: Growth, as written in the Attack table
+        :return: Per-level change, by Dtype growth column without the "growth_" prefix
+        :rtype: dict[str, int]
+
+        Usage:
+
+        >>> MR3AttackAnalytics.parse_growth("Damage +1, Guts Down +2")
+        {'damage': 1, 'guts_down': 2}
+        >>> MR3AttackAnalytics.parse_growth("-1 Guts")
+        {'guts_used': -1}
+        >>> MR3AttackAnalytics.parse_growth("Hit +1, Damage +1 at Level 5")
+        {'hit': 1}
+        """
+        growths = {}
+        for clause in growth.lower().split(","):
+            match = MR3AttackAnalytics.GrowthClause.match(clause.strip())
+            if match is None:
+                continue
+            stat = MR3AttackAnalytics.GrowthStats.get(match["stat"] or match["stat_last"])
+            if stat is not None:
+                growths[stat] = growths.get(stat, 0) + int(match["amount"] or match["amount_first"])
+        return growths
+
+    @staticmethod
+    def from_attacks(attacks: Iterable[Attack]) -> "MR3AttackAnalytics":
+        """Loads attacks, as produced by MR3AttackParser, into columns.
+
+        :param Iterable[Attack] attacks: Attacks to analyze
+        :return: Analytics over the attacks
+        :rtype: MR3AttackAnalytics
+        """
+        return MR3AttackAnalytics.from_rows(
+            (a.monster_derivation_id, a.attack_name, a.guts_used, a.damage, a.guts_down, a.critical_chance,
+             a.hit_chance, a.max_level, a.growth) for a in attacks
+        )
+
+    @staticmethod
+    def from_database(connection: sqlite3.Connection) -> "MR3AttackAnalytics":
+        """Loads a lexicon database's Attack table into columns.
+
+        :param sqlite3.Connection connection: Connection to a lexicon database
+        :return: Analytics over every attack
+        :rtype: MR3AttackAnalytics
+        """
+        return MR3AttackAnalytics.from_rows(connection.execute(
+            "SELECT DerivationId, Attack, GutsUsed, Damage, GutsDown, Critical, Hit, MaxLevel, Growth "
+            "FROM Attack ORDER BY Id"
+        ))
+
+    @staticmethod
+    def from_rows(rows: Iterable[tuple]) -> "MR3AttackAnalytics":
+        """Loads (DerivationId, Attack, GutsUsed, Damage, GutsDown, Critical, Hit, MaxLevel, Growth) rows.
+
+        Each distinct Growth string is only parsed once.
+        """
+        growths = {}
+        names = []
+        records = []
+        for derivation_id, name, guts_used, damage, guts_down, critical, hit, max_level, growth in rows:
+            if growth not in growths:
+                parsed = MR3AttackAnalytics.parse_growth(growth)
+                growths[growth] = (parsed.get("damage", 0), parsed.get("guts_down", 0), parsed.get("critical", 0),
+                                   parsed.get("hit", 0), parsed.get("guts_used", 0), parsed.get("effect", 0))
+            names.append(name)
+            records.append((derivation_id, guts_used, damage, guts_down, critical, hit, max_level) + growths[growth])
+        return MR3AttackAnalytics(np.array(records, dtype=MR3AttackAnalytics.Dtype), names)
+
+    def metric(self, name: str) -> np.ndarray:
+        """Computes one of `Metrics` for every attack, in derivation order.
+
+        Ratios to Guts Used are NaN for attacks costing no guts.
+
+        :param str name: Metric to compute
+        :return: The metric, one value per attack
+        :rtype: np.ndarray
+        :raises KeyError: If the metric is unknown
+        """
+        if name not in self._metrics:
+            c = self.columns
+            guts_used = c["guts_used"].astype(np.float64)
+            costs_guts = guts_used > 0
+            if name == "damage_per_guts":
+                value = np.divide(c["damage"], guts_used, out=np.full(len(c), np.nan), where=costs_guts)
+            elif name == "guts_down_per_guts":
+                value = np.divide(c["guts_down"], guts_used, out=np.full(len(c), np.nan), where=costs_guts)
+            elif name == "expected_damage":
+                value = (c["damage"] * c["hit"] / 100 *
+                         (1 + c["critical"] / 100 * (MR3AttackAnalytics.CriticalMultiplier - 1)))
+            elif name == "expected_damage_per_guts":
+                value = np.divide(self.metric("expected_damage"), guts_used, out=np.full(len(c), np.nan),
+                                  where=costs_guts)
+            elif name == "damage_at_max_level":
+                value = c["damage"] + c["growth_damage"] * np.maximum(c["max_level"] - 1, 0)
+            else:
+                raise KeyError(name)
+            self._metrics[name] = value
+        return self._metrics[name]
+
+    def percentiles(self, name: str, q: Iterable[float] = (10, 25, 50, 75, 90),
+                    method: str = "linear") -> dict[float, float]:
+        """Summarizes a metric over every attack.
+
+        :param str name: Metric to summarize
+        :param Iterable[float] q: Percentiles to compute
+        :param str method: How to pick between two attacks' values, as taken by np.nanpercentile
+        :return: Metric's value, by percentile
+        :rtype: dict[float, float]
+        """
+        q = list(q)
+        return dict(zip(q, np.nanpercentile(self.metric(name), q, method=method).tolist()))
+
+    def by_derivation(self, name: str) -> dict[str, np.ndarray]:
+        """Aggregates a metric per derivation.
+
+        :param str name: Metric to aggregate
+        :return: "derivation_id", "count", "mean", "min", "max" and "median" arrays, one value per derivation;
+            NaN values are left out
+        :rtype: dict[str, np.ndarray]
+        """
+        value = self.metric(name)
+        present = ~np.isnan(value)
+        counts = np.add.reduceat(present, self.group_starts)
+        sums = np.add.reduceat(np.where(present, value, 0), self.group_starts)
+        # Sorting values within their derivation puts each derivation's median in the middle of its run.
+        ordered = value[np.lexsort((value, self.groups))]
+        low = self.group_starts + np.maximum(counts - 1, 0) // 2
+        high = self.group_starts + counts // 2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return {
+                "derivation_id": self.derivation_ids,
+                "count": counts,
+                "mean": sums / counts,
+                "min": np.fmin.reduceat(value, self.group_starts),
+                "max": np.fmax.reduceat(value, self.group_starts),
+                "median": np.where(counts > 0, (ordered[low] + ordered[high]) / 2, np.nan)
+            }
+
+    def top_by_derivation(self, name: str, count: int = 3) -> dict[int, list[tuple[str, float]]]:
+        """Ranks each derivation's attacks by a metric.
+
+        :param str name: Metric to rank by, highest first
+        :param int count: Attacks to keep per derivation
+        :return: (Attack, value) of each derivation's best attacks, by derivation ID
+        :rtype: dict[int, list[tuple[str, float]]]
+        """
+        value = self.metric(name)
+        # Best first within each derivation; NaN sorts last, and lexsort being stable, ties keep attack order.
+        order = np.lexsort((np.nan_to_num(-value, nan=np.inf), self.groups))
+        kept = order[np.arange(len(value)) - self.group_starts[self.groups] < count]
+        top = {derivation_id: [] for derivation_id in self.derivation_ids.tolist()}
+        derivation_ids = self.columns["derivation_id"][kept].tolist()
+        for i, derivation_id, v in zip(kept.tolist(), derivation_ids, value[kept].tolist()):
+            top[derivation_id].append((self.names[i], v))
+        return top
+
+    def growth(self, stat: str) -> np.ndarray:
+        """Per-level change of a stat, for every attack, as parsed from Growth.
+
+        :param str stat: "damage", "guts_down", "critical", "hit", "guts_used" or "effect"
+        :return: Change per level
+        :rtype: np.ndarray
+        """
+        return self.columns[f"growth_{stat}"]
+
+    def __len__(self) -> int:
+        return len(self.columns)
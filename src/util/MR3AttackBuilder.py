@@ -1,8 +1,17 @@
-from collections import Iterator
+import io
 import sys
+from collections.abc import Iterable, Iterator
+from typing import TextIO, Union
+
+from MR3Instrumentation import MR3Instrumentation
+from MR3SqlEmitter import MR3SqlEmitter
 
 
 class Attack:
+    __slots__ = ("monster_derivation_id", "attack_name", "stat_used", "attack_type", "item_required",
+                 "guts_used", "damage", "guts_down", "critical_chance", "hit_chance",
+                 "max_level", "attack_range", "growth", "effect")
+
     def __init__(self, monster_derivation_id, attack_name, stat_used, attack_type, item_required,
                  guts_used, damage, guts_down, critical_chance, hit_chance,
                  max_level, attack_range, growth, effect=""):
@@ -21,122 +30,133 @@ class Attack:
         self.growth = growth if growth != "" else "Unknown"
         self.effect = effect if effect != "" else "None"
 
+    Columns = ["DerivationId", "Attack", "StatUsed", "AttackType", "ItemRequired", "GutsUsed", "Damage",
+               "GutsDown", "Critical", "Hit", "MaxLevel", "AttackRange", "Growth", "Effect"]
+
+    def values(self) -> tuple:
+        """The attack's values, in the order of the Attack table's columns."""
+        return (self.monster_derivation_id, self.attack_name, self.stat_used, self.attack_type, self.item_required,
+                self.guts_used, self.damage, self.guts_down, self.critical_chance, self.hit_chance,
+                self.max_level, self.attack_range, self.growth, self.effect)
+
     def __str__(self):
-        return (", ".join([
-            str(self.monster_derivation_id), f"'{self.attack_name}'", f"'{self.stat_used}'",
-            f"'{self.attack_type}'", f"'{self.item_required}'",
-            str(self.guts_used), str(self.damage), str(self.guts_down), str(self.critical_chance), str(self.hit_chance),
-            str(self.max_level), f"'{self.attack_range}'", f"'{self.growth}'", f"'{self.effect}'"
-        ]))
+        return ", ".join([MR3SqlEmitter.format_value(value) for value in self.values()])
 
 
 class MR3AttackParser:
+    FieldsByKey = {
+        "Attack": "attack_name",
+        "Stat Used": "stat_used",
+        "Type": "attack_type",
+        "Item": "item_required",
+        "Guts Used": "guts_used",
+        "Damage": "damage",
+        "Guts Down": "guts_down",
+        "Critical": "critical_chance",
+        "Hit": "hit_chance",
+        "Max Level": "max_level",
+        "Range": "attack_range",
+        "Growth": "growth",
+        "Effect": "effect"
+    }
+    EmptyFields = dict.fromkeys(FieldsByKey.values(), "")
+
     @staticmethod
-    def parse_text(file: str) -> list[Attack]:
-        """Parse file's text into a list of Attacks.
+    def parse_lines(lines: Iterable[str], derivation_ids: Union[dict[str, int], None] = None) -> Iterator[Attack]:
+        """Parses lines of text into Attacks, yielding each as soon as its last line is read.
+
+        :param Iterable[str] lines: Lines of text to parse
+        :param Union[dict[str, int], None] derivation_ids: ID of each derivation, by the name in its
+            "Derivation:" header; by default, headers are numbered in the order they appear, which only
+            holds for a file listing every derivation
+        :return: Attacks, in order
+        :rtype: Iterator[Attack]
+        :raises ValueError: If a header names a derivation missing from derivation_ids
+
+        Usage:
+
+        >>> [str(a) for a in MR3AttackParser.parse_lines(["Derivation: Baku", "", "Attack: Tackle", "Damage: 9"])]
+        ["1, 'Tackle', 'Unknown', 'Unknown', 'Unknown', 0, 9, 0, 0, 0, 0, 'Unknown', 'Unknown', 'None'"]
+        >>> [a.monster_derivation_id for a in MR3AttackParser.parse_lines(
+        ...     ["Derivation: Zoom", "", "Attack: Tackle"], derivation_ids={"Zoom": 30})]
+        [30]
+        """
+        derivation_id = 0
+        parsed = 0
+        fields = None  # Fields of the attack being read, if any
+        for line in lines:
+            line = line.strip()
+            if fields is None:
+                if "Derivation:" in line:  # Sections are grouped by monster type.
+                    if derivation_ids is None:
+                        derivation_id = derivation_id + 1
+                    else:
+                        name = line.split(":", 1)[1].strip()
+                        if name not in derivation_ids:
+                            raise ValueError(f"Unknown derivation {name!r}")
+                        derivation_id = derivation_ids[name]
+                    continue
+                if "Attack:" not in line:  # Ignore empty lines.
+                    continue
+                fields = dict(MR3AttackParser.EmptyFields)
+            elif not line:  # The next blank line separates this attack from the next.
+                yield Attack(derivation_id, **fields)
+                parsed = parsed + 1
+                fields = None
+                continue
+            key, value = line.split(": ")
+            field = MR3AttackParser.FieldsByKey.get(key)
+            if field is not None:
+                fields[field] = value if value != "-" else ""
+        if fields is not None:  # The file ended without a blank line after the last attack.
+            yield Attack(derivation_id, **fields)
+            parsed = parsed + 1
+        MR3Instrumentation.count("attacks_parsed", parsed)
+
+    @staticmethod
+    def parse_text(file: str, derivation_ids: Union[dict[str, int], None] = None) -> Iterator[Attack]:
+        """Parse file's text into Attacks, reading it line by line.
 
         :param str file: File with text to parse
-        :return: List of Attacks
-        :rtype: list[Attack]
+        :param Union[dict[str, int], None] derivation_ids: As taken by `parse_lines`
+        :return: Attacks, in order
+        :rtype: Iterator[Attack]
         """
-        def create_attack(line_iterator: Iterator[str], line: str, monster_derivation: int):
-            """Parses through provided text to create an Attack object.
-
-            :param Iterator[str] line_iterator: Iterator currently set at line
-            :param str line: Current value of line_iterator
-            :param int monster_derivation: Monster's derivation ID
-            :return: An Attack parsed from the lines of text
-            :rtype: Attack
-            """
-            # Set all fields to defaults.
-            attack_name = stat_used = attack_type = item_required = ""
-            guts_used = damage = guts_down = critical_chance = hit_chance = max_level = ""
-            attack_range = growth = effect = ""
-
-            # Populate all of the present fields with their values.
-            while not is_empty(line):  # The next blank line separates this attack from the next.
-                key, value = line.split(": ")
-                if value == "-":
-                    value = ""
-                if key == "Attack":
-                    attack_name = value
-                elif key == "Stat Used":
-                    stat_used = value
-                elif key == "Type":
-                    attack_type = value
-                elif key == "Item":
-                    item_required = value
-                elif key == "Guts Used":
-                    guts_used = value
-                elif key == "Damage":
-                    damage = value
-                elif key == "Guts Down":
-                    guts_down = value
-                elif key == "Critical":
-                    critical_chance = value
-                elif key == "Hit":
-                    hit_chance = value
-                elif key == "Max Level":
-                    max_level = value
-                elif key == "Range":
-                    attack_range = value
-                elif key == "Growth":
-                    growth = value
-                elif key == "Effect":
-                    effect = value
-
-                try:
-                    line = next(line_iterator)
-                except StopIteration:  # Gracefully stop if at the end of the file.
-                    break
-
-            # Create and return an Attack.
-            return Attack(monster_derivation, attack_name, stat_used, attack_type, item_required,
-                          guts_used, damage, guts_down, critical_chance, hit_chance, max_level,
-                          attack_range, growth, effect)
-
-        def is_empty(line: str) -> bool:
-            """Returns if the given text is empty.
-
-            :param str line: Text to analyze
-            :return: True if the line is empty
-            :rtype: bool
-            """
-            return not line.strip()
-
         with open(file) as f:
-            attack_document = '\n'.join([line.strip() for line in f.readlines()])
+            yield from MR3AttackParser.parse_lines(f, derivation_ids)
 
-        attacks = []
-        derivation_id = 0
-        iterator = iter(attack_document.splitlines())
-        for line in iterator:
-            if is_empty(line):
-                continue  # Ignore empty lines.
-            if "Derivation:" in line:   # Sections are grouped by monster type.
-                derivation_id = derivation_id + 1
-            elif 'Attack:' in line:
-                attacks.append(create_attack(iterator, line, derivation_id))
-        return attacks
+
+def write_query(file: str, out: TextIO) -> int:
+    """Writes SQL INSERT queries from the data in file to out, one attack at a time.
+
+    :param str file:
+    :param TextIO out: Where to write the queries
+    :return: How many Attacks were written
+    :rtype: int
+    """
+    with MR3Instrumentation.phase("build_attacks"):
+        attacks = (attack.values() for attack in MR3AttackParser.parse_text(file))
+        return MR3SqlEmitter(out).write_inserts("Attack", Attack.Columns, attacks)
 
 
 def main(file: str) -> str:
-    """Creates an SQL INSERT query from the data in file.
+    """Creates SQL INSERT queries from the data in file.
 
     :param str file:
-    :return: An SQL INSERT query featuring all MR3 Attacks
+    :return: SQL INSERT queries featuring all MR3 Attacks
     :rtype: str
     """
-    attacks = []
-    for attack in MR3AttackParser.parse_text(file):
-        attacks.append(f"({str(attack)})")
-    first_line = "INSERT INTO Attack (DerivationId, Attack, StatUsed, AttackType, ItemRequired, GutsUsed, Damage, " \
-                 "GutsDown, Critical, Hit, MaxLevel, AttackRange, Growth, Effect) VALUES"
-    return first_line + "\n\t" + ",\n\t".join(attacks) + ";"
+    out = io.StringIO()
+    write_query(file, out)
+    return out.getvalue()
 
 
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print("Usage: MR3AttackBuilder.py <input-file>")
+    if len(sys.argv) not in (2, 3):
+        print("Usage: MR3AttackBuilder.py <input-file> [output-file]")
         exit(1)
-    print(main(sys.argv[1]))
+    if len(sys.argv) == 3:
+        with open(sys.argv[2], "w") as output:
+            write_query(sys.argv[1], output)
+    else:
+        write_query(sys.argv[1], sys.stdout)
@@ -0,0 +1,158 @@
+import bisect
+import sqlite3
+from collections.abc import Iterable, Iterator
+from typing import Union
+
+from MR3AttackBuilder import Attack
+
+
+class MR3AttackIndex:
+    """An in-memory index answering combined attack filters without SQLite.
+
+    Each attack is a bit position. Categorical columns keep a bitmap (a Python int) per value; numeric
+    columns keep their distinct values sorted, with a cumulative bitmap per value, so any range is the
+    difference of two bitmaps. A combined filter is then a handful of integer ANDs and ORs.
+
+    Usage:
+
+    >>> index = MR3AttackIndex([
+    ...     Attack(1, "Tackle", "Power", "Beat", "Aqua Bit", 10, 12, 2, 1, 40, 5, "Close", "None", "-"),
+    ...     Attack(1, "Fireball", "Intelligence", "Flame", "Ruby Stone", 30, 25, 0, 5, 50, 8, "Long", "None", "-"),
+    ...     Attack(2, "Fire Kick", "Power", "Flame", "Ruby Stone", 25, 30, 5, 10, 45, 9, "Mid", "None", "-")
+    ... ])
+    >>> [a.attack_name for a in index.attacks(index.filter(attack_type="Flame", damage=(26, None)))]
+    ['Fire Kick']
+    >>> [(a.monster_derivation_id, a.attack_name) for a in index.attacks_by_item()["Ruby Stone"]]
+    [(1, 'Fireball'), (2, 'Fire Kick')]
+    """
+    CategoricalColumns = ["monster_derivation_id", "stat_used", "attack_type", "item_required", "attack_range",
+                          "effect"]
+    NumericColumns = ["guts_used", "damage", "hit_chance", "critical_chance"]
+
+    def __init__(self, attacks: Iterable[Attack]):
+        self.attacks_list = list(attacks)
+        self.all = (1 << len(self.attacks_list)) - 1
+        self.bitmaps = {}
+        value_bitmaps = {}
+        for column in MR3AttackIndex.CategoricalColumns + MR3AttackIndex.NumericColumns:
+            positions = {}
+            for position, attack in enumerate(self.attacks_list):
+                positions.setdefault(getattr(attack, column), []).append(position)
+            bitmaps = {value: MR3AttackIndex.to_bitmap(p) for value, p in positions.items()}
+            if column in MR3AttackIndex.CategoricalColumns:
+                self.bitmaps[column] = bitmaps
+            else:
+                value_bitmaps[column] = bitmaps
+
+        # Per numeric column: sorted distinct values, and for each, the bitmap of attacks with a smaller value.
+        self.sorted_values = {}
+        self.below = {}
+        for column, bitmaps in value_bitmaps.items():
+            values = sorted(bitmaps)
+            below = [0]
+            for value in values:
+                below.append(below[-1] | bitmaps[value])
+            self.sorted_values[column] = values
+            self.below[column] = below
+        self._attacks_by_item = None
+
+    @staticmethod
+    def to_bitmap(positions: list[int]) -> int:
+        """Sets the bits at positions, building the integer once rather than ORing in one bit at a time.
+
+        :param list[int] positions: Bit positions to set
+        :return: Bitmap
+        :rtype: int
+
+        Usage:
+
+        >>> bin(MR3AttackIndex.to_bitmap([0, 3, 9]))
+        '0b1000001001'
+        """
+        if not positions:
+            return 0
+        bits = bytearray(max(positions) // 8 + 1)
+        for position in positions:
+            bits[position >> 3] = bits[position >> 3] | 1 << (position & 7)
+        return int.from_bytes(bits, "little")
+
+    @staticmethod
+    def from_database(connection: sqlite3.Connection) -> "MR3AttackIndex":
+        """Builds the index from a lexicon database's Attack table.
+
+        :param sqlite3.Connection connection: Connection to a lexicon database
+        :return: Index of every attack, in Id order
+        :rtype: MR3AttackIndex
+        """
+        rows = connection.execute(f"SELECT {', '.join(Attack.Columns)} FROM Attack ORDER BY Id")
+        return MR3AttackIndex(Attack(*row) for row in rows)
+
+    def match(self, column: str, value: Union[str, int, list, tuple]) -> int:
+        """Finds the attacks matching one column's criterion.
+
+        :param str column: Attack attribute to filter on
+        :param Union[str, int, list, tuple] value: For a categorical column, a value or a list of accepted values;
+            for a numeric column, a value or an inclusive (low, high) range, either end of which may be None
+        :return: Bitmap of matching attacks
+        :rtype: int
+        :raises KeyError: If the column is not indexed
+        """
+        if column in self.bitmaps:
+            bitmaps = self.bitmaps[column]
+            if isinstance(value, list):
+                matched = 0
+                for v in value:
+                    matched = matched | bitmaps.get(v, 0)
+                return matched
+            return bitmaps.get(value, 0)
+
+        values = self.sorted_values[column]
+        below = self.below[column]
+        low, high = value if isinstance(value, tuple) else (value, value)
+        start = 0 if low is None else bisect.bisect_left(values, low)
+        end = len(values) if high is None else bisect.bisect_right(values, high)
+        return below[end] & ~below[start] if end > start else 0
+
+    def filter(self, **criteria) -> int:
+        """Finds the attacks matching every criterion.
+
+        :param criteria: Criteria by Attack attribute, as taken by `match`, e.g. attack_type="Beat", damage=(20, None)
+        :return: Bitmap of matching attacks
+        :rtype: int
+        """
+        matched = self.all
+        for column, value in criteria.items():
+            matched = matched & self.match(column, value)
+            if not matched:
+                break
+        return matched
+
+    def attacks(self, bitmap: int, limit: Union[int, None] = None) -> Iterator[Attack]:
+        """Lists the attacks in a bitmap, in their original order.
+
+        :param int bitmap: Bitmap, as returned by `filter`
+        :param Union[int, None] limit: Most attacks to list
+        :return: The attacks
+        :rtype: Iterator[Attack]
+        """
+        listed = 0
+        while bitmap and (limit is None or listed < limit):
+            lowest = bitmap & -bitmap
+            yield self.attacks_list[lowest.bit_length() - 1]
+            bitmap = bitmap ^ lowest
+            listed = listed + 1
+
+    @staticmethod
+    def count(bitmap: int) -> int:
+        return bitmap.bit_count()
+
+    def attacks_by_item(self) -> dict[str, list[Attack]]:
+        """Reverse index from each required item to the attacks it teaches, across all derivations.
+
+        :return: Attacks, by item
+        :rtype: dict[str, list[Attack]]
+        """
+        if self._attacks_by_item is None:
+            self._attacks_by_item = {item: list(self.attacks(bitmap))
+                                     for item, bitmap in sorted(self.bitmaps["item_required"].items())}
+        return self._attacks_by_item
@@ -1,49 +1,75 @@
+import io
 import sys
+from typing import TextIO
+
+from MR3Instrumentation import MR3Instrumentation
+from MR3SqlEmitter import MR3SqlEmitter
 
 
 class Characteristic:
+    Columns = ["Characteristic", "Description"]
+
     def __init__(self, name, description):
         self.name = name
         self.description = description
 
+    def values(self) -> tuple:
+        """The characteristic's values, in the order of the Characteristic table's columns."""
+        return self.name, self.description
+
     def __str__(self):
-        return f"'{self.name}', '{self.description}'"
+        return ", ".join([MR3SqlEmitter.format_value(value) for value in self.values()])
 
 
 class MR3CharacteristicBuilder:
     @staticmethod
     def parse_text(file: str) -> list[Characteristic]:
-        with open(file) as f:
-            text = '\n'.join([line.strip() for line in f.readlines()[1:]])  # Take [1:] to remove the header row.
-
-        characteristics = []
-        for line in text.splitlines():
-            name, description = line.split(';')
-            if name == "Name":
-                continue
-            else:
-                description = description.replace("'", "''")
-            characteristics.append(Characteristic(name, description))
+        with MR3Instrumentation.phase("parse_characteristics"):
+            with open(file) as f:
+                text = '\n'.join([line.strip() for line in f.readlines()[1:]])  # Take [1:] to remove the header row.
 
+            characteristics = []
+            for line in text.splitlines():
+                name, description = line.split(';')
+                if name == "Name":
+                    continue
+                characteristics.append(Characteristic(name, description))
+
+        MR3Instrumentation.count("characteristics_parsed", len(characteristics))
         return characteristics
 
 
+def write_query(file: str, out: TextIO) -> int:
+    """Writes SQL INSERT queries from the data in file to out.
+
+    :param str file:
+    :param TextIO out: Where to write the queries
+    :return: How many Characteristics were written
+    :rtype: int
+    """
+    with MR3Instrumentation.phase("build_characteristics"):
+        characteristics = (c.values() for c in MR3CharacteristicBuilder.parse_text(file))
+        return MR3SqlEmitter(out).write_inserts("Characteristic", Characteristic.Columns, characteristics)
+
+
 def main(file: str) -> str:
-    """Creates an SQL INSERT query from the data in file.
+    """Creates SQL INSERT queries from the data in file.
 
     :param str file:
-    :return: An SQL INSERT query featuring all MR3 Attacks
+    :return: SQL INSERT queries featuring all MR3 Characteristics
     :rtype: str
     """
-    characteristics = []
-    for characteristic in MR3CharacteristicBuilder.parse_text(file):
-        characteristics.append(f"({str(characteristic)})")
-    first_line = "INSERT INTO Characteristic (Characteristic, Description) VALUES"
-    return first_line + "\n\t" + ",\n\t".join(characteristics) + ";"
+    out = io.StringIO()
+    write_query(file, out)
+    return out.getvalue()
 
 
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print("Usage: MR3CharacteristicBuilder.py <input-file>")
+    if len(sys.argv) not in (2, 3):
+        print("Usage: MR3CharacteristicBuilder.py <input-file> [output-file]")
         exit(1)
-    print(main(sys.argv[1]))
+    if len(sys.argv) == 3:
+        with open(sys.argv[2], "w") as output:
+            write_query(sys.argv[1], output)
+    else:
+        write_query(sys.argv[1], sys.stdout)
@@ -0,0 +1,195 @@
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Union
+
+from MR3AttackBuilder import Attack, MR3AttackParser
+from MR3CharacteristicBuilder import Characteristic, MR3CharacteristicBuilder
+from MR3FandomScraper import MR3FandomScraper, MR3Monster
+from MR3Instrumentation import MR3Instrumentation
+from MR3ResponseCache import MR3ResponseCache
+from MR3ScrapeJournal import MR3ScrapeJournal
+
+
+class MR3DatabaseBuilder:
+    """Builds the lexicon database by writing parsed objects straight into SQLite, without generating SQL text.
+
+    The schema comes from the build script: its CREATE TABLE statements run first, its literal
+    `INSERT ... VALUES` data is replaced by the given objects, and everything else (indexes, triggers,
+    derived tables) runs once the data is loaded, so indexes are built once instead of row by row.
+    The database is built under a temporary name and only moved into place once complete.
+    """
+    BuildScript = Path(__file__).resolve().parent.parent / "sql" / "build_reference_tables.sql"
+    LiteralInsert = re.compile(r"INSERT\s+INTO\s+\w+\s*(\([^)]*\))?\s*VALUES\b", re.IGNORECASE)
+
+    # Safe only because a failed build is thrown away rather than recovered.
+    BulkLoadPragmas = [
+        "PRAGMA journal_mode = OFF",
+        "PRAGMA synchronous = OFF",
+        "PRAGMA locking_mode = EXCLUSIVE",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -65536"  # 64 MiB
+    ]
+
+    @staticmethod
+    def split_build_script(script: str) -> tuple[list[str], list[str]]:
+        """Splits the build script into the statements to run before and after loading the data.
+
+        :param str script: Text of the build script
+        :return: (CREATE TABLE statements, statements to defer until the data is loaded); literal
+            `INSERT ... VALUES` statements are left out
+        :rtype: tuple[list[str], list[str]]
+
+        Usage:
+
+        >>> MR3DatabaseBuilder.split_build_script(
+        ...     "-- Tables\\nCREATE TABLE Region (Id INTEGER PRIMARY KEY, Region TEXT);\\n"
+        ...     "INSERT INTO Region (Region) VALUES ('Goat');\\nCREATE INDEX RegionName ON Region (Region);\\n")
+        (['CREATE TABLE Region (Id INTEGER PRIMARY KEY, Region TEXT);'], ['CREATE INDEX RegionName ON Region (Region);'])
+        """
+        statements = []
+        statement = []
+        for line in script.splitlines(keepends=True):
+            if not statement and (not line.strip() or line.lstrip().startswith("--")):
+                continue  # Comments and blank lines between statements
+            statement.append(line)
+            if ';' in line and sqlite3.complete_statement("".join(statement)):
+                statements.append("".join(statement).strip())
+                statement = []
+
+        tables = []
+        deferred = []
+        for statement in statements:
+            words = statement.upper().split(None, 2)
+            if words[:2] == ["CREATE", "TABLE"]:
+                tables.append(statement)
+            elif MR3DatabaseBuilder.LiteralInsert.match(statement):
+                continue  # Literal data, replaced by the loaded objects
+            else:
+                deferred.append(statement)
+        return tables, deferred
+
+    @staticmethod
+    def load(connection: sqlite3.Connection, table: str, columns: list[str], rows: Iterable[tuple]) -> int:
+        """Inserts rows into table in a single transaction.
+
+        :param sqlite3.Connection connection: Connection in autocommit mode
+        :param str table: Table to load
+        :param list[str] columns: Column names, in the rows' order
+        :param Iterable[tuple] rows: Values of each row; consumed as they are inserted
+        :return: How many rows were inserted
+        :rtype: int
+        """
+        placeholders = ", ".join(["?"] * len(columns))
+        before = connection.total_changes
+        connection.execute("BEGIN")
+        connection.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+        connection.execute("COMMIT")
+        return connection.total_changes - before
+
+    @staticmethod
+    def build(database: Union[str, Path], attacks: Iterable[Attack], characteristics: Iterable[Characteristic],
+              monsters: Iterable[MR3Monster], build_script: Path = BuildScript) -> dict[str, int]:
+        """Builds the lexicon database from parsed objects.
+
+        :param Union[str, Path] database: Database file to create; replaced if it exists
+        :param Iterable[Attack] attacks: Attacks to load
+        :param Iterable[Characteristic] characteristics: Characteristics to load
+        :param Iterable[MR3Monster] monsters: Monsters to load
+        :param Path build_script: Script holding the schema
+        :return: Rows loaded into each table
+        :rtype: dict[str, int]
+        """
+        database = Path(database)
+        temporary_path = database.with_name(f"{database.name}.tmp")
+        temporary_path.unlink(missing_ok=True)
+        tables, deferred = MR3DatabaseBuilder.split_build_script(build_script.read_text(encoding="utf-8"))
+
+        connection = sqlite3.connect(temporary_path, isolation_level=None)
+        try:
+            for pragma in MR3DatabaseBuilder.BulkLoadPragmas:
+                connection.execute(pragma)
+            connection.execute("BEGIN")
+            for statement in tables:
+                connection.execute(statement)
+            connection.execute("COMMIT")
+
+            derivations = [MR3FandomScraper.format_monster_name(d) for d in MR3Monster.DerivationNumberToName.values()]
+            counts = {
+                "Derivation": MR3DatabaseBuilder.load(connection, "Derivation", ["Derivation"],
+                                                      [(d,) for d in derivations]),
+                "Region": MR3DatabaseBuilder.load(connection, "Region", ["Region"],
+                                                  [(r,) for r in MR3Monster.RegionNumberToName.values()]),
+                "Attack": MR3DatabaseBuilder.load(connection, "Attack", Attack.Columns,
+                                                  (a.values() for a in attacks)),
+                "Characteristic": MR3DatabaseBuilder.load(connection, "Characteristic", Characteristic.Columns,
+                                                          (c.values() for c in characteristics)),
+                "Monster": MR3DatabaseBuilder.load(connection, "Monster", MR3Monster.Columns,
+                                                   (m.values() for m in monsters))
+            }
+
+            connection.execute("BEGIN")
+            for statement in deferred:
+                connection.execute(statement)
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+        os.replace(temporary_path, database)
+        return counts
+
+
+def load_journaled_monsters(journal: Union[str, Path]) -> list[MR3Monster]:
+    """Reads the monsters of a scrape journal back, ordered by derivation, region and name.
+
+    :param Union[str, Path] journal: Journal written by MR3FandomScraper
+    :return: The journaled monsters
+    :rtype: list[MR3Monster]
+    """
+    monsters = [MR3Monster(**record) for record in MR3ScrapeJournal(journal).load().values()]
+    # Concurrent scrapes journal in completion order, and the journal doesn't keep listing positions, so a
+    # derivation's several specials are ordered by name to give every build the same order.
+    return sorted(monsters, key=lambda m: (m.derivation_id, m.region_id, m.species))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the lexicon's SQLite database in one step.")
+    parser.add_argument("database", type=Path, help="database file to create; replaced if it exists")
+    parser.add_argument("-a", "--attacks", help="attack document, as read by MR3AttackBuilder")
+    parser.add_argument("-c", "--characteristics", help="characteristic document, as read by "
+                                                        "MR3CharacteristicBuilder")
+    monster_source = parser.add_mutually_exclusive_group()
+    monster_source.add_argument("-m", "--monsters", help="scrape journal to read monsters from")
+    monster_source.add_argument("-s", "--scrape", action="store_true",
+                                help="scrape monsters from the wiki's API, through the response cache")
+    parser.add_argument("--cache-dir", default=".mr3cache", help="directory of the on-disk response cache")
+    args = parser.parse_args()
+
+    attacks = MR3AttackParser.parse_text(args.attacks) if args.attacks else []
+    characteristics = MR3CharacteristicBuilder.parse_text(args.characteristics) if args.characteristics else []
+    if args.scrape:
+        MR3FandomScraper.Backend = "api"
+        MR3FandomScraper.Cache = MR3ResponseCache(args.cache_dir)
+        monsters = MR3FandomScraper.get_all_monsters()
+    elif args.monsters:
+        monsters = load_journaled_monsters(args.monsters)
+    else:
+        monsters = []
+
+    start = time.perf_counter()
+    with MR3Instrumentation.phase("load_database"):
+        counts = MR3DatabaseBuilder.build(args.database, attacks, characteristics, monsters)
+    seconds = time.perf_counter() - start
+    for table, count in counts.items():
+        if count == 0:
+            print(f"Warning: no {table} rows were loaded", file=sys.stderr)
+    print(", ".join(f"{count} {table}" for table, count in counts.items()) + f" loaded in {seconds:.2f}s",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
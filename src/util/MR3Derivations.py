@@ -0,0 +1,94 @@
+import re
+
+
+class DerivationLookup(dict):
+    """Derivation IDs by name, looked up ignoring case, spacing and punctuation.
+
+    Usage:
+
+    >>> ids = DerivationLookup({"Colorpandora": 3})
+    >>> "Color Pandora" in ids, ids["COLOR-PANDORA"], ids.get("Zoom")
+    (True, 3, None)
+    """
+    def __init__(self, ids: dict[str, int]):
+        super().__init__((MR3Derivations.key(name), derivation_id) for name, derivation_id in ids.items())
+
+    def __contains__(self, name) -> bool:
+        return super().__contains__(MR3Derivations.key(name))
+
+    def __getitem__(self, name: str) -> int:
+        return super().__getitem__(MR3Derivations.key(name))
+
+    def get(self, name: str, default=None):
+        return super().get(MR3Derivations.key(name), default)
+
+
+class MR3Derivations:
+    """The game's derivations (monster types) by ID, and the other spellings their names are written in.
+
+    Kept free of dependencies, so builders which only need derivation IDs don't import the scraper's.
+
+    Usage:
+
+    >>> ids = MR3Derivations.ids()
+    >>> ids["Henger"], ids["hengar"], ids["Beaclon"], ids["Color Pandora"]
+    (10, 10, 2, 3)
+    """
+    NumberToName = {
+        1: "Baku",
+        2: "Beaklon",
+        3: "Colorpandora",
+        4: "Dragon",
+        5: "Dakkung",
+        6: "Durahan",
+        7: "Gitan",
+        8: "Golem",
+        9: "Hare",
+        10: "Henger",
+        11: "Jell",
+        12: "Joker",
+        13: "Lesione",
+        14: "Mew",
+        15: "Mocchi",
+        16: "Mogi",
+        17: "Momo",
+        18: "Naga",
+        19: "Octopee",
+        20: "Ogyo",
+        21: "Pancho",
+        22: "Pixie",
+        23: "Plant",
+        24: "Psiroller",
+        25: "Raiden",
+        26: "Suezo",
+        27: "Suzurin",
+        28: "Tiger",
+        29: "Zan",
+        30: "Zoom"
+    }
+    # Spellings used by the wiki or the lexicon which differ by more than case, spacing and punctuation
+    Aliases = {
+        "Beaclon": 2,
+        "Hengar": 10
+    }
+    Separators = re.compile(r"[\W_]+")
+
+    @staticmethod
+    def key(name: str) -> str:
+        """Reduces a derivation's name to the form its spellings share.
+
+        :param str name: Name as written, e.g. "Color Pandora"
+        :return: Name case folded, without spaces or punctuation
+        :rtype: str
+        """
+        return MR3Derivations.Separators.sub("", name.casefold())
+
+    @staticmethod
+    def ids() -> DerivationLookup:
+        """Maps every spelling of every derivation's name to its ID.
+
+        :return: Derivation IDs, by name
+        :rtype: DerivationLookup
+        """
+        names = {name: derivation_id for derivation_id, name in MR3Derivations.NumberToName.items()}
+        return DerivationLookup({**names, **MR3Derivations.Aliases})
@@ -1,44 +1,40 @@
+import argparse
+import contextlib
+import html
+import json
 import re
+import sys
+import threading
 import time
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Union
+from urllib.parse import unquote, urlencode
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from requests.adapters import HTTPAdapter
+
+from MR3Derivations import MR3Derivations
+from MR3Instrumentation import MR3Instrumentation
+from MR3ResolutionIndex import MR3ResolutionIndex
+from MR3ResponseCache import MR3ResponseCache
+from MR3ScrapeJournal import MR3ScrapeJournal
+from MR3SqlEmitter import MR3SqlEmitter
+from MR3SyncState import MR3SyncState
+
+try:
+    import lxml  # noqa: F401  Optional; parses several times faster than html.parser.
+    DefaultHtmlParser = "lxml"
+except ImportError:
+    DefaultHtmlParser = "html.parser"
+
+
+class MissingDescriptionError(LookupError):
+    """Raised when no page variant of a listed monster has a description to scrape."""
 
 
 class MR3Monster:
-    DerivationNumberToName = {
-        1: "Baku",
-        2: "Beaklon",
-        3: "Colorpandora",
-        4: "Dragon",
-        5: "Dakkung",
-        6: "Durahan",
-        7: "Gitan",
-        8: "Golem",
-        9: "Hare",
-        10: "Henger",
-        11: "Jell",
-        12: "Joker",
-        13: "Lesione",
-        14: "Mew",
-        15: "Mocchi",
-        16: "Mogi",
-        17: "Momo",
-        18: "Naga",
-        19: "Octopee",
-        20: "Ogyo",
-        21: "Pancho",
-        22: "Pixie",
-        23: "Plant",
-        24: "Psiroller",
-        25: "Raiden",
-        26: "Suezo",
-        27: "Suzurin",
-        28: "Tiger",
-        29: "Zan",
-        30: "Zoom"
-    }
+    DerivationNumberToName = MR3Derivations.NumberToName
 
     RegionNumberToName = {
         1: "Brillia",
@@ -55,17 +51,73 @@ class MR3Monster:
         self.region_id = region_id
         self.description = description
 
+    Columns = ["Monster", "DerivationID", "RegionID", "Description"]
+
+    def values(self) -> tuple:
+        """The monster's values, in the order of the Monster table's columns; the quotation marks wrapping
+        the description are dropped."""
+        description = self.description
+        if len(description) > 1 and description[0] == description[-1] == '"':
+            description = description[1:-1]
+        return self.species, self.derivation_id, self.region_id, description
+
     def __str__(self):
         derivation = self.DerivationNumberToName[self.derivation_id]
         region = self.RegionNumberToName[self.region_id]
         return f"{self.species} | {derivation} | {region} | {self.description}"
 
 
+class TokenBucket:
+    """A thread-safe token bucket which limits how quickly requests may start.
+
+    Tokens refill continuously at `rate` per second, up to `capacity`; each request spends one token.
+    """
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until a token is available, then spends it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens = self._tokens - 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
 class MR3FandomScraper:
-    EncyclopediaURL = "https://monster-rancher.fandom.com/wiki/Monster_Rancher_3_Encyclopedia"
+    WikiURL = "https://monster-rancher.fandom.com/wiki/"
+    EncyclopediaURL = WikiURL + "Monster_Rancher_3_Encyclopedia"
+    ApiURL = "https://monster-rancher.fandom.com/api.php"
+
+    Backend = "html"  # "html" scrapes each rendered page; "api" batches wikitext through the MediaWiki API.
+    ApiBatchSize = 50  # The most titles MediaWiki accepts per query for regular users.
+
+    HtmlParser = DefaultHtmlParser
+    ContentStrainer = SoupStrainer(id="mw-content-text")  # The Encyclopedia's article body
+    ParserOutputStrainer = SoupStrainer("div", attrs={"class": "mw-parser-output"})  # A monster page's article
 
     Delay = 0.150
 
+    MaxWorkers = 8
+    RateLimiter = TokenBucket(rate=10, capacity=5)  # Shared by all fetches, whether sequential or concurrent.
+
+    Cache: Union[MR3ResponseCache, None] = None
+    ResolutionIndex: Union[MR3ResolutionIndex, None] = None
+    Journal: Union[MR3ScrapeJournal, None] = None
+    NetworkRequests = 0
+
+    _session = None
+    _session_lock = threading.Lock()
+
     RegionNameToNumberDict = {
         "Brillia": 1,
         "Goat": 2,
@@ -75,6 +127,65 @@ class MR3FandomScraper:
         "Special": 6
     }
 
+    @staticmethod
+    def get_session() -> requests.Session:
+        """Gets the shared session, whose pooled keep-alive connections are reused across fetches and threads.
+
+        :return: The shared session
+        :rtype: requests.Session
+        """
+        with MR3FandomScraper._session_lock:
+            if MR3FandomScraper._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MR3FandomScraper.MaxWorkers)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                MR3FandomScraper._session = session
+            return MR3FandomScraper._session
+
+    @staticmethod
+    def fetch(url: str, fresh: bool = False) -> bytes:
+        """Gets the page at url from the cache if present, otherwise downloads it after waiting on the rate limiter.
+
+        :param str url: URL of the page to get
+        :param bool fresh: Skip cached copies, e.g. when checking for changes; the cache is still refreshed
+        :return: The page's content, or empty if the page is missing
+        :rtype: bytes
+        :raises CacheMissError: If the cache is offline and does not hold url
+        """
+        cache = MR3FandomScraper.Cache
+        if cache is not None and not fresh:
+            cached = cache.get(url)
+            if cached is not None:
+                MR3Instrumentation.count("cache_hits")
+                status, content = cached
+                return content if status == 200 else b""
+
+        with MR3Instrumentation.phase("rate_limit_wait"):
+            MR3FandomScraper.RateLimiter.acquire()
+        with MR3Instrumentation.phase("network"):
+            page = MR3FandomScraper.get_session().get(url)
+        with MR3FandomScraper._session_lock:
+            MR3FandomScraper.NetworkRequests = MR3FandomScraper.NetworkRequests + 1
+        MR3Instrumentation.count("network_requests")
+        MR3Instrumentation.count("bytes_downloaded", len(page.content))
+        if cache is not None:
+            cache.put(url, page.status_code, page.content)
+        return page.content if page.status_code == 200 else b""
+
+    @staticmethod
+    def parse(page: bytes, parse_only: SoupStrainer, url: Union[str, None] = None) -> BeautifulSoup:
+        """Parses a page, building only the subtrees parse_only matches; the skin around them is skipped.
+
+        :param bytes page: Page content
+        :param SoupStrainer parse_only: Which elements to build
+        :param Union[str, None] url: Where the page came from, to label its parse time with
+        :return: The parsed subtrees
+        :rtype: BeautifulSoup
+        """
+        with MR3Instrumentation.phase("parse_html", url):
+            return BeautifulSoup(page, features=MR3FandomScraper.HtmlParser, parse_only=parse_only)
+
     @staticmethod
     def format_monster_for_url_usage(monster: str) -> str:
         """Re-formats the name according to what Fandom URLs will require.
@@ -97,37 +208,88 @@ class MR3FandomScraper:
         )
 
     @staticmethod
-    def get_monster_description(monster: str, derivation: str, region: str) -> str:
+    def format_monster_for_string_comparison(monster_name: str) -> str:
+        """Cleans, then makes the name lowercase.
+
+        :param str monster_name:
+        :return: Cleaned, lowered name
+        :rtype: str
+
+        Usage:
+
+        >>> MR3FandomScraper.format_monster_for_string_comparison("Color_Pandora")
+        'colorpandora'
+        """
+        return (
+            monster_name
+            .replace('_', ' ')
+            .replace('-', ' ')
+            .replace("Color Pandora", "Colorpandora")  # Translating from Encyclopedia to actual name
+            .replace("Beaclon", "Beaklon")             # Translating from Encyclopedia to actual name
+            .replace("Henger", "Hengar")               # Translating from Encyclopedia to actual name
+            .lower()
+        )
+
+    @staticmethod
+    def is_name_column(text: str, monster: str, derivation: str, region: str) -> bool:
+        """Determines if the text of a summary table cell matches the monster's info.
+
+        :param str text: Text of the cell
+        :param str monster: Monster name, formatted for URLs
+        :param str derivation: Monster's derivation
+        :param str region: Monster's region
+        :return: True if the text comes from the Name column
+        :rtype: bool
+        """
+        description_comp = text.lower()
+        monster_comp = MR3FandomScraper.format_monster_for_string_comparison(monster)
+        return (
+            description_comp == monster_comp or
+            description_comp == f"{monster_comp} ({derivation.lower()})" or
+            description_comp == f"{monster_comp} ({region.lower()})" or
+            description_comp == f"{monster_comp} (???)"
+        )
+
+    UrlVariants = ["direct", "derivation", "monster", "special"]  # Names of the page title variants, in order
+
+    @staticmethod
+    def get_page_title_variants(monster: str, derivation: str) -> list[str]:
+        """Lists the page titles a monster's page may live at, in the order to try them.
+
+        :param str monster: Monster name, formatted for URLs
+        :param str derivation: Monster's derivation
+        :return: URL-ready page titles
+        :rtype: list[str]
+
+        Usage:
+
+        >>> MR3FandomScraper.get_page_title_variants("Coral", "Lesione")
+        ['Coral', 'Coral_(Lesione)', 'Coral_(Monster)', 'Coral_(%3F%3F%3F_Sub)']
+        """
+        direct_page_title = monster
+        derivation_page_title = f"{monster}_({derivation})"
+        monster_derivation_page_title = f"{monster}_(Monster)"
+        special_derivation_page_title = f"{monster}_(%3F%3F%3F_Sub)"
+        return [direct_page_title, derivation_page_title, monster_derivation_page_title, special_derivation_page_title]
+
+    @staticmethod
+    def get_monster_description(monster: str, derivation: str, region: str) -> Union[str, None]:
         """Get the in-game description of the specified monster_name.
 
         :param str monster: Monster species name
         :param str derivation: Derivation (aka Type), e.g., Baku, Golem, etc.
         :param str region: Monster's region (in MR3, this acts like other games' sub-type)
-        :return: The Fandom wiki's transcription of the monster_name's in-game description
-        :rtype: str
+        :return: The Fandom wiki's transcription of the monster_name's in-game description; None if no page
+            variant has the monster's summary table
+        :rtype: Union[str, None]
 
         Usage:
 
         >>> MR3FandomScraper.get_monster_description("Coral", "Lesione", "Special")
         '"Its texture is soft like a sponge. It feels so good you want to sleep on its back."'
         """
-
-        def format_monster_for_string_comparison(monster_name: str) -> str:
-            """Cleans, then makes the name lowercase.
-
-            :param str monster_name:
-            :return: Cleaned, lowered name
-            :rtype: str
-            """
-            return (
-                monster_name
-                .replace('_', ' ')
-                .replace('-', ' ')
-                .replace("Color Pandora", "Colorpandora")  # Translating from Encyclopedia to actual name
-                .replace("Beaclon", "Beaklon")             # Translating from Encyclopedia to actual name
-                .replace("Henger", "Hengar")               # Translating from Encyclopedia to actual name
-                .lower()
-            )
+        if MR3FandomScraper.Backend == "api":
+            return MR3FandomScraper.get_monster_descriptions([(monster, derivation, region)])[0]
 
         def find_monster_summary_table(monster_to_find) -> Tag:
             """Finds the summary table for monster, searching multiple URLs as needed.
@@ -136,49 +298,55 @@ class MR3FandomScraper:
             :return: The monster's summary table Tag
             :rtype: Tag
             """
-            def get_table_from(page_url: str) -> Union[Tag, None]:
+            def get_table_from(page_url: str, variant: str) -> Union[Tag, None]:
                 """Finds the table tag from the given page, if present.
 
                 :param page_url: URL to search for the table in
+                :param variant: Which kind of URL page_url is, for the instrumentation's counts
                 :return: The table's Tag if in page_url, None otherwise
                 :rtype: Union[Tag, None]
                 """
+                MR3Instrumentation.count(f"url_probes: {variant}")
                 try:
-                    page = requests.get(page_url)
-                    soup = BeautifulSoup(page.content, features="html.parser")
-                    content = soup.find("div", attrs={"class": "mw-parser-output"})
-                    wiki_table = content.find("table", attrs={"class": "wikitable"})
-                    return wiki_table
+                    page = MR3FandomScraper.fetch(page_url)
+                    if not page:  # Missing pages have no content to search.
+                        wiki_table = None
+                    else:
+                        soup = MR3FandomScraper.parse(page, MR3FandomScraper.ParserOutputStrainer, page_url)
+                        content = soup.find("div", attrs={"class": "mw-parser-output"})
+                        wiki_table = content.find("table", attrs={"class": "wikitable"})
                 except AttributeError:  # We tried to access `.find()` on a non-Tag (NavigableString)
-                    return None
-
-            direct_page_url = f"https://monster-rancher.fandom.com/wiki/{monster_to_find}"
-            derivation_page_url = f"https://monster-rancher.fandom.com/wiki/{monster_to_find}_({derivation})"
-            monster_derivation_page_url = f"https://monster-rancher.fandom.com/wiki/{monster_to_find}_(Monster)"
-            special_derivation_page_url = f"https://monster-rancher.fandom.com/wiki/{monster_to_find}_(%3F%3F%3F_Sub)"
-
-            for url in [direct_page_url, derivation_page_url, monster_derivation_page_url, special_derivation_page_url]:
-                table = get_table_from(url)
+                    wiki_table = None
+                if wiki_table is None:
+                    MR3Instrumentation.count(f"failed_url_probes: {variant}")
+                return wiki_table
+
+            wiki_url = MR3FandomScraper.WikiURL
+            page_titles = MR3FandomScraper.get_page_title_variants(monster_to_find, derivation)
+
+            # Go straight to the page which held the table last time, if known and still valid.
+            index = MR3FandomScraper.ResolutionIndex
+            if index is not None:
+                known_title = index.get(monster_to_find, derivation)
+                if known_title is not None:
+                    table = get_table_from(f"{wiki_url}{known_title}", "resolution_index")
+                    if table is not None:
+                        index.hit(page_titles.index(known_title) if known_title in page_titles else 0)
+                        return table
+                    index.forget(monster_to_find, derivation)
+
+            for variant, title in zip(MR3FandomScraper.UrlVariants, page_titles):
+                table = get_table_from(f"{wiki_url}{title}", variant)
                 if table is None:
                     continue
+                if index is not None:
+                    index.record(monster_to_find, derivation, title)
                 return table
 
-        def is_name_column() -> bool:
-            """Determines if the current text matches the monster's info.
-
-            :return: True if the text comes from the Name column
-            :rtype: bool
-            """
-            return (
-                description_comp == monster_comp or
-                description_comp == f"{monster_comp} ({derivation.lower()})" or
-                description_comp == f"{monster_comp} ({region.lower()})" or
-                description_comp == f"{monster_comp} (???)"
-            )
-
         monster = MR3FandomScraper.format_monster_for_url_usage(monster)
-        monster_comp = format_monster_for_string_comparison(monster)
         monster_summary_table = find_monster_summary_table(monster)
+        if monster_summary_table is None:
+            return None
 
         """
         Table columns are like: 
@@ -189,23 +357,241 @@ class MR3FandomScraper:
         mr3_td = monster_summary_table.find("tbody").find("a", attrs={"title": "Monster Rancher 3"}).parent.parent
         for sibling in mr3_td.next_siblings:
             # Sibling travel within BeautifulSoup: ["\n", <Name td Tag>, "\n", <Description td Tag>];
-            # non-Tags are `NavigableString`s and will throw when we try to access `.text` like a Tag
-            try:
-                description_text = sibling.text.strip().replace('\n', ' ')
-            except AttributeError:  # We tried to access `.text` on a non-Tag (NavigableString)
+            # non-Tags are `NavigableString`s, which newer BeautifulSoup versions also give a (blank) `.text`
+            if not isinstance(sibling, Tag):
                 continue
+            description_text = sibling.text.strip().replace('\n', ' ')
 
             # Continue past the Name column
-            description_comp = description_text.lower()
-            if is_name_column():
+            if MR3FandomScraper.is_name_column(description_text, monster, derivation, region):
                 continue
 
             return description_text
 
     @staticmethod
-    def get_all_monster_derivations() -> list[str]:
+    def query_revisions(titles: list[str], content: bool = True, fresh: bool = False) -> dict[str, Union[dict, None]]:
+        """Gets the current revision of up to `ApiBatchSize` pages in one MediaWiki API query, following redirects.
+
+        The API leaves out revisions which don't fit in one response and says where to carry on in a
+        `continue` block, so the query is repeated with it until the API returns none.
+
+        :param list[str] titles: Page titles, as requested
+        :param bool content: Also get each revision's wikitext
+        :param bool fresh: Skip cached API responses
+        :return: Each requested title's revision, as {"title", "revid", "timestamp", "content"}; None if missing
+        :rtype: dict[str, Union[dict, None]]
+        """
+        parameters = {
+            "action": "query", "prop": "revisions", "rvprop": "ids|timestamp|content" if content else "ids|timestamp",
+            "rvslots": "main", "titles": '|'.join(titles), "redirects": 1, "format": "json", "formatversion": 2
+        }
+        normalized = {}
+        redirects = {}
+        pages = {}
+        while True:
+            response = MR3FandomScraper.fetch(f"{MR3FandomScraper.ApiURL}?{urlencode(parameters)}", fresh=fresh)
+            with MR3Instrumentation.phase("parse_json"):
+                data = json.loads(response) if response else {}
+            result = data.get("query", {})
+            normalized.update((n["from"], n["to"]) for n in result.get("normalized", []))
+            redirects.update((r["from"], r["to"]) for r in result.get("redirects", []))
+            for page in result.get("pages", []):
+                if "revisions" in page:  # Pages whose revision was left for a later response come without one.
+                    revision = page["revisions"][0]
+                    pages[page["title"]] = {
+                        "title": page["title"],  # Canonical title, after normalization and redirects
+                        "revid": revision["revid"],
+                        "timestamp": revision["timestamp"],
+                        "content": revision["slots"]["main"]["content"] if content else None
+                    }
+            if "continue" not in data:
+                break
+            MR3Instrumentation.count("api_continuations")
+            parameters.update(data["continue"])
+
+        revisions = {}
+        for title in titles:
+            resolved = normalized.get(title, title)
+            resolved = redirects.get(resolved, resolved)
+            revisions[title] = pages.get(resolved)
+        return revisions
+
+    @staticmethod
+    def get_description_from_wikitext(wikitext: str, monster: str, derivation: str, region: str) -> Union[str, None]:
+        """Finds the monster's description in the MR3 row of a page's wikitext summary table.
+
+        :param str wikitext: Wikitext of the monster's page
+        :param str monster: Monster name, formatted for URLs
+        :param str derivation: Monster's derivation
+        :param str region: Monster's region
+        :return: The description, or None if the page has no MR3 row
+        :rtype: Union[str, None]
+
+        Usage:
+
+        >>> MR3FandomScraper.get_description_from_wikitext(
+        ...     "{| class=\\"wikitable\\"\\n!Game!!Name!!Description\\n|-\\n"
+        ...     "|''[[Monster Rancher 3]]''||Coral||\\"Its texture is soft like a sponge.\\"\\n|}",
+        ...     "Coral", "Lesione", "Special")
+        '"Its texture is soft like a sponge."'
+
+        Markup the wiki's editors use, such as an infobox above the table, cell attributes, piped links,
+        templates, footnotes and entities, is reduced to the text it shows:
+
+        >>> MR3FandomScraper.get_description_from_wikitext(
+        ...     "{{Infobox Monster\\n|name = Coral\\n|type = [[Lesione]]\\n}}\\n"
+        ...     "'''Coral''' is a [[Lesione]] sub-breed.\\n==Descriptions==\\n"
+        ...     "{| class=\\"wikitable\\" style=\\"width:100%\\"\\n! Game !! Name !! Description\\n|-\\n"
+        ...     "| style=\\"text-align:center\\" | ''[[Monster Rancher 3|MR3]]'' || [[Coral]] ||\\n"
+        ...     "\\"Its texture is soft like a sponge. It lives by the [[Lake|lakes]] of {{Region|Brillia}}"
+        ...     "&nbsp;and eats {{Item|[[Mint Leaf]]}}.{{sic}}\\"<ref>{{Cite game|title=MR3}}</ref>\\n|}",
+        ...     "Coral", "Lesione", "Special")
+        '"Its texture is soft like a sponge. It lives by the lakes of Brillia and eats Mint Leaf."'
+        """
+        def render_template(match: re.Match) -> str:
+            """Renders a template as the text it usually shows: its last unnamed parameter, if it has any.
+
+            :param re.Match match: Template, with no templates left inside it
+            :return: Template text
+            :rtype: str
+            """
+            parameters = [parameter for parameter in match[1].split('|')[1:] if '=' not in parameter]
+            return parameters[-1].strip() if parameters else ""
+
+        def clean(cell: str) -> str:
+            """Strips wiki markup from a table cell.
+
+            :param str cell: Cell wikitext
+            :return: Cell text
+            :rtype: str
+            """
+            cell = re.sub(r'^\s*(?:[\w-]+\s*=\s*"[^"]*"\s*)+\|', "", cell)  # Cell attributes, e.g. style="..." |
+            cell = re.sub(r"<ref[^>]*/>|<ref[^>]*>.*?</ref>", "", cell)       # Footnotes
+            cell = re.sub(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]", r"\1", cell)     # [[Target|Label]] or [[Target]]
+            cell = re.sub(r"\[https?://\S+ ([^\]]*)\]", r"\1", cell)           # [https://... Label]
+            replaced = 1
+            while replaced:                                                      # {{Name|...}}, innermost first
+                cell, replaced = re.subn(r"\{\{([^{}]*)\}\}", render_template, cell)
+            cell = re.sub(r"'{2,}", "", cell)                                    # Italics and bold
+            cell = re.sub(r"<br\s*/?>", " ", cell)
+            cell = re.sub(r"<[^>]+>", "", cell)
+            return re.sub(r"\s+", " ", html.unescape(cell)).strip()
+
+        rows = []
+        for table_start in re.finditer(r"^\{\|", wikitext, flags=re.MULTILINE):  # Every table, not just the first
+            end = wikitext.find("\n|}", table_start.start())
+            rows.extend(re.split(r"^\|-.*$", wikitext[table_start.start():end if end != -1 else len(wikitext)],
+                                 flags=re.MULTILINE))
+        for row in rows:
+            if "[[Monster Rancher 3" not in row:
+                continue
+            cells = []
+            for line in row.splitlines():
+                line = line.strip()
+                if line.startswith('|') and not line.startswith("|}"):
+                    cells.extend(line[1:].split("||"))
+                elif line.startswith('!'):
+                    cells.extend(line[1:].split("!!"))
+                elif cells and line:  # A cell continued onto the next line.
+                    cells[-1] = f"{cells[-1]} {line}"
+            game_column = next(i for i, cell in enumerate(cells) if "[[Monster Rancher 3" in cell)
+            for cell in cells[game_column + 1:]:
+                description_text = clean(cell)
+                if MR3FandomScraper.is_name_column(description_text, monster, derivation, region):
+                    continue
+                return description_text
+        return None
+
+    @staticmethod
+    def get_monster_descriptions(listings: list[tuple[str, str, str]]) -> list[Union[str, None]]:
+        """Gets many monsters' descriptions through the MediaWiki API, `ApiBatchSize` page titles per request.
+
+        :param list[tuple[str, str, str]] listings: (Monster species name, derivation, region) for each monster
+        :return: Each monster's description, in listing order; None if no variant had one
+        :rtype: list[Union[str, None]]
+        """
+        pages = MR3FandomScraper.get_monster_pages(listings)
+        return [page["description"] if page is not None else None for page in pages]
+
+    @staticmethod
+    def get_monster_pages(listings: list[tuple[str, str, str]], fresh: bool = False) -> list[Union[dict, None]]:
+        """Finds many monsters' pages through the MediaWiki API, `ApiBatchSize` page titles per request.
+
+        Every monster's first candidate title is requested together; monsters whose page was missing
+        or had no MR3 row move on to their next URL variant in the following round.
+
+        :param list[tuple[str, str, str]] listings: (Monster species name, derivation, region) for each monster
+        :param bool fresh: Skip cached API responses
+        :return: Each monster's page, as {"title", "revid", "timestamp", "description"}, in listing order;
+            None if no variant had a description
+        :rtype: list[Union[dict, None]]
+        """
+        index = MR3FandomScraper.ResolutionIndex
+        monsters = [MR3FandomScraper.format_monster_for_url_usage(monster) for monster, _, _ in listings]
+        known_titles = []
+        candidate_titles = []
+        for monster, (_, derivation, _) in zip(monsters, listings):
+            variants = MR3FandomScraper.get_page_title_variants(monster, derivation)
+            known_title = index.get(monster, derivation) if index is not None else None
+            known_titles.append(known_title)
+            if known_title is None:
+                candidate_titles.append(variants)
+            else:  # Go straight to the page which held the table last time.
+                candidate_titles.append([known_title] + [v for v in variants if v != known_title])
+
+        monster_pages = [None] * len(listings)
+        attempts = [0] * len(listings)
+        pending = list(range(len(listings)))
+        while pending:
+            titles = list(dict.fromkeys(unquote(candidate_titles[i][attempts[i]]) for i in pending))
+            revisions = {}
+            for start in range(0, len(titles), MR3FandomScraper.ApiBatchSize):
+                batch = titles[start:start + MR3FandomScraper.ApiBatchSize]
+                revisions.update(MR3FandomScraper.query_revisions(batch, fresh=fresh))
+
+            still_pending = []
+            for i in pending:
+                _, derivation, region = listings[i]
+                title = candidate_titles[i][attempts[i]]
+                revision = revisions.get(unquote(title))
+                description = None
+                if revision is not None:
+                    description = MR3FandomScraper.get_description_from_wikitext(revision["content"], monsters[i],
+                                                                                 derivation, region)
+                if description is not None:
+                    monster_pages[i] = {"title": revision["title"], "revid": revision["revid"],
+                                        "timestamp": revision["timestamp"], "description": description}
+                    if index is not None and attempts[i] == 0 and known_titles[i] is not None:
+                        variants = MR3FandomScraper.get_page_title_variants(monsters[i], derivation)
+                        index.hit(variants.index(title) if title in variants else 0)
+                    elif index is not None:
+                        index.record(monsters[i], derivation, title)
+                    continue
+                if index is not None and attempts[i] == 0 and known_titles[i] is not None:
+                    index.forget(monsters[i], derivation)
+                attempts[i] = attempts[i] + 1
+                if attempts[i] < len(candidate_titles[i]):
+                    still_pending.append(i)
+            pending = still_pending
+        return monster_pages
+
+    @staticmethod
+    def get_encyclopedia_content(fresh: bool = False) -> Tag:
+        """Downloads and parses the Encyclopedia's article body.
+
+        :param bool fresh: Skip a cached copy of the Encyclopedia
+        :return: The Encyclopedia's `mw-content-text` Tag
+        :rtype: Tag
+        """
+        page = MR3FandomScraper.fetch(MR3FandomScraper.EncyclopediaURL, fresh=fresh)
+        soup = MR3FandomScraper.parse(page, MR3FandomScraper.ContentStrainer, MR3FandomScraper.EncyclopediaURL)
+        return soup.find(id="mw-content-text")
+
+    @staticmethod
+    def get_all_monster_derivations(content: Union[Tag, None] = None) -> list[str]:
         """Gets all MR3 monster derivations (aka types).
 
+        :param Union[Tag, None] content: The Encyclopedia's already-parsed article body; fetched if not given
         :return: Wrangled list of MR3 monster derivations
         :rtype: list[str]
 
@@ -237,60 +623,43 @@ class MR3FandomScraper:
                 derivation = derivation[:-1]
             return derivation
 
-        page = requests.get(MR3FandomScraper.EncyclopediaURL)
-        soup = BeautifulSoup(page.content, features="html.parser")
-        content = soup.find(id="mw-content-text")
+        if content is None:
+            content = MR3FandomScraper.get_encyclopedia_content()
         monster_headers = content.find_all("h2")[1:]  # Ignore table of contents header
         return [wrangle(m) for m in monster_headers]
 
     @staticmethod
-    def get_all_monsters(count: int = 0) -> list[MR3Monster]:
-        """Gets all (or the specified amount of) MR3 monsters listed in the Fandom wiki.
-
-        :param int count: How many monsters to add; if left at 0 or > max, all will be added
-        :return: All (or the specified amount of) MR3 monsters in the wiki.
-        :rtype: List[MR3Monster]
+    def format_monster_name(monster_name: str) -> str:
+        """Corrects the spellings of some names.
 
-        Usage:
-
-        >>> MR3FandomScraper.get_all_monsters(1).pop().__str__()
-        Got #001: Baku | Baku | Brillia | "A big furry loveable moster with a huge appetite. Contrary to its looks, it is actually very agile."
-        'Baku | Baku | Brillia | "A big furry loveable moster with a huge appetite. Contrary to its looks, it is actually very agile."'
+        :param str monster_name: Name to format
+        :return: Corrected monster name
+        :rtype: str
         """
-        def get_monster_rows() -> list[Tag]:
-            """Grabs the table row tags containing monster data.
-
-            :return: <tr> tags with monster data
-            :rtype: list[Tag]
-            """
-            page = requests.get(MR3FandomScraper.EncyclopediaURL)
-            soup = BeautifulSoup(page.content, features="html.parser")
-            content = soup.find(id="mw-content-text")
-            rows = content.find_all("tr")
-            return rows
-
-        def format_monster_name(monster_name: str) -> str:
-            """Corrects the spellings of some names.
+        return (
+            monster_name
+            .replace("Color Pandora", "Colorpandora")
+            .replace("Henger", "Hengar")
+            .replace("Beaclon", "Beaklon")
+        )
 
-            :param str monster_name: Name to format
-            :return: Corrected monster name
-            :rtype: str
-            """
-            return (
-                monster_name
-                .replace("Color Pandora", "Colorpandora")
-                .replace("Henger", "Hengar")
-                .replace("Beaclon", "Beaklon")
-            )
+    @staticmethod
+    def get_monster_listings(count: int = 0, fresh: bool = False) -> list[tuple[str, int, str, str]]:
+        """Walks the Encyclopedia's rows to list the monsters to scrape, in Encyclopedia order.
 
-        monsters = []
-        monster_derivations = MR3FandomScraper.get_all_monster_derivations()
-        monster_rows = get_monster_rows()
+        :param int count: How many monsters to list; if left at 0 or > max, all will be listed
+        :param bool fresh: Skip a cached copy of the Encyclopedia
+        :return: (Encyclopedia name, derivation ID, derivation, region) for each monster
+        :rtype: list[tuple[str, int, str, str]]
+        """
+        listings = []
+        encyclopedia_content = MR3FandomScraper.get_encyclopedia_content(fresh)  # Parsed once, for both passes.
+        monster_derivations = MR3FandomScraper.get_all_monster_derivations(encyclopedia_content)
+        monster_rows = encyclopedia_content.find_all("tr")
         monster_derivation_index = 0
-        monsters_counted = 0
         derivation = ""
         for row in monster_rows:
-            if monsters_counted != 0 and monsters_counted == count:
+            if len(listings) != 0 and len(listings) == count:
                 break
             # Find the needed pieces of text.
             text = row.text.strip()
@@ -308,29 +677,250 @@ class MR3FandomScraper:
             name = parts[1]
             if name == '-':  # When no monster exists for a region + derivation combo, a dash is present.
                 continue
-            name = format_monster_name(parts[1])
-            # Get the monster's description.
-            time.sleep(MR3FandomScraper.Delay)  # Take a delay to lessen load/timeouts.
-            description = MR3FandomScraper.get_monster_description(parts[1], derivation, region)
-            # Add the monster to the list.
-            monster = MR3Monster(name, monster_derivation_index, region_number, description)
-            monsters.append(monster)
-            monsters_counted = monsters_counted + 1
-            print(f"Got #{monsters_counted:03d}: {monster}")
+            listings.append((name, monster_derivation_index, derivation, region))
+        return listings
+
+    @staticmethod
+    def build_monster(listing: tuple[str, int, str, str], description: str) -> MR3Monster:
+        """Builds the listed monster's MR3Monster.
+
+        :param tuple[str, int, str, str] listing: (Encyclopedia name, derivation ID, derivation, region)
+        :param str description: The monster's description
+        :return: The scraped monster
+        :rtype: MR3Monster
+        """
+        name, derivation_id, _, region = listing
+        region_number = MR3FandomScraper.RegionNameToNumberDict[region]
+        return MR3Monster(MR3FandomScraper.format_monster_name(name), derivation_id, region_number, description)
+
+    @staticmethod
+    def get_all_monsters(count: int = 0, workers: int = 1) -> list[MR3Monster]:
+        """Gets all (or the specified amount of) MR3 monsters listed in the Fandom wiki.
+
+        With more than one worker, monster pages are fetched concurrently by a bounded thread pool,
+        paced by the shared `RateLimiter` instead of the fixed `Delay`; results keep the sequential order.
+        When a `Journal` is set, each monster is journaled as soon as it is scraped, and monsters already
+        in the journal are reused instead of scraped again.
+
+        :param int count: How many monsters to add; if left at 0 or > max, all will be added
+        :param int workers: How many monster pages to fetch at once; 1 keeps the sequential, delayed loop
+        :return: All (or the specified amount of) MR3 monsters in the wiki.
+        :rtype: List[MR3Monster]
+        :raises MissingDescriptionError: If a listed monster has no description under any page title variant;
+            monsters scraped before it stay journaled, so a fixed run can resume
+
+        Usage:
+
+        >>> MR3FandomScraper.get_all_monsters(1).pop().__str__()
+        Got #001: Baku | Baku | Brillia | "A big furry loveable moster with a huge appetite. Contrary to its looks, it is actually very agile."
+        'Baku | Baku | Brillia | "A big furry loveable moster with a huge appetite. Contrary to its looks, it is actually very agile."'
+        """
+        def scrape_monster(listing: tuple[str, int, str, str]) -> MR3Monster:
+            """Gets the listed monster's description and builds its MR3Monster.
+
+            :param tuple[str, int, str, str] listing: (Encyclopedia name, derivation ID, derivation, region)
+            :return: The scraped monster
+            :rtype: MR3Monster
+            """
+            name, _, derivation, region = listing
+            with MR3Instrumentation.phase("scrape_monster"):
+                description = MR3FandomScraper.get_monster_description(name, derivation, region)
+            check_description(listing, description)
+            monster = MR3FandomScraper.build_monster(listing, description)
+            journal_monster(monster)
+            return monster
+
+        def check_description(listing: tuple[str, int, str, str], description: Union[str, None]) -> None:
+            """Stops the scrape at a monster without a description, before it is built or journaled.
+
+            :param tuple[str, int, str, str] listing: (Encyclopedia name, derivation ID, derivation, region)
+            :param Union[str, None] description: The monster's scraped description
+            :raises MissingDescriptionError: If description is None
+            """
+            if description is None:
+                name, _, derivation, region = listing
+                raise MissingDescriptionError(f"No description found for {name} ({derivation}, {region}) under "
+                                              f"any page title variant")
+
+        def journal_monster(monster: MR3Monster) -> None:
+            """Records the monster in the journal, if one is kept.
+
+            :param MR3Monster monster: Monster which was just scraped
+            """
+            if MR3FandomScraper.Journal is not None:
+                MR3FandomScraper.Journal.append(vars(monster))
+
+        def scrape_monsters(listings: list[tuple[str, int, str, str]]) -> Iterator[MR3Monster]:
+            """Scrapes the listed monsters, yielding each in listing order as soon as it is ready.
+
+            :param list[tuple[str, int, str, str]] listings: Monsters to scrape
+            :return: The scraped monsters
+            :rtype: Iterator[MR3Monster]
+            """
+            if MR3FandomScraper.Backend == "api":  # A few batched requests; no need for workers or delays.
+                descriptions = MR3FandomScraper.get_monster_descriptions(
+                    [(name, derivation, region) for name, _, derivation, region in listings]
+                )
+                for listing, description in zip(listings, descriptions):
+                    check_description(listing, description)
+                    monster = MR3FandomScraper.build_monster(listing, description)
+                    journal_monster(monster)
+                    yield monster
+            elif workers > 1:
+                executor = ThreadPoolExecutor(max_workers=min(workers, MR3FandomScraper.MaxWorkers))
+                try:
+                    futures = [executor.submit(scrape_monster, listing) for listing in listings]
+                    for future in futures:  # Input order
+                        yield future.result()
+                finally:  # On an error, or if the caller stops early, drop queued fetches rather than wait on them.
+                    executor.shutdown(cancel_futures=True)
+            else:
+                network_requests = -1
+                for listing in listings:
+                    # Take a delay to lessen load/timeouts, unless the last monster was served entirely from cache.
+                    if MR3FandomScraper.NetworkRequests != network_requests:
+                        with MR3Instrumentation.phase("sleep"):
+                            time.sleep(MR3FandomScraper.Delay)
+                    network_requests = MR3FandomScraper.NetworkRequests
+                    yield scrape_monster(listing)
+
+        monsters = []
+        monster_listings = MR3FandomScraper.get_monster_listings(count)
+        journaled = MR3FandomScraper.Journal.load() if MR3FandomScraper.Journal is not None else {}
+        resumed_monsters = {}
+        for i, (name, derivation_id, _, region) in enumerate(monster_listings):
+            record = journaled.get((MR3FandomScraper.format_monster_name(name), derivation_id,
+                                    MR3FandomScraper.RegionNameToNumberDict[region]))
+            if record is not None and record["description"] is not None:  # Older journals may hold None.
+                resumed_monsters[i] = MR3Monster(**record)
+
+        scraped_monsters = scrape_monsters(
+            [listing for i, listing in enumerate(monster_listings) if i not in resumed_monsters]
+        )
+        with contextlib.closing(scraped_monsters):  # Stops the workers at once if this loop fails.
+            for i in range(len(monster_listings)):
+                if i in resumed_monsters:
+                    MR3Instrumentation.count("monsters_resumed")
+                    monsters.append(resumed_monsters[i])
+                    print(f"Resumed #{len(monsters):03d}: {monsters[-1]}")
+                else:
+                    MR3Instrumentation.count("monsters_scraped")
+                    monsters.append(next(scraped_monsters))
+                    print(f"Got #{len(monsters):03d}: {monsters[-1]}")
         return monsters
 
+    @staticmethod
+    def sync_monsters(state: MR3SyncState) -> tuple[list[MR3Monster], list[MR3Monster]]:
+        """Brings the sync state up to date with the wiki, re-scraping only pages edited since the last sync.
+
+        The Encyclopedia is fetched fresh to find new monsters; every known page's current revision is then
+        checked through the API, `ApiBatchSize` titles per request, and only new monsters and those whose
+        page has a new revision (or moved) are scraped again.
+
+        :param MR3SyncState state: Monsters and page revisions from the last sync; updated in place
+        :return: (new monsters, monsters whose description changed)
+        :rtype: tuple[list[MR3Monster], list[MR3Monster]]
+        """
+        listings = MR3FandomScraper.get_monster_listings(fresh=True)
+        keys = [(MR3FandomScraper.format_monster_name(name), derivation_id,
+                 MR3FandomScraper.RegionNameToNumberDict[region]) for name, derivation_id, _, region in listings]
+
+        known_titles = list(dict.fromkeys(state.records[key]["title"] for key in keys if key in state.records))
+        revisions = {}
+        for start in range(0, len(known_titles), MR3FandomScraper.ApiBatchSize):
+            batch = known_titles[start:start + MR3FandomScraper.ApiBatchSize]
+            revisions.update(MR3FandomScraper.query_revisions(batch, content=False, fresh=True))
+
+        stale = []
+        for listing, key in zip(listings, keys):
+            record = state.records.get(key)
+            revision = revisions.get(record["title"]) if record is not None else None
+            if revision is None or (revision["title"], revision["revid"]) != (record["title"], record["revid"]):
+                stale.append((listing, key))
+        print(f"Checked {len(known_titles)} pages: {len(stale)} monsters new or edited", file=sys.stderr)
+
+        inserted = []
+        updated = []
+        pages = MR3FandomScraper.get_monster_pages(
+            [(name, derivation, region) for (name, _, derivation, region), _ in stale], fresh=True
+        )
+        for (listing, key), page in zip(stale, pages):
+            if page is None:  # No variant has a description any more; keep what was last synced.
+                continue
+            monster = MR3FandomScraper.build_monster(listing, page["description"])
+            previous = state.records.get(key)
+            state.records[key] = {**vars(monster), "title": page["title"], "revid": page["revid"],
+                                  "timestamp": page["timestamp"]}
+            if previous is None:
+                inserted.append(monster)
+            elif previous["description"] != monster.description:
+                updated.append(monster)
+        return inserted, updated
+
 
 def main():
-    monsters = MR3FandomScraper.get_all_monsters()
-    sql_statement = (
-        "INSERT INTO Monster (Monster, DerivationID, RegionID, Description) VALUES\n\t" +
-        ",\n\t".join([f"('{m.species}', {m.derivation_id}, {m.region_id}, '{m.description}')" for m in monsters]) +
-        ";"
-    )
-    sql_statement = sql_statement.replace("'\"", "'").replace("\"'", "'")
-    regex = r"(?<!, )(?<!\()\'(?!\'\w)(?!\))(?!, [0-9])"
-    sql_statement = re.sub(regex, "''", sql_statement)
-    print(sql_statement)
+    parser = argparse.ArgumentParser(description="Scrape MR3 monsters from the Fandom wiki into an SQL INSERT query.")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help=f"monster pages to fetch at once (at most {MR3FandomScraper.MaxWorkers}); "
+                             f"1 fetches them one at a time")
+    parser.add_argument("-b", "--backend", choices=["html", "api"], default=MR3FandomScraper.Backend,
+                        help="scrape rendered pages, or batch wikitext through the MediaWiki API")
+    parser.add_argument("--cache-dir", default=".mr3cache", help="directory of the on-disk response cache")
+    parser.add_argument("--cache-ttl", type=float, default=7 * 24, help="hours before a cached response is stale")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch from the wiki")
+    parser.add_argument("--offline", action="store_true", help="only read from the cache; never fetch from the wiki")
+    parser.add_argument("--index-file", default=".mr3cache/resolution_index.json",
+                        help="file remembering which URL variant holds each monster's page")
+    parser.add_argument("--no-index", action="store_true", help="always probe every URL variant")
+    parser.add_argument("--journal", default=".mr3cache/journal.jsonl",
+                        help="file each scraped monster is appended to as soon as it completes")
+    parser.add_argument("--resume", action="store_true", help="reuse monsters already in the journal")
+    parser.add_argument("--sync", action="store_true",
+                        help="only re-scrape pages edited since the last sync, printing UPDATE/INSERT statements")
+    parser.add_argument("--sync-state", default=".mr3cache/sync_state.json",
+                        help="file of monsters and page revisions from the last sync")
+    parser.add_argument("-o", "--output", type=argparse.FileType("w"), default=sys.stdout,
+                        help="file to write the SQL to; defaults to stdout")
+    args = parser.parse_args()
+    emitter = MR3SqlEmitter(args.output)
+
+    MR3FandomScraper.Backend = args.backend
+    if not args.no_cache:
+        MR3FandomScraper.Cache = MR3ResponseCache(args.cache_dir, ttl=args.cache_ttl * 60 * 60, offline=args.offline)
+    if not args.no_index:
+        MR3FandomScraper.ResolutionIndex = MR3ResolutionIndex(args.index_file)
+    if args.sync:
+        state = MR3SyncState(args.sync_state)
+        try:
+            inserted, updated = MR3FandomScraper.sync_monsters(state)
+        finally:
+            if MR3FandomScraper.ResolutionIndex is not None:
+                MR3FandomScraper.ResolutionIndex.save()
+        state.save()
+        for m in updated:
+            species, derivation_id, region_id, description = [emitter.format_value(v) for v in m.values()]
+            emitter.write_statement(f"UPDATE Monster SET Description = {description} WHERE Monster = {species} "
+                                    f"AND DerivationID = {derivation_id} AND RegionID = {region_id}")
+        emitter.write_inserts("Monster", MR3Monster.Columns, [m.values() for m in inserted])
+        print(f"{len(inserted)} new, {len(updated)} updated; "
+              f"{MR3FandomScraper.NetworkRequests} network requests", file=sys.stderr)
+        return
+
+    MR3FandomScraper.Journal = MR3ScrapeJournal(args.journal)
+    if not args.resume:
+        MR3FandomScraper.Journal.clear()
+    try:
+        monsters = MR3FandomScraper.get_all_monsters(workers=args.workers)
+    finally:  # Keep what was learned, even from a failed run.
+        if MR3FandomScraper.ResolutionIndex is not None:
+            MR3FandomScraper.ResolutionIndex.save()
+    emitter.write_inserts("Monster", MR3Monster.Columns, (m.values() for m in monsters))
+
+    print(f"{MR3FandomScraper.NetworkRequests} network requests", file=sys.stderr)
+    if MR3FandomScraper.Cache is not None:
+        print(MR3FandomScraper.Cache.stats(), file=sys.stderr)
+    if MR3FandomScraper.ResolutionIndex is not None:
+        print(MR3FandomScraper.ResolutionIndex.stats(), file=sys.stderr)
 
 
 if __name__ == '__main__':
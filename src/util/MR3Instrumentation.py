@@ -0,0 +1,232 @@
+import argparse
+import contextlib
+import cProfile
+import heapq
+import io
+import json
+import os
+import pstats
+import runpy
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Union
+
+
+class Phase:
+    """Times one pass through a phase into the recorder which created it."""
+    __slots__ = ("recorder", "name", "label", "start")
+
+    def __init__(self, recorder: "MR3Instrumentation", name: str, label: Union[str, None] = None):
+        self.recorder = recorder
+        self.name = name
+        self.label = label
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder.record(self.name, self.start, time.perf_counter() - self.start, self.label)
+
+
+class MR3Instrumentation:
+    """Collects timers and counters per phase of a scrape or build, with optional cProfile and tracemalloc.
+
+    The scraper, the attack and characteristic parsers and the SQL emitter report to `Active`; while it is
+    None, as it is unless a recording was started, each hook costs one attribute check.
+    Phases are timed (calls, total and longest seconds) and kept as trace events, which `write_trace` saves
+    in the Chrome trace event format, so a run can be viewed in chrome://tracing or Perfetto.
+    A pass may be labelled, e.g. with the URL of the page parsed; labels are kept in the trace events'
+    arguments, and the slowest labelled passes are listed in the report.
+    cProfile only profiles the thread which started the recording.
+
+    Usage:
+
+    >>> with MR3Instrumentation() as recorder:
+    ...     with MR3Instrumentation.phase("parse"):
+    ...         MR3Instrumentation.count("bytes_downloaded", 2048)
+    ...     with MR3Instrumentation.phase("parse", "https://example.org/a"):
+    ...         pass
+    >>> recorder.timers["parse"][0], recorder.counters, recorder.slowest[0][1:]
+    (2, {'bytes_downloaded': 2048}, ('parse', 'https://example.org/a'))
+    >>> MR3Instrumentation.Active is None
+    True
+    """
+    Active: Union["MR3Instrumentation", None] = None
+    MaxEvents = 200_000  # Beyond this, phases are still timed but no longer traced one by one.
+    MaxSlowest = 100  # Slowest labelled passes kept, whether or not they are traced
+
+    _inactive = contextlib.nullcontext()
+
+    def __init__(self, profile: bool = False, trace_memory: bool = False):
+        self.timers = {}  # Phase -> [calls, total seconds, longest seconds]
+        self.counters = {}
+        self.events = []
+        self.dropped_events = 0
+        self.slowest = []  # Min-heap of (seconds, phase, label) for the slowest labelled passes
+        self.profiler = cProfile.Profile() if profile else None
+        self.trace_memory = trace_memory
+        self.memory_snapshot = None
+        self.peak_traced_memory = 0
+        self.started = self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def phase(name: str, label: Union[str, None] = None) -> Union[Phase, contextlib.nullcontext]:
+        """Times the enclosed block as a pass through the named phase, if recording.
+
+        :param str name: Phase, e.g. "network" or "parse"
+        :param Union[str, None] label: What this pass worked on, e.g. a page's URL
+        :return: Context manager timing the block
+        :rtype: Union[Phase, contextlib.nullcontext]
+        """
+        recorder = MR3Instrumentation.Active
+        return MR3Instrumentation._inactive if recorder is None else Phase(recorder, name, label)
+
+    @staticmethod
+    def count(name: str, amount: int = 1) -> None:
+        """Adds amount to the named counter, if recording."""
+        recorder = MR3Instrumentation.Active
+        if recorder is not None:
+            with recorder._lock:
+                recorder.counters[name] = recorder.counters.get(name, 0) + amount
+
+    def record(self, name: str, start: float, seconds: float, label: Union[str, None] = None) -> None:
+        """Adds a timed pass through a phase.
+
+        :param str name: Phase
+        :param float start: time.perf_counter() when the pass started
+        :param float seconds: How long it took
+        :param Union[str, None] label: What the pass worked on
+        """
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] = timer[0] + 1
+                timer[1] = timer[1] + seconds
+                timer[2] = max(timer[2], seconds)
+            if label is not None:
+                if len(self.slowest) < MR3Instrumentation.MaxSlowest:
+                    heapq.heappush(self.slowest, (seconds, name, label))
+                elif seconds > self.slowest[0][0]:
+                    heapq.heapreplace(self.slowest, (seconds, name, label))
+            if len(self.events) < MR3Instrumentation.MaxEvents:
+                self.events.append((name, start, seconds, threading.get_ident(), label))
+            else:
+                self.dropped_events = self.dropped_events + 1
+
+    def start(self) -> "MR3Instrumentation":
+        """Makes this the active recorder, starting the profiler and memory tracing if asked for."""
+        if self.trace_memory:
+            tracemalloc.start()
+        self.started = time.perf_counter()
+        MR3Instrumentation.Active = self
+        if self.profiler is not None:
+            self.profiler.enable()
+        return self
+
+    def stop(self) -> None:
+        """Stops recording, keeping what was collected."""
+        if self.profiler is not None:
+            self.profiler.disable()
+        MR3Instrumentation.Active = None
+        self.seconds = time.perf_counter() - self.started
+        if self.trace_memory:
+            self.peak_traced_memory = tracemalloc.get_traced_memory()[1]
+            self.memory_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    def __enter__(self) -> "MR3Instrumentation":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def report(self, top: int = 15) -> str:
+        """Summarizes the recording: each phase's time, the counters, and the profile and allocations if kept.
+
+        :param int top: Functions and allocation sites to list
+        :return: Report text
+        :rtype: str
+        """
+        lines = [f"Recorded {self.seconds:.3f} s", "",
+                 f"{'Phase':32} {'Calls':>8} {'Total s':>9} {'Share':>6} {'Mean ms':>9} {'Max ms':>9}"]
+        for name, (calls, seconds, longest) in sorted(self.timers.items(), key=lambda item: -item[1][1]):
+            share = seconds / self.seconds if self.seconds else 0
+            lines.append(f"{name:32} {calls:8} {seconds:9.3f} {share:6.1%} {seconds / calls * 1000:9.3f} "
+                         f"{longest * 1000:9.3f}")
+        if self.slowest:
+            lines.extend(["", f"{'Slowest labelled passes':32} {'ms':>9}  Label"])
+            lines.extend(f"{name:32} {seconds * 1000:9.3f}  {label}"
+                         for seconds, name, label in heapq.nlargest(top, self.slowest))
+        if self.counters:
+            lines.extend(["", f"{'Counter':48} {'Value':>14}"])
+            lines.extend(f"{name:48} {value:14,}" for name, value in sorted(self.counters.items()))
+        if self.dropped_events:
+            lines.append(f"\n{self.dropped_events} phase passes were timed but left out of the trace")
+        if self.profiler is not None:
+            out = io.StringIO()
+            pstats.Stats(self.profiler, stream=out).sort_stats("cumulative").print_stats(top)
+            lines.extend(["", "Profile, by cumulative time:", out.getvalue().strip()])
+        if self.memory_snapshot is not None:
+            lines.extend(["", f"Peak traced memory {self.peak_traced_memory / 1024 / 1024:.1f} MiB; "
+                              f"largest allocation sites still held:"])
+            lines.extend(f"  {stat}" for stat in self.memory_snapshot.statistics("lineno")[:top])
+        return "\n".join(lines)
+
+    def write_trace(self, path: Union[str, Path]) -> None:
+        """Writes the recording as a Chrome trace event file, with the timers and counters alongside the events.
+
+        :param Union[str, Path] path: JSON file to write
+        """
+        pid = os.getpid()
+        trace = {
+            "traceEvents": [{"name": name, "ph": "X", "ts": (start - self.started) * 1e6, "dur": seconds * 1e6,
+                             "pid": pid, "tid": tid, **({"args": {"label": label}} if label is not None else {})}
+                            for name, start, seconds, tid, label in self.events],
+            "displayTimeUnit": "ms",
+            "seconds": self.seconds,
+            "timers": {name: {"calls": calls, "seconds": seconds, "max_seconds": longest}
+                       for name, (calls, seconds, longest) in self.timers.items()},
+            "counters": self.counters,
+            "dropped_events": self.dropped_events
+        }
+        if self.trace_memory:
+            trace["peak_traced_memory_bytes"] = self.peak_traced_memory
+        Path(path).write_text(json.dumps(trace), encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one of the lexicon's scripts with instrumentation, then "
+                                                 "report where its time went.")
+    parser.add_argument("-t", "--trace", type=Path, help="also write a JSON trace of every phase to this file")
+    parser.add_argument("-p", "--profile", action="store_true", help="profile the run with cProfile")
+    parser.add_argument("-m", "--trace-memory", action="store_true", help="trace allocations with tracemalloc")
+    parser.add_argument("--top", type=int, default=15, help="profiled functions and allocation sites to list")
+    parser.add_argument("script", type=Path, help="script to run, e.g. MR3FandomScraper.py")
+    parser.add_argument("arguments", nargs=argparse.REMAINDER, help="the script's own arguments")
+    args = parser.parse_args()
+
+    # Run as a script, this module isn't the MR3Instrumentation the hooks import; record through that one.
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from MR3Instrumentation import MR3Instrumentation as Shared
+
+    sys.argv = [str(args.script), *args.arguments]
+    sys.path.insert(0, str(args.script.resolve().parent))
+    recorder = Shared(profile=args.profile, trace_memory=args.trace_memory)
+    try:
+        with recorder:
+            runpy.run_path(str(args.script), run_name="__main__")
+    finally:  # Report even when the script fails or exits early.
+        print(recorder.report(args.top), file=sys.stderr)
+        if args.trace:
+            recorder.write_trace(args.trace)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+import contextlib
+import os
+import queue
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, Union
+
+from MR3Search import MR3Search
+
+SqlDirectory = Path(__file__).resolve().parent.parent / "sql"
+QueryFiles = [SqlDirectory / "sample_monster_data_queries.sql", SqlDirectory / "search_filter_queries.sql",
+              SqlDirectory / "summary_queries.sql"]
+
+
+def read_query_file(file: Path) -> list[tuple[str, str]]:
+    """Reads the queries of an SQL file, each named by the comment above it.
+
+    :param Path file: SQL file of commented queries
+    :return: (Name, query) for each query
+    :rtype: list[tuple[str, str]]
+    """
+    queries = []
+    name = ""
+    lines = []
+    for line in file.read_text(encoding="utf-8").splitlines(keepends=True):
+        if not lines and line.lstrip().startswith("--"):
+            name = line.strip()[2:].strip()
+            continue
+        if not lines and not line.strip():
+            continue
+        lines.append(line)
+        if sqlite3.complete_statement("".join(lines)):
+            queries.append((name, "".join(lines).strip()))
+            lines = []
+    if "".join(lines).strip():  # The last query's semicolon is optional.
+        queries.append((name, "".join(lines).strip()))
+    return queries
+
+
+def to_query_key(name: str) -> str:
+    """Shortens a query's comment into a key for looking it up.
+
+    :param str name: Query's comment
+    :return: Lowercase, hyphenated key
+    :rtype: str
+
+    Usage:
+
+    >>> to_query_key("Monsters of one derivation, in region order.")
+    'monsters-of-one-derivation-in-region-order'
+    """
+    return "-".join(re.findall(r"[a-z0-9]+", name.lower()))
+
+
+class MR3LexiconQueries:
+    """Read-only queries against a lexicon database, for serving many requests.
+
+    Queries run on a pool of read-only connections, each keeping its own cache of prepared statements,
+    so SQL text which repeats is only compiled once per connection. Results are kept in a bounded LRU
+    cache, which is emptied whenever the database file (or its write-ahead log) changes on disk. When the file
+    is replaced by another, as MR3DatabaseBuilder does, the pool is reopened too, since open connections keep
+    reading the file they were opened on.
+
+    Usage:
+
+    >>> import tempfile
+    >>> from MR3DatabaseBuilder import MR3DatabaseBuilder
+    >>> database = Path(tempfile.mkdtemp()) / "lexicon.sqlite3"
+    >>> sqlite3.connect(database).executescript(MR3DatabaseBuilder.BuildScript.read_text(encoding="utf-8")).close()
+    >>> lexicon = MR3LexiconQueries(database)
+    >>> [m["Monster"] for m in lexicon.monsters(derivation_id=13, region_id=6)]
+    ['Coral', 'Diamante', 'Seapea', 'Metal Head']
+    >>> [a["Attack"] for a in lexicon.attacks(derivation_id=13, min_damage=40)]
+    ['Tsunami', 'Show Time']
+    >>> _ = lexicon.monsters(derivation_id=13, region_id=6)
+    >>> lexicon.stats()
+    'query cache: 1 hits, 2 misses, 0 invalidations'
+    """
+    # Optional filter -> condition on the Attack table `a`, each taking the parameter of the same name
+    AttackFilters = {
+        "derivation_id": "a.DerivationId = :derivation_id",
+        "stat_used": "a.StatUsed = :stat_used",
+        "attack_type": "a.AttackType = :attack_type",
+        "item_required": "a.ItemRequired = :item_required",
+        "min_damage": "a.Damage >= :min_damage",
+        "max_damage": "a.Damage <= :max_damage"
+    }
+    MonsterFilters = {
+        "derivation_id": "m.DerivationID = :derivation_id",
+        "region_id": "m.RegionID = :region_id"
+    }
+
+    def __init__(self, database: Union[str, Path], pool_size: int = 4, cache_size: int = 1024,
+                 cached_statements: int = 128):
+        self.database = Path(database)
+        self.cache_size = cache_size
+        self.hits = self.misses = self.invalidations = 0
+        self.queries = {to_query_key(name): query for file in QueryFiles for name, query in read_query_file(file)}
+
+        self.pool_size = pool_size
+        self.cached_statements = cached_statements
+        self.reopens = 0
+
+        self._lock = threading.Lock()
+        self._results = OrderedDict()
+        self._signature = self.file_signature()
+        self._uri = f"{self.database.resolve().as_uri()}?mode=ro"
+        self._generation = 0  # Bumped when the pool is reopened; older connections are closed when returned.
+        self._connections = queue.Queue()
+        self.fill_pool()
+
+    def file_signature(self) -> tuple:
+        """Identifies the database's current file and contents by its files' device, inode, modification
+        time and size; the database file's (device, inode) comes first."""
+        signature = []
+        for path in [self.database, self.database.with_name(f"{self.database.name}-wal")]:
+            try:
+                status = os.stat(path)
+                signature.append((status.st_dev, status.st_ino, status.st_mtime_ns, status.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    @staticmethod
+    def file_identity(signature: tuple) -> Union[tuple, None]:
+        """The (device, inode) of the database file in a signature; None if it was missing."""
+        return signature[0][:2] if signature[0] is not None else None
+
+    def fill_pool(self) -> None:
+        """Opens a pool's worth of read-only connections for the current generation."""
+        for _ in range(self.pool_size):
+            self._connections.put((self._generation, sqlite3.connect(
+                self._uri, uri=True, check_same_thread=False, cached_statements=self.cached_statements)))
+
+    def reopen_pool(self) -> None:
+        """Replaces the pooled connections, which still read the replaced file. Call with the lock held.
+
+        Connections lent out are closed when they come back rather than returned to the pool.
+        """
+        self._generation = self._generation + 1
+        self.reopens = self.reopens + 1
+        while True:
+            try:
+                _, connection = self._connections.get_nowait()
+            except queue.Empty:
+                break
+            connection.close()
+        self.fill_pool()
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrows a connection from the pool, waiting for one if all are in use."""
+        generation, connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            if generation == self._generation:
+                self._connections.put((generation, connection))
+            else:
+                connection.close()
+
+    def run(self, sql: str, parameters: Union[dict, None] = None) -> list[dict]:
+        """Runs a read-only query, answering from the result cache when the database has not changed.
+
+        :param str sql: Query to run; keep its text fixed and pass values as parameters
+        :param Union[dict, None] parameters: Named parameters of the query
+        :return: Result rows, as {column: value}; shared with the cache, so do not modify them
+        :rtype: list[dict]
+        """
+        parameters = parameters or {}
+        key = (sql, tuple(sorted(parameters.items())))
+        signature = self.file_signature()
+        with self._lock:
+            if signature != self._signature:
+                if self.file_identity(signature) != self.file_identity(self._signature):
+                    self.reopen_pool()
+                self._signature = signature
+                self._results.clear()
+                self.invalidations = self.invalidations + 1
+            elif key in self._results:
+                self.hits = self.hits + 1
+                self._results.move_to_end(key)
+                return self._results[key]
+            self.misses = self.misses + 1
+
+        with self.connection() as connection:
+            cursor = connection.execute(sql, parameters)
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor]
+
+        with self._lock:
+            if signature == self._signature:  # Don't cache results read before a change was noticed.
+                self._results[key] = rows
+                self._results.move_to_end(key)
+                while len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+        return rows
+
+    def query(self, key: str, parameters: Union[dict, None] = None) -> list[dict]:
+        """Runs one of the sample or search filter queries.
+
+        :param str key: Query's key, as listed in `queries`
+        :param Union[dict, None] parameters: Named parameters of the query
+        :return: Result rows
+        :rtype: list[dict]
+        :raises KeyError: If no query has the key
+        """
+        return self.run(self.queries[key], parameters)
+
+    def monsters(self, derivation_id: Union[int, None] = None, region_id: Union[int, None] = None) -> list[dict]:
+        """Lists monsters, optionally of one derivation and/or region.
+
+        :param Union[int, None] derivation_id: Derivation to filter by
+        :param Union[int, None] region_id: Region to filter by
+        :return: Monsters, with their derivation and region names
+        :rtype: list[dict]
+        """
+        parameters = {k: v for k, v in {"derivation_id": derivation_id, "region_id": region_id}.items()
+                      if v is not None}
+        conditions = [MR3LexiconQueries.MonsterFilters[k] for k in parameters]
+        sql = ("SELECT m.Id, m.Monster, d.Derivation, r.Region, m.Description FROM Monster m "
+               "JOIN Derivation d ON m.DerivationID = d.Id JOIN Region r ON m.RegionID = r.Id" +
+               (" WHERE " + " AND ".join(conditions) if conditions else "") +
+               " ORDER BY m.DerivationID, m.RegionID, m.Id")
+        return self.run(sql, parameters)
+
+    def attacks(self, limit: int = 100, **filters) -> list[dict]:
+        """Lists attacks matching every given filter, strongest first.
+
+        :param int limit: Most attacks to list
+        :param filters: Any of `AttackFilters`, e.g. derivation_id=12, min_damage=20
+        :return: Attacks, with their derivation's name
+        :rtype: list[dict]
+        :raises KeyError: If a filter is unknown
+        """
+        parameters = {k: v for k, v in filters.items() if v is not None}
+        conditions = [MR3LexiconQueries.AttackFilters[k] for k in sorted(parameters)]  # Sorted to reuse statements
+        parameters["limit"] = limit
+        sql = ("SELECT a.Id, d.Derivation, a.Attack, a.StatUsed, a.AttackType, a.ItemRequired, a.GutsUsed, "
+               "a.Damage, a.GutsDown, a.Critical, a.Hit, a.MaxLevel, a.AttackRange, a.Growth, a.Effect "
+               "FROM Attack a JOIN Derivation d ON a.DerivationId = d.Id" +
+               (" WHERE " + " AND ".join(conditions) if conditions else "") +
+               " ORDER BY a.Damage DESC, a.Id LIMIT :limit")
+        return self.run(sql, parameters)
+
+    def search(self, text: str, kinds: Union[list[str], None] = None, limit: int = 20) -> list[dict]:
+        """Searches names and descriptions through MR3Search.
+
+        :param str text: Text to search for
+        :param Union[list[str], None] kinds: Which of "monster", "characteristic" and "attack" to search
+        :param int limit: Most results to return
+        :return: Results, best first, as {"kind", "id", "name", "snippet", "rank"}
+        :rtype: list[dict]
+        """
+        query = MR3Search.to_match_query(text)
+        if query is None:
+            return []
+        return self.run(MR3Search.build_query(kinds), {"query": query, "limit": limit})
+
+    def stats(self) -> str:
+        """Summarizes the result cache's counters.
+
+        :return: Counter summary
+        :rtype: str
+        """
+        return f"query cache: {self.hits} hits, {self.misses} misses, {self.invalidations} invalidations"
+
+    def close(self) -> None:
+        while not self._connections.empty():
+            self._connections.get()[1].close()
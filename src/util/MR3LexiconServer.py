@@ -0,0 +1,215 @@
+import argparse
+import asyncio
+import json
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from MR3LexiconQueries import MR3LexiconQueries
+
+
+class HttpError(Exception):
+    """Raised by a route to answer with an HTTP error status."""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class MR3LexiconServer:
+    """A small asyncio HTTP/1.1 server answering GET requests for lexicon queries with JSON.
+
+    Routes:
+
+    - `/queries` lists the sample and search filter queries; `/queries/<key>?<parameter>=...` runs one
+    - `/monsters?derivation_id=&region_id=`
+    - `/attacks?derivation_id=&stat_used=&attack_type=&item_required=&min_damage=&max_damage=&limit=`
+    - `/search?q=&kind=&limit=`, where `kind` may be repeated
+
+    `limit` must be a whole number no larger than `MaxLimit`.
+
+    Queries run on a thread pool the size of the lexicon's connection pool, keeping the event loop free
+    to accept and parse requests; connections are kept alive between requests.
+    """
+    Reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               500: "Internal Server Error"}
+    MaxLimit = 1000  # Most rows one request may ask for
+
+    def __init__(self, lexicon: MR3LexiconQueries, workers: int = 4):
+        self.lexicon = lexicon
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.routes = {
+            "/queries": self.list_queries,
+            "/monsters": self.get_monsters,
+            "/attacks": self.get_attacks,
+            "/search": self.get_search
+        }
+
+    @staticmethod
+    def parse_value(value: str) -> Union[str, int]:
+        """Reads a query-string value, as an integer when it is one.
+
+        :param str value: Value to read
+        :return: The value
+        :rtype: Union[str, int]
+        """
+        return int(value) if value.lstrip('-').isdigit() else value
+
+    @staticmethod
+    def read_limit(parameters: dict[str, list[str]], default: int) -> int:
+        """Reads the `limit` parameter.
+
+        :param dict[str, list[str]] parameters: Parsed query string
+        :param int default: Limit if none is given
+        :return: The limit
+        :rtype: int
+        :raises HttpError: If the limit isn't a whole number from 0 to MaxLimit
+
+        Usage:
+
+        >>> MR3LexiconServer.read_limit({"limit": ["5"]}, 20), MR3LexiconServer.read_limit({}, 20)
+        (5, 20)
+        >>> MR3LexiconServer.read_limit({"limit": ["abc"]}, 20)
+        Traceback (most recent call last):
+        ...
+        MR3LexiconServer.HttpError: limit must be a whole number from 0 to 1000
+        """
+        if "limit" not in parameters:
+            return default
+        limit = parameters["limit"][-1]
+        if not limit.isdigit() or int(limit) > MR3LexiconServer.MaxLimit:
+            raise HttpError(400, f"limit must be a whole number from 0 to {MR3LexiconServer.MaxLimit}")
+        return int(limit)
+
+    @staticmethod
+    def single_values(parameters: dict[str, list[str]]) -> dict[str, Union[str, int]]:
+        return {key: MR3LexiconServer.parse_value(values[-1]) for key, values in parameters.items()}
+
+    def list_queries(self, parameters: dict[str, list[str]]) -> list:
+        return list(self.lexicon.queries)
+
+    def get_monsters(self, parameters: dict[str, list[str]]) -> list:
+        values = self.single_values(parameters)
+        unknown = set(values) - set(MR3LexiconQueries.MonsterFilters)
+        if unknown:
+            raise HttpError(400, f"Unknown filters: {', '.join(sorted(unknown))}")
+        return self.lexicon.monsters(**values)
+
+    def get_attacks(self, parameters: dict[str, list[str]]) -> list:
+        values = self.single_values(parameters)
+        unknown = set(values) - set(MR3LexiconQueries.AttackFilters) - {"limit"}
+        if unknown:
+            raise HttpError(400, f"Unknown filters: {', '.join(sorted(unknown))}")
+        values["limit"] = self.read_limit(parameters, 100)
+        return self.lexicon.attacks(**values)
+
+    def get_search(self, parameters: dict[str, list[str]]) -> list:
+        if "q" not in parameters:
+            raise HttpError(400, "Missing q")
+        kinds = parameters.get("kind")
+        if kinds and not set(kinds) <= {"monster", "characteristic", "attack"}:
+            raise HttpError(400, "kind must be monster, characteristic or attack")
+        return self.lexicon.search(parameters["q"][-1], kinds, self.read_limit(parameters, 20))
+
+    def route(self, target: str) -> Callable[[], list]:
+        """Finds the handler for a request target.
+
+        :param str target: Path and query string of the request
+        :return: Handler to run, bound to the request's parameters
+        :rtype: Callable[[], list]
+        :raises HttpError: If nothing answers at the path
+        """
+        url = urlsplit(target)
+        parameters = parse_qs(url.query)
+        path = unquote(url.path).rstrip('/') or '/'
+        if path.startswith("/queries/"):
+            key = path[len("/queries/"):]
+            if key not in self.lexicon.queries:
+                raise HttpError(404, f"No query {key}")
+            return lambda: self.lexicon.query(key, self.single_values(parameters))
+        if path not in self.routes:
+            raise HttpError(404, f"Nothing at {path}")
+        return lambda: self.routes[path](parameters)
+
+    async def respond(self, method: str, target: str) -> tuple[int, bytes]:
+        """Answers one request.
+
+        :param str method: HTTP method
+        :param str target: Path and query string of the request
+        :return: (HTTP status, JSON body)
+        :rtype: tuple[int, bytes]
+        """
+        try:
+            if method != "GET":
+                raise HttpError(405, "Only GET is supported")
+            handler = self.route(target)
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, handler)
+            return 200, json.dumps(result).encode()
+        except HttpError as e:
+            return e.status, json.dumps({"error": str(e)}).encode()
+        except (sqlite3.ProgrammingError, TypeError, ValueError) as e:  # e.g. a query's parameter is missing
+            return 400, json.dumps({"error": str(e)}).encode()
+        except Exception as e:
+            return 500, json.dumps({"error": str(e)}).encode()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves the requests of one client connection until it closes."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                keep_alive = version == "HTTP/1.1"
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(':')
+                    if name.strip().lower() == "connection":
+                        keep_alive = {"close": False, "keep-alive": True}.get(value.strip().lower(), keep_alive)
+
+                status, body = await self.respond(method, target)
+                writer.write(
+                    f"HTTP/1.1 {status} {self.Reasons[status]}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode() + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):  # A dropped connection or a malformed request line
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving {self.lexicon.database} on http://{host}:{port}", file=sys.stderr, flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve read-only lexicon queries as JSON over HTTP.")
+    parser.add_argument("database", type=Path, help="lexicon database to serve")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("-p", "--port", type=int, default=8333, help="port to listen on")
+    parser.add_argument("--pool-size", type=int, default=4, help="read-only connections, and query threads")
+    parser.add_argument("--cache-size", type=int, default=1024, help="query results to keep; 0 disables the cache")
+    args = parser.parse_args()
+
+    lexicon = MR3LexiconQueries(args.database, pool_size=args.pool_size, cache_size=args.cache_size)
+    try:
+        asyncio.run(MR3LexiconServer(lexicon, workers=args.pool_size).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(lexicon.stats(), file=sys.stderr)
+        lexicon.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import glob
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TextIO, Union
+
+from MR3AttackBuilder import Attack, MR3AttackParser
+from MR3CharacteristicBuilder import Characteristic, MR3CharacteristicBuilder
+from MR3Derivations import MR3Derivations
+from MR3SqlEmitter import MR3SqlEmitter
+
+# Derivation ID by the name in a "Derivation:" header, in any case, spacing or known alternative spelling
+DerivationIds = MR3Derivations.ids()
+
+
+def find_inputs(source: Union[str, Path]) -> list[Path]:
+    """Finds the files to build from.
+
+    :param Union[str, Path] source: Directory, whose files are all read, or glob pattern
+    :return: Matching files, sorted by path so every build reads them in the same order
+    :rtype: list[Path]
+    """
+    source = Path(source)
+    if source.is_dir():
+        return sorted(path for path in source.iterdir() if path.is_file() and not path.name.startswith("."))
+    return sorted(Path(path) for path in glob.glob(str(source), recursive=True) if Path(path).is_file())
+
+
+def parse_attack_file(file: Path) -> list[tuple]:
+    """Parses one attack file, numbering derivations by name rather than by their order in the file.
+
+    Runs in a worker process; returns plain tuples, which are cheaper to send back than Attacks.
+    """
+    return [attack.values() for attack in MR3AttackParser.parse_text(str(file), DerivationIds)]
+
+
+def parse_characteristic_file(file: Path) -> list[tuple]:
+    """Parses one characteristic file. Runs in a worker process."""
+    return [characteristic.values() for characteristic in MR3CharacteristicBuilder.parse_text(str(file))]
+
+
+class MR3ParallelBuilder:
+    """Parses attack and characteristic dumps split across many files on a pool of processes.
+
+    Files are parsed independently and merged in a fixed order: characteristics in file order, attacks by
+    derivation and then file order, so the result doesn't depend on which worker finishes first. Splitting
+    one dump into per-derivation files therefore gives the same rows as parsing it whole.
+    """
+
+    def __init__(self, workers: Union[int, None] = None):
+        self.workers = workers
+
+    def map(self, parse, files: list[Path]) -> list[list[tuple]]:
+        """Runs parse over files, in worker processes unless only one worker is wanted.
+
+        :return: Each file's rows, in the order of files
+        :rtype: list[list[tuple]]
+        """
+        if self.workers == 1 or len(files) < 2:
+            return [parse(file) for file in files]
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(parse, files))
+
+    def attacks(self, files: list[Path]) -> list[Attack]:
+        """Parses attack files.
+
+        :param list[Path] files: Attack dumps, with derivations under headers naming them
+        :return: Attacks, ordered by derivation, then file, then position in the file
+        :rtype: list[Attack]
+        """
+        rows = [row for file_rows in self.map(parse_attack_file, files) for row in file_rows]
+        rows.sort(key=lambda row: row[0])  # Stable, so file and position order hold within a derivation.
+        return [Attack(*row) for row in rows]
+
+    def characteristics(self, files: list[Path]) -> list[Characteristic]:
+        """Parses characteristic files.
+
+        :param list[Path] files: Characteristic dumps
+        :return: Characteristics, in file order
+        :rtype: list[Characteristic]
+        """
+        return [Characteristic(*row) for file_rows in self.map(parse_characteristic_file, files) for row in file_rows]
+
+    def write_query(self, attack_files: list[Path], characteristic_files: list[Path], out: TextIO) -> dict[str, int]:
+        """Writes SQL INSERT queries for every file's attacks and characteristics to out.
+
+        :return: How many attacks and characteristics were written
+        :rtype: dict[str, int]
+        """
+        emitter = MR3SqlEmitter(out)
+        return {
+            "attacks": emitter.write_inserts("Attack", Attack.Columns,
+                                             (a.values() for a in self.attacks(attack_files))),
+            "characteristics": emitter.write_inserts("Characteristic", Characteristic.Columns,
+                                                     (c.values() for c in self.characteristics(characteristic_files)))
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build SQL INSERT queries from many attack and characteristic "
+                                                 "files in parallel.")
+    parser.add_argument("-a", "--attacks", help="directory or glob pattern of attack files")
+    parser.add_argument("-c", "--characteristics", help="directory or glob pattern of characteristic files")
+    parser.add_argument("-w", "--workers", type=int, help="worker processes; defaults to one per core")
+    parser.add_argument("-o", "--output", type=argparse.FileType("w"), default=sys.stdout,
+                        help="file to write the queries to, instead of standard output")
+    args = parser.parse_args()
+    if not args.attacks and not args.characteristics:
+        parser.error("give attack and/or characteristic files")
+
+    attack_files = find_inputs(args.attacks) if args.attacks else []
+    characteristic_files = find_inputs(args.characteristics) if args.characteristics else []
+    counts = MR3ParallelBuilder(args.workers).write_query(attack_files, characteristic_files, args.output)
+    print(f"{counts['attacks']} attacks from {len(attack_files)} files, {counts['characteristics']} characteristics "
+          f"from {len(characteristic_files)} files", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Union
+
+
+class MR3ResolutionIndex:
+    """A persisted map from (monster, derivation) to the wiki page title which held the monster's summary table.
+
+    The scraper tries the known title first and only probes every URL variant when no entry exists or the
+    known page no longer has the table. `probes_saved` counts the requests skipped by going straight to
+    a later variant.
+
+    Usage:
+
+    >>> import tempfile
+    >>> path = Path(tempfile.mkdtemp()) / "index.json"
+    >>> index = MR3ResolutionIndex(path)
+    >>> index.get("Coral", "Lesione") is None
+    True
+    >>> index.record("Coral", "Lesione", "Coral_(%3F%3F%3F_Sub)")
+    >>> index.save()
+    >>> MR3ResolutionIndex(path).get("Coral", "Lesione")
+    'Coral_(%3F%3F%3F_Sub)'
+    """
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.hits = self.stale = self.misses = self.probes_saved = 0
+        self._lock = threading.Lock()
+        try:
+            self._titles = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self._titles = {}
+
+    @staticmethod
+    def key(monster: str, derivation: str) -> str:
+        return f"{monster}|{derivation}"
+
+    def get(self, monster: str, derivation: str) -> Union[str, None]:
+        """Looks up the title which last held the monster's summary table.
+
+        :param str monster: Monster name, formatted for URLs
+        :param str derivation: Monster's derivation
+        :return: The known page title, if any
+        :rtype: Union[str, None]
+        """
+        with self._lock:
+            title = self._titles.get(self.key(monster, derivation))
+            if title is None:
+                self.misses = self.misses + 1
+            return title
+
+    def hit(self, probes_saved: int) -> None:
+        """Counts a successful lookup.
+
+        :param int probes_saved: How many URL variants precede the known title in the probe order
+        """
+        with self._lock:
+            self.hits = self.hits + 1
+            self.probes_saved = self.probes_saved + probes_saved
+
+    def forget(self, monster: str, derivation: str) -> None:
+        """Drops an entry whose page no longer holds the summary table.
+
+        :param str monster: Monster name, formatted for URLs
+        :param str derivation: Monster's derivation
+        """
+        with self._lock:
+            self.stale = self.stale + 1
+            self._titles.pop(self.key(monster, derivation), None)
+
+    def record(self, monster: str, derivation: str, title: str) -> None:
+        """Remembers the title which held the monster's summary table.
+
+        :param str monster: Monster name, formatted for URLs
+        :param str derivation: Monster's derivation
+        :param str title: Page title, relative to the wiki's URL
+        """
+        with self._lock:
+            self._titles[self.key(monster, derivation)] = title
+
+    def save(self) -> None:
+        """Writes the index to its file."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+            temporary_path.write_text(json.dumps(self._titles, indent=1, sort_keys=True), encoding="utf-8")
+            os.replace(temporary_path, self.path)
+
+    def stats(self) -> str:
+        """Summarizes the index's counters.
+
+        :return: Counter summary
+        :rtype: str
+        """
+        return (f"resolution index: {self.hits} hits, {self.stale} stale, {self.misses} misses, "
+                f"{self.probes_saved} probe requests saved")
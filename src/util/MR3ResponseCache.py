@@ -0,0 +1,208 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Union
+
+
+class CacheMissError(LookupError):
+    """Raised when an offline cache is asked for a URL it does not hold."""
+
+
+class MR3ResponseCache:
+    """A persistent, content-addressed cache of HTTP responses.
+
+    Bodies are stored once under `objects/`, named by their SHA-256 digest; `index.sqlite3` maps each URL
+    to its status, digest and timestamps. Missing pages (404 and 410) are kept as negative entries without a
+    body, so known-missing URLs are not requested again; other responses, such as 429 and 5xx errors, are
+    transient and never stored, so the next run requests them again. Entries older than `ttl` seconds are
+    misses; they are deleted when looked up, and all of them, negative entries included, are pruned whenever
+    the cache is opened online. The least recently used entries are evicted once stored bodies exceed
+    `max_bytes`. In offline mode, misses raise CacheMissError instead of letting the caller go to the network,
+    and nothing is pruned, as stale data beats no data.
+
+    Usage:
+
+    >>> import tempfile
+    >>> cache = MR3ResponseCache(tempfile.mkdtemp())
+    >>> cache.get("https://example.org/a") is None
+    True
+    >>> cache.put("https://example.org/a", 200, b"<html></html>")
+    >>> cache.put("https://example.org/b", 404, b"Not found")
+    >>> cache.get("https://example.org/a"), cache.get("https://example.org/b")
+    ((200, b'<html></html>'), (404, b''))
+    >>> cache.stats()
+    'cache: 2 hits (1 negative), 1 misses, 0 expired, 2 stored, 0 evicted'
+    >>> cache.put("https://example.org/c", 503, b"Service unavailable")
+    >>> cache.get("https://example.org/c") is None
+    True
+    >>> cache.ttl = -1  # Everything is now expired.
+    >>> cache.prune(), cache.get("https://example.org/a")
+    (2, None)
+    """
+    NegativeStatuses = (404, 410)  # Responses which say the page is missing, rather than that fetching failed
+
+    def __init__(self, directory: Union[str, Path], ttl: float = 7 * 24 * 60 * 60,
+                 max_bytes: int = 512 * 1024 * 1024, offline: bool = False):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = self.negative_hits = self.misses = self.expired = self.stored = self.evicted = 0
+
+        (self.directory / "objects").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = sqlite3.connect(self.directory / "index.sqlite3", check_same_thread=False)
+        self._index.execute(
+            "CREATE TABLE IF NOT EXISTS Entry ("
+            "Url TEXT PRIMARY KEY, Status INTEGER NOT NULL, Digest TEXT, Size INTEGER NOT NULL, "
+            "Fetched REAL NOT NULL, Accessed REAL NOT NULL)"
+        )
+        self._index.execute("CREATE INDEX IF NOT EXISTS EntryAccessed ON Entry (Accessed)")
+        self._index.commit()
+        if not offline:
+            self.prune()
+
+    def object_path(self, digest: str) -> Path:
+        return self.directory / "objects" / digest[:2] / digest
+
+    def get(self, url: str) -> Union[tuple[int, bytes], None]:
+        """Looks up the cached response for url.
+
+        :param str url: URL to look up
+        :return: (HTTP status, body) if a fresh entry exists; negative entries have an empty body
+        :rtype: Union[tuple[int, bytes], None]
+        :raises CacheMissError: If offline and url has no fresh entry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._index.execute("SELECT Status, Digest, Fetched FROM Entry WHERE Url = ?", (url,)).fetchone()
+            body = None
+            if row is not None:
+                status, digest, fetched = row
+                if status != 200 and status not in MR3ResponseCache.NegativeStatuses:
+                    self.delete(url, digest)  # A transient error stored by an older version of the cache
+                    row = None
+                elif now - fetched > self.ttl and not self.offline:  # Offline, stale data beats no data.
+                    self.expired = self.expired + 1
+                    self.delete(url, digest)
+                    row = None
+                elif digest is None:
+                    body = b""
+                else:
+                    try:
+                        body = self.object_path(digest).read_bytes()
+                    except FileNotFoundError:  # The object was removed from under the index.
+                        self.delete(url, digest)
+                        row = None
+            if row is None:
+                self.misses = self.misses + 1
+                self._index.commit()
+                if self.offline:
+                    raise CacheMissError(url)
+                return None
+
+            self.hits = self.hits + 1
+            if digest is None:
+                self.negative_hits = self.negative_hits + 1
+            self._index.execute("UPDATE Entry SET Accessed = ? WHERE Url = ?", (now, url))
+            self._index.commit()
+            return status, body
+
+    def put(self, url: str, status: int, body: bytes) -> None:
+        """Stores the response for url; missing pages are stored as negative entries, and other non-200
+        responses are not stored at all.
+
+        :param str url: URL which was requested
+        :param int status: HTTP status of the response
+        :param bytes body: Body of the response
+        """
+        if status != 200 and status not in MR3ResponseCache.NegativeStatuses:
+            return
+        now = time.time()
+        digest = None
+        size = 0
+        if status == 200:
+            digest = hashlib.sha256(body).hexdigest()
+            size = len(body)
+        with self._lock:
+            if digest is not None:
+                path = self.object_path(digest)
+                if not path.exists():
+                    path.parent.mkdir(exist_ok=True)
+                    temporary_path = path.with_name(f"{digest}.{threading.get_ident()}.tmp")
+                    temporary_path.write_bytes(body)
+                    os.replace(temporary_path, path)  # Readers never see a partial object.
+            self._index.execute(
+                "INSERT OR REPLACE INTO Entry (Url, Status, Digest, Size, Fetched, Accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, status, digest, size, now, now)
+            )
+            self.stored = self.stored + 1
+            self.evict()
+            self._index.commit()
+
+    def delete(self, url: str, digest: Union[str, None]) -> int:
+        """Deletes url's entry, and its body unless another entry shares it. Call with the lock held.
+
+        :param str url: URL whose entry to delete
+        :param Union[str, None] digest: The entry's digest; None for negative entries
+        :return: Bytes of body freed
+        :rtype: int
+        """
+        self._index.execute("DELETE FROM Entry WHERE Url = ?", (url,))
+        if digest is None:
+            return 0
+        if self._index.execute("SELECT 1 FROM Entry WHERE Digest = ? LIMIT 1", (digest,)).fetchone() is not None:
+            return 0
+        path = self.object_path(digest)
+        if not path.exists():
+            return 0
+        size = path.stat().st_size
+        path.unlink()
+        return size
+
+    def prune(self) -> int:
+        """Deletes every expired entry, negative ones included, and any transient ones left by older versions.
+
+        :return: How many entries were deleted
+        :rtype: int
+        """
+        with self._lock:
+            stale = self._index.execute(
+                f"SELECT Url, Digest FROM Entry WHERE Fetched < ? OR Status NOT IN "
+                f"(200, {', '.join(map(str, MR3ResponseCache.NegativeStatuses))})",
+                (time.time() - self.ttl,)
+            ).fetchall()
+            for url, digest in stale:
+                self.delete(url, digest)
+            self._index.commit()
+            return len(stale)
+
+    def evict(self) -> None:
+        """Drops least recently used entries until stored bodies fit in max_bytes. Call with the lock held."""
+        total = self._index.execute(
+            "SELECT COALESCE(SUM(Size), 0) FROM (SELECT DISTINCT Digest, Size FROM Entry WHERE Digest IS NOT NULL)"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, digest in self._index.execute(
+                "SELECT Url, Digest FROM Entry WHERE Digest IS NOT NULL ORDER BY Accessed").fetchall():
+            total = total - self.delete(url, digest)
+            self.evicted = self.evicted + 1
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> str:
+        """Summarizes the cache's counters.
+
+        :return: Counter summary
+        :rtype: str
+        """
+        return (f"cache: {self.hits} hits ({self.negative_hits} negative), {self.misses} misses, "
+                f"{self.expired} expired, {self.stored} stored, {self.evicted} evicted")
+
+    def close(self) -> None:
+        with self._lock:
+            self._index.close()
@@ -0,0 +1,208 @@
+import argparse
+import csv
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import unicodedata
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Union
+
+
+class MR3SaucerStoneLog:
+    """Logs which disks (Saucer Stones) produced which monsters, and looks either up from the other.
+
+    Disks are identified by `title_key`, a 64-bit hash of their normalized title, so differently typed
+    titles of one disk are counted together and each lookup is a single seek of a unique integer index.
+    A disk's trials are counted per monster it produced, as logs may disagree.
+
+    Usage:
+
+    >>> from MR3DatabaseBuilder import MR3DatabaseBuilder
+    >>> connection = sqlite3.connect(":memory:")
+    >>> _ = connection.executescript(MR3DatabaseBuilder.BuildScript.read_text(encoding="utf-8"))
+    >>> log = MR3SaucerStoneLog(connection)
+    >>> log.ingest([("Abbey Road", "Mocchi"), ("ABBEY  ROAD", "Mocchi"), ("Thriller", "Metal Head"),
+    ...             ("Abbey Road!", "Coral"), ("Nevermind", "Nobody")])
+    {'rows': 5, 'new_disks': 2, 'trials': 4, 'unknown_monsters': 1}
+    >>> log.monsters_for("abbey road")
+    [('Mocchi', 2), ('Coral', 1)]
+    >>> log.disks_for("metal head")
+    [('Thriller', 1)]
+    """
+    # Columns of a CSV log; JSONL logs use the same keys
+    TitleColumn = "title"
+    MonsterColumn = "monster"
+    TitleWords = re.compile(r"\w+")
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.monster_ids = {name.casefold(): monster_id
+                            for monster_id, name in connection.execute("SELECT Id, Monster FROM Monster")}
+
+    @staticmethod
+    def normalize_title(title: str) -> str:
+        """Reduces a disk's title to the form two spellings of it share.
+
+        :param str title: Title as logged
+        :return: Title with compatible characters unified, case folded, and punctuation and runs of spaces
+            reduced to single spaces
+        :rtype: str
+
+        Usage:
+
+        >>> MR3SaucerStoneLog.normalize_title("  Ｔhe Dark Side of the Moon (Remastered) ")
+        'the dark side of the moon remastered'
+        """
+        return " ".join(MR3SaucerStoneLog.TitleWords.findall(unicodedata.normalize("NFKC", title).casefold()))
+
+    @staticmethod
+    def title_key(title: str) -> int:
+        """Hashes a disk's normalized title into a signed 64-bit integer, as SQLite stores it.
+
+        :param str title: Title as logged
+        :return: Key of the disk
+        :rtype: int
+
+        Usage:
+
+        >>> MR3SaucerStoneLog.title_key("Abbey Road") == MR3SaucerStoneLog.title_key("ABBEY ROAD!")
+        True
+        """
+        digest = hashlib.blake2b(MR3SaucerStoneLog.normalize_title(title).encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little", signed=True)
+
+    @staticmethod
+    def read_rows(path: Union[str, Path]) -> Iterator[tuple[str, str]]:
+        """Streams (title, monster) rows from a CSV log, with a header row, or a JSONL log.
+
+        :param Union[str, Path] path: Log file; read as JSONL if its suffix is .jsonl, else as CSV
+        :return: (Disk title, monster name) of each trial
+        :rtype: Iterator[tuple[str, str]]
+        """
+        path = Path(path)
+        with open(path, newline="", encoding="utf-8") as f:
+            if path.suffix == ".jsonl":
+                for line in f:
+                    if line.strip():
+                        row = json.loads(line)
+                        yield row[MR3SaucerStoneLog.TitleColumn], row[MR3SaucerStoneLog.MonsterColumn]
+            else:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                title = header.index(MR3SaucerStoneLog.TitleColumn)
+                monster = header.index(MR3SaucerStoneLog.MonsterColumn)
+                for row in reader:
+                    yield row[title], row[monster]
+
+    def ingest(self, rows: Iterable[tuple[str, str]], batch_size: int = 100_000) -> dict[str, int]:
+        """Adds logged trials, committing once per batch.
+
+        Disks are deduplicated in memory by title key, so each batch only inserts disks new to the log and
+        adds each (disk, monster) pair's trials in one upsert. Each distinct spelling is only hashed once.
+
+        :param Iterable[tuple[str, str]] rows: (Disk title, monster name) of each trial; consumed as it is read
+        :param int batch_size: Rows to read between commits
+        :return: How many rows were read, new disks added, trials logged, and rows skipped for naming an
+            unknown monster
+        :rtype: dict[str, int]
+        """
+        stone_ids = dict(self.connection.execute("SELECT TitleKey, Id FROM SaucerStone"))
+        next_id = (self.connection.execute("SELECT MAX(Id) FROM SaucerStone").fetchone()[0] or 0) + 1
+        counts = {"rows": 0, "new_disks": 0, "trials": 0, "unknown_monsters": 0}
+        new_stones = []
+        trials = {}
+
+        def commit():
+            with self.connection:
+                self.connection.executemany("INSERT INTO SaucerStone (Id, Title, TitleKey) VALUES (?, ?, ?)",
+                                            new_stones)
+                self.connection.executemany(
+                    "INSERT INTO SaucerStoneMonster (SaucerStoneID, MonsterID, Trials) VALUES (?, ?, ?) "
+                    "ON CONFLICT DO UPDATE SET Trials = Trials + excluded.Trials",
+                    ((stone_id, monster_id, n) for (stone_id, monster_id), n in sorted(trials.items()))  # In key order
+                )
+            new_stones.clear()
+            trials.clear()
+
+        title_keys = {}
+        for title, monster in rows:
+            counts["rows"] = counts["rows"] + 1
+            monster_id = self.monster_ids.get(monster.strip().casefold())
+            if monster_id is None:
+                counts["unknown_monsters"] = counts["unknown_monsters"] + 1
+            else:
+                key = title_keys.get(title)
+                if key is None:
+                    key = title_keys[title] = MR3SaucerStoneLog.title_key(title)
+                stone_id = stone_ids.get(key)
+                if stone_id is None:
+                    stone_id = stone_ids[key] = next_id
+                    next_id = next_id + 1
+                    new_stones.append((stone_id, title.strip(), key))
+                    counts["new_disks"] = counts["new_disks"] + 1
+                pair = (stone_id, monster_id)
+                trials[pair] = trials.get(pair, 0) + 1
+                counts["trials"] = counts["trials"] + 1
+            if counts["rows"] % batch_size == 0:
+                commit()
+        commit()
+        return counts
+
+    def monsters_for(self, title: str) -> list[tuple[str, int]]:
+        """Answers which monster a disk produces.
+
+        :param str title: Disk's title, spelled any way which normalizes the same
+        :return: (Monster, trials) of each monster the disk produced, most trials first
+        :rtype: list[tuple[str, int]]
+        """
+        return self.connection.execute(
+            "SELECT m.Monster, sm.Trials FROM SaucerStone s "
+            "JOIN SaucerStoneMonster sm ON sm.SaucerStoneID = s.Id JOIN Monster m ON sm.MonsterID = m.Id "
+            "WHERE s.TitleKey = ? ORDER BY sm.Trials DESC, m.Id", [MR3SaucerStoneLog.title_key(title)]
+        ).fetchall()
+
+    def disks_for(self, monster: str) -> list[tuple[str, int]]:
+        """Answers which disks produce a monster.
+
+        :param str monster: Monster's name, in any case
+        :return: (Disk title, trials) of each disk which produced the monster, most trials first
+        :rtype: list[tuple[str, int]]
+        """
+        monster_id = self.monster_ids.get(monster.strip().casefold())
+        return self.connection.execute(
+            "SELECT s.Title, sm.Trials FROM SaucerStoneMonster sm JOIN SaucerStone s ON sm.SaucerStoneID = s.Id "
+            "WHERE sm.MonsterID = ? ORDER BY sm.Trials DESC, s.Id", [monster_id]
+        ).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Log which disks produced which monsters, or look them up.")
+    parser.add_argument("database", type=Path, help="lexicon database")
+    parser.add_argument("logs", type=Path, nargs="*", help="CSV or JSONL logs of title and monster to add")
+    parser.add_argument("-b", "--batch-size", type=int, default=100_000, help="rows to read between commits")
+    parser.add_argument("-d", "--disk", help="list the monsters a disk produces")
+    parser.add_argument("-m", "--monster", help="list the disks which produce a monster")
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(args.database)
+    log = MR3SaucerStoneLog(connection)
+    for file in args.logs:
+        counts = log.ingest(MR3SaucerStoneLog.read_rows(file), args.batch_size)
+        print(f"{file}: {counts['rows']} rows, {counts['trials']} trials of {counts['new_disks']} new disks",
+              file=sys.stderr)
+        if counts["unknown_monsters"]:
+            print(f"{file}: skipped {counts['unknown_monsters']} rows naming unknown monsters", file=sys.stderr)
+    if args.disk:
+        for monster, trials in log.monsters_for(args.disk):
+            print(f"{monster}\t{trials}")
+    if args.monster:
+        for title, trials in log.disks_for(args.monster):
+            print(f"{title}\t{trials}")
+    connection.close()
+
+
+if __name__ == '__main__':
+    main()
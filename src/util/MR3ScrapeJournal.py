@@ -0,0 +1,66 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Union
+
+
+class MR3ScrapeJournal:
+    """A durable JSON Lines journal of scraped monsters, appended to as each monster completes.
+
+    Each line holds one monster's fields, keyed by (species, derivation ID, region ID). Lines are flushed
+    and synced as they are written, so a failed run loses at most the monster in flight; a torn last line
+    is ignored when the journal is read back.
+
+    Usage:
+
+    >>> import tempfile
+    >>> journal = MR3ScrapeJournal(Path(tempfile.mkdtemp()) / "journal.jsonl")
+    >>> journal.append({"species": "Coral", "derivation_id": 13, "region_id": 6, "description": '"Soft."'})
+    >>> journal.load()
+    {('Coral', 13, 6): {'species': 'Coral', 'derivation_id': 13, 'region_id': 6, 'description': '"Soft."'}}
+    """
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(record: dict) -> tuple[str, int, int]:
+        return record["species"], record["derivation_id"], record["region_id"]
+
+    def load(self) -> dict[tuple[str, int, int], dict]:
+        """Reads back every complete record in the journal.
+
+        :return: Records, by (species, derivation ID, region ID)
+        :rtype: dict[tuple[str, int, int], dict]
+        """
+        records = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:  # Torn write from a crash; that monster is scraped again.
+                        continue
+                    records[self.key(record)] = record
+        except FileNotFoundError:
+            pass
+        return records
+
+    def append(self, record: dict) -> None:
+        """Durably appends a record.
+
+        :param dict record: Monster fields to journal
+        """
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        """Empties the journal, for a run which starts from scratch."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
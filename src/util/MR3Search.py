@@ -0,0 +1,100 @@
+import re
+import sqlite3
+from typing import Union
+
+
+class SearchResult:
+    __slots__ = ("kind", "id", "name", "snippet", "rank")
+
+    def __init__(self, kind, id, name, snippet, rank):
+        self.kind = kind
+        self.id = id
+        self.name = name
+        self.snippet = snippet
+        self.rank = rank
+
+    def __str__(self):
+        return f"{self.kind} | {self.name} | {self.snippet}"
+
+
+class MR3Search:
+    """Full-text search over the lexicon's monsters, characteristics and attacks, through its FTS5 tables.
+
+    Results are ranked by bm25, with matches in a name weighted above matches in the rest of the row.
+    """
+    # Kind -> query for its matches; each returns (kind, id, name, snippet, rank) and takes :query.
+    Queries = {
+        "monster": (
+            "SELECT 'monster' AS kind, m.Id AS id, m.Monster AS name, "
+            "snippet(MonsterSearch, 1, '[', ']', '...', 12) AS snippet, bm25(MonsterSearch, 10.0, 1.0) AS rank "
+            "FROM MonsterSearch JOIN Monster m ON m.Id = MonsterSearch.rowid WHERE MonsterSearch MATCH :query"
+        ),
+        "characteristic": (
+            "SELECT 'characteristic' AS kind, c.Id AS id, c.Characteristic AS name, "
+            "snippet(CharacteristicSearch, 1, '[', ']', '...', 12) AS snippet, "
+            "bm25(CharacteristicSearch, 10.0, 1.0) AS rank "
+            "FROM CharacteristicSearch JOIN Characteristic c ON c.Id = CharacteristicSearch.rowid "
+            "WHERE CharacteristicSearch MATCH :query"
+        ),
+        "attack": (
+            "SELECT 'attack' AS kind, a.Id AS id, a.Attack AS name, "
+            "snippet(AttackSearch, -1, '[', ']', '...', 12) AS snippet, "
+            "bm25(AttackSearch, 10.0, 2.0, 2.0, 1.0) AS rank "
+            "FROM AttackSearch JOIN Attack a ON a.Id = AttackSearch.rowid WHERE AttackSearch MATCH :query"
+        )
+    }
+
+    @staticmethod
+    def to_match_query(text: str) -> Union[str, None]:
+        """Turns free text into an FTS5 query matching rows holding every word, each as a prefix.
+
+        :param str text: Text to search for
+        :return: FTS5 query, or None if the text has no words
+        :rtype: Union[str, None]
+
+        Usage:
+
+        >>> MR3Search.to_match_query('sleep "lion')
+        '"sleep"* "lion"*'
+        """
+        words = re.findall(r"\w+", text)
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
+
+    @staticmethod
+    def search(connection: sqlite3.Connection, text: str, kinds: Union[list[str], None] = None,
+               limit: int = 20) -> list[SearchResult]:
+        """Searches the lexicon for rows holding every word of text, best matches first.
+
+        :param sqlite3.Connection connection: Connection to a lexicon database
+        :param str text: Text to search for; each word also matches longer words it begins
+        :param Union[list[str], None] kinds: Which of "monster", "characteristic" and "attack" to search; all if None
+        :param int limit: Most results to return
+        :return: The best matches
+        :rtype: list[SearchResult]
+
+        Usage:
+
+        >>> connection = sqlite3.connect(":memory:")
+        >>> from MR3DatabaseBuilder import MR3DatabaseBuilder
+        >>> _ = connection.executescript(MR3DatabaseBuilder.BuildScript.read_text(encoding="utf-8"))
+        >>> print(MR3Search.search(connection, "sleeping lio", kinds=["monster"])[0])
+        monster | Leon | '[Sleeping] [Lion]' is the perfect phrase to describe Leon, because it is...
+        """
+        query = MR3Search.to_match_query(text)
+        if query is None:
+            return []
+        rows = connection.execute(MR3Search.build_query(kinds), {"query": query, "limit": limit})
+        return [SearchResult(*row) for row in rows]
+
+    @staticmethod
+    def build_query(kinds: Union[list[str], None] = None) -> str:
+        """Builds the ranked search over the given kinds; it takes :query, from to_match_query, and :limit.
+
+        :param Union[list[str], None] kinds: Which of "monster", "characteristic" and "attack" to search; all if None
+        :return: Search query
+        :rtype: str
+        """
+        union = " UNION ALL ".join(MR3Search.Queries[kind] for kind in (kinds or MR3Search.Queries))
+        return f"{union} ORDER BY rank LIMIT :limit"
@@ -0,0 +1,193 @@
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Union
+
+
+class MR3Snapshot:
+    """Reads a lexicon snapshot, as written by MR3SnapshotExporter, straight out of a memory map.
+
+    Opening only checks the header; records and strings are unpacked from the map when a lookup reaches them.
+
+    Layout, little-endian, with every section offset relative to the start of the file:
+
+    - Header: `Header`
+    - Strings: (count + 1) u32 offsets into the UTF-8 blob which follows them; string i spans offsets i to i + 1
+    - Derivations, Regions: a u32 string per ID, from ID 0
+    - Attacks, Monsters: fixed-width `AttackRecord` / `MonsterRecord`s, in Id order
+    - Attack and monster name indexes: u32 record positions, in order of their names, case-folded
+    """
+    Magic = b"MR3L"
+    Version = 1
+    # Magic, version, then (offset, count) of: strings, derivations, regions, attacks, monsters,
+    # attack name index, monster name index
+    Header = struct.Struct("<4sI14I")
+    # Id, DerivationID, and Attack, StatUsed, AttackType, ItemRequired strings; GutsUsed, Damage, GutsDown, Critical,
+    # Hit, MaxLevel; AttackRange, Growth, Effect strings
+    AttackRecord = struct.Struct("<IH4I6h3I")
+    # Id, Monster string, DerivationID, RegionID, Description string
+    MonsterRecord = struct.Struct("<IIHHI")
+    U32 = struct.Struct("<I")
+
+    def __init__(self, path: Union[str, Path]):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, *sections = MR3Snapshot.Header.unpack_from(self.map, 0)
+        if magic != MR3Snapshot.Magic or version != MR3Snapshot.Version:
+            self.map.close()
+            raise ValueError(f"{path} is not a version {MR3Snapshot.Version} lexicon snapshot")
+        (self.strings_offset, self.string_count, self.derivations_offset, self.derivation_count,
+         self.regions_offset, self.region_count, self.attacks_offset, self.attack_count,
+         self.monsters_offset, self.monster_count, self.attack_names_offset, _,
+         self.monster_names_offset, _) = sections
+        self.blob_offset = self.strings_offset + (self.string_count + 1) * 4
+
+    def string(self, i: int) -> str:
+        """Reads string i of the string table."""
+        start, end = struct.unpack_from("<2I", self.map, self.strings_offset + i * 4)
+        return self.map[self.blob_offset + start:self.blob_offset + end].decode("utf-8")
+
+    def _u32(self, offset: int) -> int:
+        return MR3Snapshot.U32.unpack_from(self.map, offset)[0]
+
+    def derivation(self, derivation_id: int) -> str:
+        return self.string(self._u32(self.derivations_offset + derivation_id * 4))
+
+    def region(self, region_id: int) -> str:
+        return self.string(self._u32(self.regions_offset + region_id * 4))
+
+    def _attack_at(self, position: int) -> dict:
+        (attack_id, derivation_id, name, stat, attack_type, item, guts_used, damage, guts_down, critical, hit,
+         max_level, attack_range, growth, effect) = MR3Snapshot.AttackRecord.unpack_from(
+            self.map, self.attacks_offset + position * MR3Snapshot.AttackRecord.size)
+        return {"Id": attack_id, "Derivation": self.derivation(derivation_id), "Attack": self.string(name),
+                "StatUsed": self.string(stat), "AttackType": self.string(attack_type),
+                "ItemRequired": self.string(item), "GutsUsed": guts_used, "Damage": damage, "GutsDown": guts_down,
+                "Critical": critical, "Hit": hit, "MaxLevel": max_level, "AttackRange": self.string(attack_range),
+                "Growth": self.string(growth), "Effect": self.string(effect)}
+
+    def _monster_at(self, position: int) -> dict:
+        monster_id, name, derivation_id, region_id, description = MR3Snapshot.MonsterRecord.unpack_from(
+            self.map, self.monsters_offset + position * MR3Snapshot.MonsterRecord.size)
+        return {"Id": monster_id, "Monster": self.string(name), "Derivation": self.derivation(derivation_id),
+                "Region": self.region(region_id), "Description": self.string(description)}
+
+    def _find_id(self, offset: int, size: int, count: int, record_id: int) -> Union[int, None]:
+        """Binary searches records, which lead with their u32 Id, for record_id's position."""
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            middle_id = self._u32(offset + middle * size)
+            if middle_id < record_id:
+                low = middle + 1
+            elif middle_id > record_id:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def _find_name(self, index_offset: int, count: int, records_offset: int, size: int, name_field: int,
+                   name: str) -> list[int]:
+        """Binary searches a name index for every record position whose name matches, ignoring case."""
+        key = name.casefold()
+
+        def name_at(i: int) -> str:
+            position = self._u32(index_offset + i * 4)
+            return self.string(self._u32(records_offset + position * size + name_field)).casefold()
+
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if name_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        positions = []
+        while low < count and name_at(low) == key:
+            positions.append(self._u32(index_offset + low * 4))
+            low = low + 1
+        return positions
+
+    def attack(self, attack_id: int) -> Union[dict, None]:
+        """Looks up an attack by its Id.
+
+        :param int attack_id: Attack's Id in the lexicon database
+        :return: The attack, keyed by the Attack table's columns with its derivation's name, or None
+        :rtype: Union[dict, None]
+        """
+        position = self._find_id(self.attacks_offset, MR3Snapshot.AttackRecord.size, self.attack_count, attack_id)
+        return None if position is None else self._attack_at(position)
+
+    def attacks_named(self, name: str) -> list[dict]:
+        """Looks up every derivation's attack of a name, ignoring case.
+
+        :param str name: Attack's name
+        :return: The attacks, as returned by `attack`
+        :rtype: list[dict]
+        """
+        return [self._attack_at(position) for position in self._find_name(
+            self.attack_names_offset, self.attack_count, self.attacks_offset, MR3Snapshot.AttackRecord.size, 6, name)]
+
+    def monster(self, monster_id: int) -> Union[dict, None]:
+        """Looks up a monster by its Id.
+
+        :param int monster_id: Monster's Id in the lexicon database
+        :return: The monster with its derivation's and region's names, or None
+        :rtype: Union[dict, None]
+        """
+        position = self._find_id(self.monsters_offset, MR3Snapshot.MonsterRecord.size, self.monster_count,
+                                 monster_id)
+        return None if position is None else self._monster_at(position)
+
+    def monsters_named(self, name: str) -> list[dict]:
+        """Looks up monsters by name, ignoring case.
+
+        :param str name: Monster's name
+        :return: The monsters, as returned by `monster`
+        :rtype: list[dict]
+        """
+        return [self._monster_at(position) for position in self._find_name(
+            self.monster_names_offset, self.monster_count, self.monsters_offset, MR3Snapshot.MonsterRecord.size, 4,
+            name)]
+
+    def close(self) -> None:
+        self.map.close()
+
+    def __enter__(self) -> "MR3Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main():
+    import argparse  # Only the command line needs it; lookups through the class skip its import time.
+
+    parser = argparse.ArgumentParser(description="Look up monsters and attacks in a lexicon snapshot.")
+    parser.add_argument("snapshot", type=Path, help="snapshot written by MR3SnapshotExporter")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("-m", "--monster", help="monster's name")
+    group.add_argument("-a", "--attack", help="attack's name, listed for every derivation which has it")
+    group.add_argument("--monster-id", type=int, help="monster's Id")
+    group.add_argument("--attack-id", type=int, help="attack's Id")
+    args = parser.parse_args()
+
+    with MR3Snapshot(args.snapshot) as snapshot:
+        if args.monster is not None:
+            results = snapshot.monsters_named(args.monster)
+        elif args.attack is not None:
+            results = snapshot.attacks_named(args.attack)
+        elif args.monster_id is not None:
+            results = [r for r in [snapshot.monster(args.monster_id)] if r is not None]
+        else:
+            results = [r for r in [snapshot.attack(args.attack_id)] if r is not None]
+    for result in results:
+        print("\n".join(f"{column}: {value}" for column, value in result.items()))
+        print()
+    if not results:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import os
+import sqlite3
+import struct
+from pathlib import Path
+from typing import Union
+
+from MR3Snapshot import MR3Snapshot
+
+
+class MR3SnapshotExporter:
+    """Compiles a lexicon database into the read-only binary snapshot MR3Snapshot reads.
+
+    Every text value is stored once in a shared string table and referenced by number, so the many repeats
+    of values like 'Power', 'Beat', 'Close' or an item's name cost four bytes each.
+
+    Usage:
+
+    >>> import tempfile
+    >>> from MR3DatabaseBuilder import MR3DatabaseBuilder
+    >>> connection = sqlite3.connect(":memory:")
+    >>> _ = connection.executescript(MR3DatabaseBuilder.BuildScript.read_text(encoding="utf-8"))
+    >>> path = Path(tempfile.mkdtemp()) / "lexicon.mr3"
+    >>> MR3SnapshotExporter.export(connection, path)
+    {'strings': 849, 'attacks': 323, 'monsters': 222}
+    >>> with MR3Snapshot(path) as snapshot:
+    ...     [(m["Monster"], m["Derivation"], m["Region"]) for m in snapshot.monsters_named("metal head")]
+    ...     [a["Derivation"] for a in snapshot.attacks_named("ear slap")]
+    [('Metal Head', 'Lesione', 'Special')]
+    ['Baku', 'Gitan']
+    """
+
+    def __init__(self):
+        self.strings = {}
+
+    def intern(self, value: str) -> int:
+        """Adds a value to the string table, once.
+
+        :param str value: Text to store
+        :return: The value's number in the string table
+        :rtype: int
+        """
+        if value not in self.strings:
+            self.strings[value] = len(self.strings)
+        return self.strings[value]
+
+    def names_table(self, rows: list[tuple[int, str]]) -> bytes:
+        """Packs (Id, name) rows into a string number per Id, from Id 0; missing Ids get the empty string."""
+        names = [self.intern("")] * (max((row[0] for row in rows), default=0) + 1)
+        for row_id, name in rows:
+            names[row_id] = self.intern(name)
+        return struct.pack(f"<{len(names)}I", *names)
+
+    def strings_table(self) -> bytes:
+        """Packs the string table: its offsets, then its UTF-8 blob."""
+        encoded = [value.encode("utf-8") for value in self.strings]
+        offsets = [0]
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(encoded)
+
+    @staticmethod
+    def name_index(names: list[str]) -> bytes:
+        """Packs record positions in order of their case-folded names, ties in record order."""
+        order = sorted(range(len(names)), key=lambda i: names[i].casefold())
+        return struct.pack(f"<{len(order)}I", *order)
+
+    @staticmethod
+    def export(connection: sqlite3.Connection, path: Union[str, Path]) -> dict[str, int]:
+        """Writes the lexicon database's attacks and monsters to a snapshot.
+
+        :param sqlite3.Connection connection: Connection to a lexicon database
+        :param Union[str, Path] path: Snapshot to write; replaced once the new one is complete
+        :return: How many strings, attacks and monsters were written
+        :rtype: dict[str, int]
+        """
+        exporter = MR3SnapshotExporter()
+        attacks = connection.execute(
+            "SELECT Id, DerivationID, Attack, StatUsed, AttackType, ItemRequired, GutsUsed, Damage, GutsDown, "
+            "Critical, Hit, MaxLevel, AttackRange, Growth, Effect FROM Attack ORDER BY Id").fetchall()
+        monsters = connection.execute(
+            "SELECT Id, Monster, DerivationID, RegionID, Description FROM Monster ORDER BY Id").fetchall()
+
+        attack_records = b"".join(MR3Snapshot.AttackRecord.pack(
+            a[0], a[1], *[exporter.intern(v) for v in a[2:6]], *a[6:12], *[exporter.intern(v) for v in a[12:]]
+        ) for a in attacks)
+        monster_records = b"".join(MR3Snapshot.MonsterRecord.pack(
+            m[0], exporter.intern(m[1]), m[2], m[3], exporter.intern(m[4])
+        ) for m in monsters)
+        derivations = exporter.names_table(connection.execute("SELECT Id, Derivation FROM Derivation").fetchall())
+        regions = exporter.names_table(connection.execute("SELECT Id, Region FROM Region").fetchall())
+        strings = exporter.strings_table()
+        sections = [
+            (strings, len(exporter.strings)),
+            (derivations, len(derivations) // 4),
+            (regions, len(regions) // 4),
+            (attack_records, len(attacks)),
+            (monster_records, len(monsters)),
+            (MR3SnapshotExporter.name_index([a[2] for a in attacks]), len(attacks)),
+            (MR3SnapshotExporter.name_index([m[1] for m in monsters]), len(monsters))
+        ]
+
+        header = []
+        offset = MR3Snapshot.Header.size
+        for data, count in sections:
+            header.extend([offset, count])
+            offset = offset + len(data)
+        path = Path(path)
+        temporary_path = path.with_name(f"{path.name}.tmp")
+        with open(temporary_path, "wb") as f:
+            f.write(MR3Snapshot.Header.pack(MR3Snapshot.Magic, MR3Snapshot.Version, *header))
+            for data, _ in sections:
+                f.write(data)
+        os.replace(temporary_path, path)
+        return {"strings": len(exporter.strings), "attacks": len(attacks), "monsters": len(monsters)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a lexicon database into a read-only binary snapshot.")
+    parser.add_argument("database", type=Path, help="lexicon database to export")
+    parser.add_argument("snapshot", type=Path, help="snapshot file to write")
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(f"{args.database.resolve().as_uri()}?mode=ro", uri=True)
+    counts = MR3SnapshotExporter.export(connection, args.snapshot)
+    connection.close()
+    print(f"Wrote {counts['attacks']} attacks, {counts['monsters']} monsters and {counts['strings']} strings "
+          f"to {args.snapshot} ({args.snapshot.stat().st_size} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+from collections.abc import Iterable
+from typing import TextIO, Union
+
+from MR3Instrumentation import MR3Instrumentation
+
+
+class MR3SqlEmitter:
+    """Streams SQL statements to a text file, escaping each value on its own.
+
+    Multi-row INSERTs are split into statements of at most `max_rows` rows and `max_bytes` bytes,
+    within SQLite's default compound-select and statement-length limits, so rows can be written
+    as they are produced without ever holding a whole statement in memory.
+
+    Usage:
+
+    >>> import io
+    >>> out = io.StringIO()
+    >>> emitter = MR3SqlEmitter(out, max_rows=2)
+    >>> emitter.write_inserts("Characteristic", ["Characteristic", "Description"],
+    ...                       [("Bold", "Won't flee."), ("Calm", None), ("Shy", "Hides.")])
+    3
+    >>> print(out.getvalue(), end="")  # doctest: +NORMALIZE_WHITESPACE
+    INSERT INTO Characteristic (Characteristic, Description) VALUES
+        ('Bold', 'Won''t flee.'),
+        ('Calm', NULL);
+    INSERT INTO Characteristic (Characteristic, Description) VALUES
+        ('Shy', 'Hides.');
+    """
+    MaxRowsPerStatement = 500  # SQLite's default SQLITE_MAX_COMPOUND_SELECT
+    # A deliberate chunk size, well under SQLite's default SQLITE_MAX_SQL_LENGTH of 1,000,000,000 bytes
+    MaxStatementBytes = 1_000_000
+
+    def __init__(self, out: TextIO, max_rows: int = MaxRowsPerStatement, max_bytes: int = MaxStatementBytes):
+        self.out = out
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def format_value(value: Union[str, int, float, None]) -> str:
+        """Formats a value as an SQL literal.
+
+        :param Union[str, int, float, None] value: Value to format
+        :return: SQL literal
+        :rtype: str
+
+        Usage:
+
+        >>> MR3SqlEmitter.format_value("It's soft.")
+        "'It''s soft.'"
+        >>> MR3SqlEmitter.format_value(13)
+        '13'
+        """
+        if value is None:
+            return "NULL"
+        if isinstance(value, str):
+            return "'" + value.replace("'", "''") + "'"
+        return str(value)
+
+    @staticmethod
+    def format_row(values: Iterable[Union[str, int, float, None]]) -> str:
+        """Formats values as a parenthesized row of SQL literals.
+
+        :param Iterable[Union[str, int, float, None]] values: Row's values, in column order
+        :return: SQL row
+        :rtype: str
+        """
+        return "(" + ", ".join([MR3SqlEmitter.format_value(value) for value in values]) + ")"
+
+    def write_statement(self, statement: str) -> None:
+        """Writes a single statement, which must already be escaped.
+
+        :param str statement: SQL statement, without its trailing semicolon
+        """
+        self.out.write(statement + ";\n")
+
+    def write_inserts(self, table: str, columns: list[str], rows: Iterable[Iterable]) -> int:
+        """Writes rows as chunked multi-row INSERT statements, consuming them as they are produced.
+
+        :param str table: Table to insert into
+        :param list[str] columns: Column names, in the rows' order
+        :param Iterable[Iterable] rows: Values of each row
+        :return: How many rows were written
+        :rtype: int
+        """
+        header = f"INSERT INTO {table} ({', '.join(columns)}) VALUES"
+        header_bytes = len(header.encode())
+        written = 0
+        statement_rows = statement_bytes = 0
+        for values in rows:
+            row = self.format_row(values)
+            row_bytes = len(row.encode()) + 3  # Separator and closing semicolon
+            if statement_rows and (statement_rows == self.max_rows or
+                                   statement_bytes + row_bytes > self.max_bytes):
+                self.out.write(";\n")
+                statement_rows = 0
+            if statement_rows == 0:
+                self.out.write(header + "\n\t" + row)
+                statement_bytes = header_bytes + row_bytes
+            else:
+                self.out.write(",\n\t" + row)
+                statement_bytes = statement_bytes + row_bytes
+            statement_rows = statement_rows + 1
+            written = written + 1
+        if statement_rows:
+            self.out.write(";\n")
+        MR3Instrumentation.count(f"rows_emitted: {table}", written)
+        return written
@@ -0,0 +1,104 @@
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+
+class MR3SummaryTables:
+    """Checks the trigger-maintained summary counts of a lexicon database against fresh aggregates.
+
+    Usage:
+
+    >>> from MR3DatabaseBuilder import MR3DatabaseBuilder
+    >>> connection = sqlite3.connect(":memory:")
+    >>> _ = connection.executescript(MR3DatabaseBuilder.BuildScript.read_text(encoding="utf-8"))
+    >>> _ = connection.execute("UPDATE Attack SET StatUsed = 'Power', AttackRange = 'Far' WHERE Id = 2")
+    >>> _ = connection.execute("DELETE FROM Monster WHERE RegionID = 6")
+    >>> MR3SummaryTables.check(connection)
+    []
+    >>> _ = connection.execute("UPDATE AttackCountByType SET Attacks = 0 "
+    ...                        "WHERE DerivationID = 1 AND AttackType = 'Beat'")
+    >>> MR3SummaryTables.check(connection)
+    ['AttackCountByType (1, Beat): 0 counted, 3 in Attack']
+    >>> MR3SummaryTables.rebuild(connection)
+    >>> MR3SummaryTables.check(connection)
+    []
+    """
+    # Summary table -> (table summarized, grouping columns, count column)
+    Summaries = {
+        "AttackCountByStat": ("Attack", ["DerivationID", "StatUsed"], "Attacks"),
+        "AttackCountByType": ("Attack", ["DerivationID", "AttackType"], "Attacks"),
+        "AttackCountByRange": ("Attack", ["DerivationID", "AttackRange"], "Attacks"),
+        "MonsterCountByDerivation": ("Monster", ["DerivationID"], "Monsters"),
+        "MonsterCountByRegion": ("Monster", ["RegionID"], "Monsters")
+    }
+
+    @staticmethod
+    def aggregate_query(summary: str) -> str:
+        """Writes the GROUP BY query a summary table stands in for.
+
+        :param str summary: Summary table
+        :return: Query returning the summary's rows, freshly counted
+        :rtype: str
+
+        Usage:
+
+        >>> MR3SummaryTables.aggregate_query("MonsterCountByRegion")
+        'SELECT RegionID, COUNT(*) FROM Monster GROUP BY RegionID'
+        """
+        table, keys, _ = MR3SummaryTables.Summaries[summary]
+        return f"SELECT {', '.join(keys)}, COUNT(*) FROM {table} GROUP BY {', '.join(keys)}"
+
+    @staticmethod
+    def check(connection: sqlite3.Connection) -> list[str]:
+        """Compares every summary table with freshly computed counts.
+
+        :param sqlite3.Connection connection: Connection to a lexicon database
+        :return: A description of each count which differs; empty when all agree
+        :rtype: list[str]
+        """
+        differences = []
+        for summary, (table, keys, count) in MR3SummaryTables.Summaries.items():
+            stored = {tuple(row[:-1]): row[-1] for row in connection.execute(
+                f"SELECT {', '.join(keys)}, {count} FROM {summary}")}
+            fresh = {tuple(row[:-1]): row[-1] for row in connection.execute(
+                MR3SummaryTables.aggregate_query(summary))}
+            for key in sorted(stored.keys() | fresh.keys(), key=str):
+                if stored.get(key) != fresh.get(key):
+                    differences.append(f"{summary} ({', '.join(map(str, key))}): {stored.get(key, 'none')} counted, "
+                                       f"{fresh.get(key, 'none')} in {table}")
+        return differences
+
+    @staticmethod
+    def rebuild(connection: sqlite3.Connection) -> None:
+        """Recounts every summary table from scratch, in one transaction.
+
+        :param sqlite3.Connection connection: Connection to a lexicon database
+        """
+        with connection:
+            for summary, (_, keys, count) in MR3SummaryTables.Summaries.items():
+                connection.execute(f"DELETE FROM {summary}")
+                connection.execute(f"INSERT INTO {summary} ({', '.join(keys)}, {count}) "
+                                   f"{MR3SummaryTables.aggregate_query(summary)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a lexicon database's summary counts against fresh counts.")
+    parser.add_argument("database", type=Path, help="lexicon database to check")
+    parser.add_argument("--repair", action="store_true", help="recount the summaries if any count differs")
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(args.database)
+    differences = MR3SummaryTables.check(connection)
+    for difference in differences:
+        print(difference)
+    if differences and args.repair:
+        MR3SummaryTables.rebuild(connection)
+        print(f"Recounted {len(MR3SummaryTables.Summaries)} summary tables")
+    connection.close()
+    if differences and not args.repair:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
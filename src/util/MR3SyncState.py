@@ -0,0 +1,42 @@
+import json
+import os
+from pathlib import Path
+from typing import Union
+
+
+class MR3SyncState:
+    """Each synced monster's fields, with the wiki page and revision they were scraped from.
+
+    Records hold `species`, `derivation_id`, `region_id` and `description` like an MR3Monster,
+    plus the page's canonical `title`, its `revid` and the revision's `timestamp`.
+
+    Usage:
+
+    >>> import tempfile
+    >>> path = Path(tempfile.mkdtemp()) / "sync_state.json"
+    >>> state = MR3SyncState(path)
+    >>> state.records[("Coral", 13, 6)] = {"species": "Coral", "derivation_id": 13, "region_id": 6,
+    ...     "description": '"Soft."', "title": "Coral", "revid": 50120, "timestamp": "2021-06-01T00:00:00Z"}
+    >>> state.save()
+    >>> MR3SyncState(path).records[("Coral", 13, 6)]["revid"]
+    50120
+    """
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        try:
+            records = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            records = []
+        self.records = {self.key(record): record for record in records}
+
+    @staticmethod
+    def key(record: dict) -> tuple[str, int, int]:
+        return record["species"], record["derivation_id"], record["region_id"]
+
+    def save(self) -> None:
+        """Writes the records to the state file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+        records = sorted(self.records.values(), key=lambda r: (r["derivation_id"], r["region_id"], r["species"]))
+        temporary_path.write_text(json.dumps(records, indent=1, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporary_path, self.path)